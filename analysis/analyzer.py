@@ -159,44 +159,144 @@
 # #     #     if cv2.waitKey(1) & 0xFF == ord('q'):
 # #     #         break
 # #     # cv2.destroyAllWindows()
-from typing import Dict, Tuple, List
-from analysis.squat_analyzer import SquatAnalyzer
-from analysis.pushup_analyzer import PushupAnalyzer
+from typing import Dict, Tuple, List, Iterable, Optional, Callable
+import numpy as np
+from analysis.exercises import create_analyzers
+from analysis.features import FeatureSet
+from pose.keypoint_track import KeypointTrack
+from pose.landmarks import as_array, ema_smooth_track
+from analysis.sampling import FrameSampler, interpolate_skipped
+
 
 class ExerciseAnalyzer:
-    def __init__(self):
-        self.squat = SquatAnalyzer()
-        self.pushup = PushupAnalyzer()
+    def __init__(self, thresholds: Optional[Dict[str, Dict[str, float]]] = None):
+        """``thresholds`` optionally overrides the FSM angles per exercise,
+        e.g. ``{"squat": {"down_angle": 95, "up_angle": 165}}``.
+
+        Every exercise in ``analysis.exercises`` is analyzed; its analyzer is
+        in ``self.analyzers`` and also reachable as an attribute, e.g.
+        ``self.squat``.
+        """
+        self.analyzers = create_analyzers(thresholds)
+        # One extraction per frame covers the features of every exercise
+        self.features = FeatureSet(name for a in self.analyzers.values() for name in a.REQUIRED_FEATURES)
         self.results = {
             "summary": {
-                "squats": {"total_reps": 0, "good_form_reps": 0, "common_issues": []},
-                "pushups": {"total_reps": 0, "good_form_reps": 0, "common_issues": []}
+                f"{exercise}s": {"total_reps": 0, "good_form_reps": 0, "common_issues": []}
+                for exercise in self.analyzers
             },
             "frame_data": []
         }
+        self.frame_count = 0
+        # Smoothed landmarks of every frame, reused by the report and exports
+        self.track = KeypointTrack()
+
+    def __getattr__(self, name: str):
+        analyzers = self.__dict__.get("analyzers", {})
+        if name in analyzers:
+            return analyzers[name]
+        raise AttributeError(name)
+
+    def watched_angles(self) -> List[Tuple[Tuple[int, int, int], Tuple[float, float]]]:
+        """FSM angle joints and thresholds, for ``FrameSampler``."""
+        return [(a.ANGLE_JOINTS, (a.DOWN_ANGLE, a.UP_ANGLE)) for a in self.analyzers.values()]
+
+    def angle_series(self, track: Optional[KeypointTrack] = None) -> Dict[str, np.ndarray]:
+        """Per-frame FSM angle of each exercise over ``track`` (default: ``self.track``), NaN without a pose."""
+        keypoints = (track if track is not None else self.track).data
+        fsm = FeatureSet(a.FSM_FEATURE for a in self.analyzers.values()).extract_series(keypoints)
+        return {f"{exercise}_{a.ANGLE_NAME}": fsm[a.FSM_FEATURE] for exercise, a in self.analyzers.items()}
+
+    def analyze_video(self, frames: Iterable, pose_estimator, batch: bool = False,
+                      on_frame: Optional[Callable[[int], None]] = None, sampler: Optional[FrameSampler] = None) -> Dict:
+        """Run pose estimation and rep analysis over ``frames`` in a single pass.
+
+        ``frames`` may be any iterable, e.g. the ``iter_video_frames`` generator.
+        No frames are kept: the report decodes the few it shows afterwards
+        (see ``analysis.keyframes``). With ``batch=True`` only the keypoint
+        track is built while decoding and reps are detected afterwards by
+        ``analyze_track``. ``on_frame`` is called with the number of frames
+        processed so far, e.g. to report job progress.
+
+        A ``sampler`` decides which frames go through pose inference; skipped
+        frames are interpolated and the analysis runs in batch mode.
+        """
+        if sampler is not None:
+            return self._analyze_sampled(frames, pose_estimator, sampler, on_frame)
 
-    def analyze_video(self, frames: List, pose_estimator) -> Dict:
         for idx, frame in enumerate(frames):
+            self.frame_count += 1
             landmarks = pose_estimator.extract_keypoints(frame)
-            if landmarks:
-                self._process("squat", idx, landmarks, self.squat.analyze)
-                self._process("pushup", idx, landmarks, self.pushup.analyze)
+            self.track.append(landmarks)
+            if on_frame is not None:
+                on_frame(self.frame_count)
+            if landmarks and not batch:
+                features = self.features.extract(as_array(landmarks))
+                for exercise in self.analyzers:
+                    self._process(exercise, idx, features)
+        if batch:
+            self.analyze_track(self.track)
         return self.results
 
-    def _process(self, exercise: str, idx: int, lm: Dict, analyzer_fn):
-        did_rep, angle, issues, count_it = analyzer_fn(lm)
-        if count_it:
-            self.results["summary"][f"{exercise}s"]["total_reps"] += 1
-            if not issues:
-                self.results["summary"][f"{exercise}s"]["good_form_reps"] += 1
+    def _analyze_sampled(self, frames: Iterable, pose_estimator, sampler: FrameSampler,
+                         on_frame: Optional[Callable[[int], None]]) -> Dict:
+        raw = KeypointTrack()
+        inferred = []
+        for idx, frame in enumerate(frames):
+            self.frame_count += 1
+            if sampler.should_infer(idx, frame):
+                keypoints = pose_estimator.extract_raw_keypoints(frame)
+                sampler.record(idx, frame, keypoints)
+                raw.append(keypoints)
+                inferred.append(True)
             else:
-                self.results["summary"][f"{exercise}s"]["common_issues"].extend(issues)
-
-            self.results["frame_data"].append({
-                "frame_index": idx,
-                "exercise": exercise,
-                "rep_id": self.squat.rep_count if exercise == "squat" else self.pushup.rep_count,
-                "is_form_ok": not issues,
-                "angles": {"knee" if exercise == "squat" else "elbow": angle},
-                "issues": issues
-            })
+                raw.append(None)
+                inferred.append(False)
+            if on_frame is not None:
+                on_frame(self.frame_count)
+
+        filled = interpolate_skipped(raw.data, np.array(inferred, dtype=bool))
+        self.track = KeypointTrack.from_array(ema_smooth_track(filled, pose_estimator.alpha))
+        return self.analyze_track(self.track)
+
+    def analyze_track(self, track: KeypointTrack) -> Dict:
+        """Detect reps over a complete keypoint track in one vectorized pass.
+
+        Produces the same ``summary``/``frame_data`` as streaming every frame
+        through ``_process``.
+        """
+        if track is not self.track:
+            self.track = track
+            self.frame_count = len(track)
+        series = self.features.extract_series(track.data)
+        reps = []
+        # (frame, order) sorting reproduces the streaming order of the registry
+        for order, (exercise, analyzer) in enumerate(self.analyzers.items()):
+            first_rep_id = analyzer.rep_count + 1
+            for n, (idx, angle, issues) in enumerate(analyzer.update_series(series)):
+                reps.append((idx, order, exercise, first_rep_id + n, angle, issues))
+        for idx, _, exercise, rep_id, angle, issues in sorted(reps, key=lambda rep: rep[:2]):
+            self._log_rep(exercise, idx, rep_id, angle, issues)
+        return self.results
+
+    def _process(self, exercise: str, idx: int, features: Dict):
+        analyzer = self.analyzers[exercise]
+        did_rep, angle, issues, count_it = analyzer.update(features)
+        if count_it:
+            self._log_rep(exercise, idx, analyzer.rep_count, angle, issues)
+
+    def _log_rep(self, exercise: str, idx: int, rep_id: int, angle: float, issues: List[str]):
+        self.results["summary"][f"{exercise}s"]["total_reps"] += 1
+        if not issues:
+            self.results["summary"][f"{exercise}s"]["good_form_reps"] += 1
+        else:
+            self.results["summary"][f"{exercise}s"]["common_issues"].extend(issues)
+
+        self.results["frame_data"].append({
+            "frame_index": idx,
+            "exercise": exercise,
+            "rep_id": rep_id,
+            "is_form_ok": not issues,
+            "angles": {self.analyzers[exercise].ANGLE_NAME: angle},
+            "issues": issues
+        })
@@ -1,10 +1,157 @@
+"""
+Angle kernels for 2-D landmarks.
+
+``calculate_angle``/``angle_between_vectors`` are the reference definitions:
+NumPy ``dot``, ``linalg.norm``, ``clip``, ``arccos`` and ``degrees``. For 2-D
+float64 points they take a scalar fast path on plain Python floats that
+creates no arrays yet returns bit-identical results: ``_dot2`` reproduces
+``np.dot`` of two 2-vectors (BLAS fuses the second product into the sum on
+FMA hardware) and the single ``np.arccos`` call keeps NumPy's SIMD arccos.
+Which ``_dot2`` matches is checked once at import; if none does, the fast
+path is disabled and everything goes through NumPy.
+
+The batched kernels (``angles_between_vectors``, ``calculate_angles`` and
+``joint_angles``) compute any number of angles in one vectorized call and
+give the same bits as the scalar functions.
+"""
+
+import math
+from typing import Optional, Sequence, Tuple
 import numpy as np
-def calculate_angle(a, b, c) -> float:
-    a, b, c = np.array(a), np.array(b), np.array(c)
-    ba, bc = a - b, c - b
-    cos_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc) + 1e-6)
+
+# np.degrees multiplies by this constant
+_RAD2DEG = 180.0 / math.pi
+# Veltkamp splitting constant (2**27 + 1) for exact float64 products
+_SPLIT = 134217729.0
+
+
+def _numpy_angle_between_vectors(v1, v2) -> float:
+    cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
     return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
 
+
+def _numpy_calculate_angle(a, b, c) -> float:
+    a, b, c = np.array(a), np.array(b), np.array(c)
+    return _numpy_angle_between_vectors(a - b, c - b)
+
+
+def _plain_dot2(ux: float, uy: float, vx: float, vy: float) -> float:
+    return ux * vx + uy * vy
+
+
+def _fused_dot2(ux: float, uy: float, vx: float, vy: float) -> float:
+    # fma(uy, vy, ux * vx): the exact product uy * vy is hi + lo, and fsum
+    # rounds the three-term sum once
+    hi = uy * vy
+    t = _SPLIT * uy
+    uh = t - (t - uy)
+    ul = uy - uh
+    t = _SPLIT * vy
+    vh = t - (t - vy)
+    vl = vy - vh
+    lo = ((uh * vh - hi) + uh * vl + ul * vh) + ul * vl
+    try:
+        return math.fsum((ux * vx, hi, lo))
+    except (ValueError, OverflowError):  # inf/NaN inputs
+        return ux * vx + hi
+
+
+def _row_dot(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # matmul keeps the same accumulation as np.dot on single vectors, so the
+    # batched results match the scalar functions exactly
+    return np.matmul(u[..., None, :], v[..., :, None])[..., 0, 0]
+
+
+def _select_dot2():
+    """The pure-Python dot that agrees with ``np.dot`` and ``_row_dot`` here, or None."""
+    samples = np.random.default_rng(0).uniform(-2.0, 2.0, (64, 4))
+    # Only a fused multiply-add gets this one right (exactly 2**-60)
+    samples[0] = (-(1 + 2.0 ** -29), 1 + 2.0 ** -30, 1.0, 1 + 2.0 ** -30)
+    expected = [float(np.dot(s[:2], s[2:])) for s in samples]
+    if expected != _row_dot(samples[:, :2], samples[:, 2:]).tolist():
+        return None
+    for dot2 in (_fused_dot2, _plain_dot2):
+        if [dot2(*s) for s in samples.tolist()] == expected:
+            return dot2
+    return None
+
+
+_dot2 = _select_dot2()
+
+
+def vector_angle_2d(ux: float, uy: float, vx: float, vy: float) -> float:
+    """Angle in degrees between (ux, uy) and (vx, vy); floats in, float out.
+
+    Same bits as ``angle_between_vectors`` on the equivalent float64 arrays.
+    """
+    if _dot2 is None:
+        return float(_numpy_angle_between_vectors(np.array([ux, uy]), np.array([vx, vy])))
+    norms = math.sqrt(_dot2(ux, uy, ux, uy)) * math.sqrt(_dot2(vx, vy, vx, vy))
+    cos_angle = _dot2(ux, uy, vx, vy) / (norms + 1e-6)
+    # Comparisons are False for NaN, which passes through like np.clip
+    if cos_angle < -1.0:
+        cos_angle = -1.0
+    elif cos_angle > 1.0:
+        cos_angle = 1.0
+    return float(np.arccos(cos_angle)) * _RAD2DEG
+
+
+def joint_angle_2d(ax: float, ay: float, bx: float, by: float, cx: float, cy: float) -> float:
+    """Angle in degrees at (bx, by) between the segments to a and c; see ``vector_angle_2d``."""
+    return vector_angle_2d(ax - bx, ay - by, cx - bx, cy - by)
+
+
+def _point_2d(p) -> Optional[Tuple[float, float]]:
+    # Only inputs NumPy would compute in float64 take the fast path; ints,
+    # float32 and higher dimensions keep NumPy's own type handling
+    if type(p) is np.ndarray:
+        return p.tolist() if p.shape == (2,) and p.dtype == np.float64 else None
+    if type(p) in (list, tuple) and len(p) == 2 and isinstance(p[0], float) and isinstance(p[1], float):
+        return p
+    return None
+
+
+def calculate_angle(a, b, c) -> float:
+    """Angle in degrees at ``b`` between the segments to ``a`` and ``c``."""
+    if _dot2 is not None:
+        pa, pb, pc = _point_2d(a), _point_2d(b), _point_2d(c)
+        if pa is not None and pb is not None and pc is not None:
+            return joint_angle_2d(pa[0], pa[1], pb[0], pb[1], pc[0], pc[1])
+    return _numpy_calculate_angle(a, b, c)
+
+
 def angle_between_vectors(v1, v2) -> float:
-    cos_angle = np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2) + 1e-6)
-    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
\ No newline at end of file
+    """Angle in degrees between ``v1`` and ``v2``."""
+    if _dot2 is not None:
+        u, v = _point_2d(v1), _point_2d(v2)
+        if u is not None and v is not None:
+            return vector_angle_2d(u[0], u[1], v[0], v[1])
+    return _numpy_angle_between_vectors(v1, v2)
+
+
+def angles_between_vectors(v1: np.ndarray, v2: np.ndarray) -> np.ndarray:
+    """Vectorized ``angle_between_vectors`` over the leading axes of (..., 2) arrays."""
+    norms = np.sqrt(_row_dot(v1, v1)) * np.sqrt(_row_dot(v2, v2))
+    cos_angle = _row_dot(v1, v2) / (norms + 1e-6)
+    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+
+def calculate_angles(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Vectorized ``calculate_angle`` for whole point series, e.g. (T, 2) arrays.
+
+    NaN points (frames without landmarks) yield NaN angles.
+    """
+    return angles_between_vectors(a - b, c - b)
+
+
+def joint_angles(keypoints: np.ndarray, triplets: Sequence[Sequence[int]]) -> np.ndarray:
+    """Angles of M joint triplets over N frames in one call.
+
+    ``keypoints`` is (N, K, D) with x, y in the first two columns, e.g. a
+    keypoint track; ``triplets`` holds M ``(a, b, c)`` landmark indices with
+    the angle taken at ``b``. Returns (N, M) degrees, NaN where a landmark is
+    missing.
+    """
+    triplets = np.asarray(triplets, dtype=np.intp).reshape(-1, 3)
+    points = keypoints[:, triplets, :2].astype(np.float64)  # (N, M, 3, 2)
+    return calculate_angles(points[:, :, 0], points[:, :, 1], points[:, :, 2])
@@ -0,0 +1,33 @@
+import numpy as np
+
+
+def hysteresis_down_states(angles: np.ndarray, down_below: float, up_above: float,
+                           initially_down: bool = False) -> np.ndarray:
+    """Vectorized form of the up/down rep FSM.
+
+    The streaming analyzers switch to "down" when the angle drops below
+    ``down_below`` and back to "up" when it rises above ``up_above``. Since the
+    two conditions never hold together, the state after each frame is simply
+    the last triggered condition, found with a running maximum over trigger
+    positions. NaN angles (missing landmarks) trigger nothing.
+
+    Returns a bool array, True where the FSM is in the "down" state.
+    """
+    if down_below > up_above:
+        raise ValueError("down threshold must not exceed up threshold")
+    trigger = np.full(len(angles), -1, dtype=np.int8)
+    trigger[angles < down_below] = 1
+    trigger[angles > up_above] = 0
+
+    positions = np.where(trigger >= 0, np.arange(len(angles)), -1)
+    last = np.maximum.accumulate(positions) if len(angles) else positions
+    return np.where(last >= 0, trigger[np.maximum(last, 0)] == 1, initially_down)
+
+
+def rep_completions(angles: np.ndarray, down_below: float, up_above: float,
+                    initially_down: bool = False):
+    """Frame indices where a rep completes (down -> up), plus the final state."""
+    is_down = hysteresis_down_states(angles, down_below, up_above, initially_down)
+    previous = np.concatenate(([initially_down], is_down[:-1]))
+    final_down = bool(is_down[-1]) if len(is_down) else initially_down
+    return np.flatnonzero(previous & ~is_down), final_down
@@ -0,0 +1,35 @@
+"""
+Registry of exercise analyzers.
+
+An analyzer class provides ``DOWN_ANGLE``/``UP_ANGLE`` thresholds (overridable
+per instance through ``down_angle``/``up_angle``), ``ANGLE_NAME``,
+``FSM_FEATURE`` and ``REQUIRED_FEATURES`` (names from ``analysis.features``),
+``ANGLE_JOINTS``, ``rep_count``, and ``update(features)`` /
+``update_series(series)`` for streaming and batch analysis. Registered
+exercises are analyzed by ``ExerciseAnalyzer`` and live sessions and get a
+``<name>s`` block in the summary; registration order is the order reps of
+the same frame are logged in.
+"""
+
+from typing import Dict, Optional
+from analysis.squat_analyzer import SquatAnalyzer
+from analysis.pushup_analyzer import PushupAnalyzer
+
+EXERCISES: Dict[str, type] = {}
+
+
+def register_exercise(name: str, analyzer_cls: type) -> type:
+    if name in EXERCISES and EXERCISES[name] is not analyzer_cls:
+        raise ValueError(f"Exercise {name} is already registered")
+    EXERCISES[name] = analyzer_cls
+    return analyzer_cls
+
+
+def create_analyzers(thresholds: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, object]:
+    """One fresh analyzer per registered exercise, with optional threshold overrides."""
+    thresholds = thresholds or {}
+    return {name: cls(**thresholds.get(name, {})) for name, cls in EXERCISES.items()}
+
+
+register_exercise("squat", SquatAnalyzer)
+register_exercise("pushup", PushupAnalyzer)
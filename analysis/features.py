@@ -0,0 +1,122 @@
+"""
+Joint features shared by all exercise analyzers.
+
+Every feature is defined once, by name, from a triplet or pair of landmarks.
+A ``FeatureSet`` compiles the features a group of analyzers needs: per frame
+it gathers the distinct landmarks once and computes each distinct landmark
+difference and angle once with the scalar angle kernel, so the cost grows
+with the number of distinct features rather than the number of exercises.
+Whole tracks go through the batched kernel in one vectorized call for batch
+analysis; both kernels give identical bits.
+"""
+
+from typing import Dict, Iterable, Tuple
+import numpy as np
+from analysis.angles import angles_between_vectors, vector_angle_2d
+from pose.landmarks import (
+    LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, LEFT_HIP, LEFT_KNEE, LEFT_ANKLE,
+    RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST, RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE,
+)
+
+JOINT_ANGLE = "joint_angle"  # angle at joints[1] between the limbs to joints[0] and joints[2]
+LINE_ANGLE = "line_angle"  # angle between segments joints[0]->joints[1] and joints[1]->joints[2]
+VECTOR = "vector"  # joints[1] - joints[0], in normalized (x, y)
+_KINDS = (JOINT_ANGLE, LINE_ANGLE, VECTOR)
+
+
+class Feature:
+    __slots__ = ("name", "kind", "joints")
+
+    def __init__(self, name: str, kind: str, joints: Tuple[int, ...]):
+        self.name = name
+        self.kind = kind
+        self.joints = joints
+
+
+FEATURES: Dict[str, Feature] = {}
+
+
+def define_feature(name: str, kind: str, joints: Iterable[int]) -> Feature:
+    """Register a feature; redefining a name with different joints is an error."""
+    joints = tuple(joints)
+    if kind not in _KINDS:
+        raise ValueError(f"Unknown feature kind: {kind}")
+    if len(joints) != (2 if kind == VECTOR else 3):
+        raise ValueError(f"{kind} feature {name} needs {2 if kind == VECTOR else 3} joints")
+    existing = FEATURES.get(name)
+    if existing is not None and (existing.kind, existing.joints) != (kind, joints):
+        raise ValueError(f"Feature {name} is already defined differently")
+    FEATURES[name] = Feature(name, kind, joints)
+    return FEATURES[name]
+
+
+define_feature("left_knee_angle", JOINT_ANGLE, (LEFT_HIP, LEFT_KNEE, LEFT_ANKLE))
+define_feature("right_knee_angle", JOINT_ANGLE, (RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE))
+define_feature("left_elbow_angle", JOINT_ANGLE, (LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST))
+define_feature("right_elbow_angle", JOINT_ANGLE, (RIGHT_SHOULDER, RIGHT_ELBOW, RIGHT_WRIST))
+define_feature("left_hip_angle", JOINT_ANGLE, (LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE))
+define_feature("left_body_line", LINE_ANGLE, (LEFT_SHOULDER, LEFT_HIP, LEFT_ANKLE))
+define_feature("left_shin", VECTOR, (LEFT_KNEE, LEFT_ANKLE))
+
+
+class FeatureSet:
+    """Computes a fixed set of features, per frame or over a whole track.
+
+    Feature records are dicts: angles are floats (NaN when a landmark is
+    missing) per frame and (T,) arrays per track; vectors are (2,) and
+    (T, 2) arrays.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names = tuple(dict.fromkeys(names))
+        unknown = [name for name in self.names if name not in FEATURES]
+        if unknown:
+            raise KeyError(f"Unknown features: {', '.join(unknown)}")
+        features = [FEATURES[name] for name in self.names]
+        # Distinct landmarks, gathered once per frame
+        self.joints = sorted({joint for feature in features for joint in feature.joints})
+        position = {joint: i for i, joint in enumerate(self.joints)}
+
+        # Every feature is built from differences of two landmarks; each
+        # distinct difference is computed once.
+        segments: Dict[Tuple[int, int], int] = {}
+
+        def segment(head: int, tail: int) -> int:
+            return segments.setdefault((position[head], position[tail]), len(segments))
+
+        self._vectors, self._angles = [], []
+        for f in features:
+            if f.kind == VECTOR:
+                self._vectors.append((f.name, segment(f.joints[1], f.joints[0])))
+            elif f.kind == JOINT_ANGLE:
+                self._angles.append((f.name, segment(f.joints[0], f.joints[1]), segment(f.joints[2], f.joints[1])))
+            else:
+                self._angles.append((f.name, segment(f.joints[1], f.joints[0]), segment(f.joints[2], f.joints[1])))
+        self._segment_joints = list(segments)
+        self._heads = np.array([head for head, _ in segments], dtype=np.intp)
+        self._tails = np.array([tail for _, tail in segments], dtype=np.intp)
+        self._first = np.array([first for _, first, _ in self._angles], dtype=np.intp)
+        self._second = np.array([second for _, _, second in self._angles], dtype=np.intp)
+
+    def extract(self, keypoints: np.ndarray) -> Dict:
+        """Features of one (33, 4) frame."""
+        # Plain floats: a handful of values is cheaper without array calls
+        points = keypoints[self.joints, :2].astype(np.float64).tolist()
+        segments = [(points[head][0] - points[tail][0], points[head][1] - points[tail][1])
+                    for head, tail in self._segment_joints]
+        record = {name: np.array(segments[i]) for name, i in self._vectors}
+        for name, first, second in self._angles:
+            (ux, uy), (vx, vy) = segments[first], segments[second]
+            record[name] = vector_angle_2d(ux, uy, vx, vy)
+        return record
+
+    def extract_series(self, keypoints: np.ndarray) -> Dict:
+        """Features of a whole (T, 33, 4) track."""
+        points = keypoints[:, self.joints, :2].astype(np.float64)
+        segments = points[:, self._heads] - points[:, self._tails]
+        record = {name: segments[:, i] for name, i in self._vectors}
+        if self._angles:
+            angles = angles_between_vectors(segments[:, self._first], segments[:, self._second])
+            record.update((name, angles[:, i]) for i, (name, _, _) in enumerate(self._angles))
+        return record
+
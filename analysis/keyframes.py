@@ -0,0 +1,93 @@
+"""
+Deterministic choice of the frames shown in the report.
+
+Each logged rep is represented by its bottom: the frame with the smallest
+FSM angle since the exercise's previous rep. The worst-form rep, the one
+whose bottom is shallowest, is always shown; the remaining slots go to reps
+spread evenly over the video. Only the chosen frames are decoded afterwards
+(see ``read_frames_at``), so no frames need to be kept during analysis.
+
+Depth is judged from the bottom angle rather than the logged issues: the
+analyzers check form at the up-transition, where the angle is always above
+the FSM thresholds, so every squat rep carries ``INSUFFICIENT_DEPTH``.
+Bottom angles of different exercises are compared as they are.
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+
+
+class Keyframe:
+    __slots__ = ("frame_index", "exercise", "rep_id", "issues", "angle", "worst_form")
+
+    def __init__(self, frame_index: int, exercise: str, rep_id: int, issues: List[str],
+                 angle: float = float("nan"), worst_form: bool = False):
+        self.frame_index = frame_index
+        self.exercise = exercise
+        self.rep_id = rep_id
+        self.issues = issues
+        self.angle = angle  # FSM angle at the bottom, NaN when unknown
+        self.worst_form = worst_form
+
+    @property
+    def title(self) -> str:
+        title = f"{self.exercise.title()} Rep {self.rep_id} - bottom, frame {self.frame_index}"
+        if not np.isnan(self.angle):
+            title += f", {self.angle:.0f} deg"
+        if self.worst_form:
+            title += " - worst form"
+            if self.issues:
+                title += f": {', '.join(self.issues)}"
+        return title
+
+    def _severity(self):
+        """Sort key, larger is worse: shallowest bottom, then most issues, then earliest."""
+        known = not np.isnan(self.angle)
+        return known, self.angle if known else 0.0, len(self.issues), -self.frame_index
+
+
+def rep_bottoms(frame_data: List[Dict], angles: Optional[Dict[str, np.ndarray]] = None) -> List[Keyframe]:
+    """One keyframe per logged rep, at the lowest FSM angle of that rep.
+
+    ``angles`` maps each exercise to its per-frame FSM angle (NaN without a
+    pose). Reps of exercises without angles, or without any valid angle, use
+    the frame at which the rep was logged and have a NaN ``angle``.
+    """
+    angles = angles or {}
+    previous: Dict[str, int] = {}
+    keyframes = []
+    for row in sorted(frame_data, key=lambda r: r["frame_index"]):
+        exercise, end = row["exercise"], row["frame_index"]
+        start = previous.get(exercise, -1) + 1
+        previous[exercise] = end
+        bottom, angle = end, float("nan")
+        series = angles.get(exercise)
+        if series is not None:
+            window = series[start:end + 1]
+            if len(window) and not np.isnan(window).all():
+                bottom = start + int(np.nanargmin(window))
+                angle = float(window[bottom - start])
+        keyframes.append(Keyframe(bottom, exercise, row["rep_id"], list(row.get("issues", [])), angle))
+    return keyframes
+
+
+def select_keyframes(frame_data: List[Dict], angles: Optional[Dict[str, np.ndarray]] = None,
+                     max_frames: int = 4) -> List[Keyframe]:
+    """Up to ``max_frames`` rep bottoms in video order, always including the worst-form rep.
+
+    The worst-form rep has the shallowest (largest) bottom angle; without
+    angles it is the rep with the most issues.
+    """
+    candidates = rep_bottoms(frame_data, angles)
+    if len(candidates) <= max_frames:
+        chosen = candidates
+    else:
+        chosen = [candidates[i] for i in np.linspace(0, len(candidates) - 1, max_frames).round().astype(int)]
+    worst = max(candidates, key=Keyframe._severity, default=None)
+    if worst is not None and (worst.issues or not np.isnan(worst.angle)):
+        worst.worst_form = True
+        if worst not in chosen:
+            # Replace the evenly spaced pick closest to it in time
+            closest = min(range(len(chosen)), key=lambda i: abs(chosen[i].frame_index - worst.frame_index))
+            chosen[closest] = worst
+    return sorted(chosen, key=lambda k: k.frame_index)
@@ -0,0 +1,158 @@
+"""
+Segment-parallel pose estimation for long videos.
+
+The video is split into contiguous time segments that are processed by
+separate processes, each with its own PoseEstimator. Every segment starts
+``overlap`` frames early so MediaPipe's tracker has settled by the first frame
+that is kept. Segments return raw keypoints; EMA smoothing is applied once
+over the stitched track and reps are detected over the whole track, so both
+are continuous across segment boundaries.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import cv2
+import numpy as np
+from pose.keypoint_track import KeypointTrack
+from pose.landmarks import NUM_LANDMARKS, NUM_COLUMNS, ema_smooth_track
+from metrics.stages import FRAMES_PROCESSED, FRAMES_WITHOUT_LANDMARKS
+
+DEFAULT_OVERLAP = 15
+
+# Per-process estimator, reused across the segments a worker handles
+_worker_estimator = None
+_worker_estimator_kwargs: Optional[Dict] = None
+
+
+def _get_worker_estimator(estimator_kwargs: Dict):
+    global _worker_estimator, _worker_estimator_kwargs
+    if _worker_estimator is None or _worker_estimator_kwargs != estimator_kwargs:
+        from pose.pose_estimator import PoseEstimator
+        _worker_estimator = PoseEstimator(**estimator_kwargs)
+        _worker_estimator_kwargs = estimator_kwargs
+    else:
+        _worker_estimator.reset()
+    return _worker_estimator
+
+
+def _open_at(video_path: str, first: int) -> cv2.VideoCapture:
+    cap = cv2.VideoCapture(video_path)
+    if first > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, first)
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != first:
+            # Container does not support exact seeking; skip frames instead
+            cap.release()
+            cap = cv2.VideoCapture(video_path)
+            for _ in range(first):
+                if not cap.grab():
+                    break
+    return cap
+
+
+def estimate_segment(video_path: str, start: int, end: Optional[int], overlap: int,
+                     resize: Tuple[int, int], estimator_kwargs: Dict) -> Tuple[int, np.ndarray]:
+    """Raw keypoints for frames [start, end) of ``video_path``; ``end=None`` reads to the end."""
+    estimator = _get_worker_estimator(estimator_kwargs)
+    # Tracking state (and the ROI box) from the worker's previous segment does not apply here
+    estimator.reset()
+    first = max(0, start - overlap)
+    missing = np.full((NUM_LANDMARKS, NUM_COLUMNS), np.nan, dtype=np.float32)
+    raw = []
+    cap = _open_at(video_path, first)
+    try:
+        idx = first
+        while end is None or idx < end:
+            success, frame = cap.read()
+            if not success:
+                break
+            keypoints = estimator.extract_raw_keypoints(cv2.resize(frame, resize))
+            if idx >= start:
+                raw.append(missing if keypoints is None else keypoints)
+            idx += 1
+    finally:
+        cap.release()
+    if not raw:
+        return start, np.empty((0, NUM_LANDMARKS, NUM_COLUMNS), dtype=np.float32)
+    return start, np.stack(raw)
+
+
+def split_segments(frame_count: int, workers: int, min_segment: int = 1) -> List[Tuple[int, int]]:
+    """Split ``frame_count`` frames into at most ``workers`` contiguous ranges."""
+    n = max(1, min(workers, frame_count // max(1, min_segment)))
+    bounds = np.linspace(0, frame_count, n + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+# Process pool shared by every caller (request, job and batch threads)
+_executor_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_users = 0
+
+
+@contextmanager
+def _use_executor(workers: int) -> Iterator[ProcessPoolExecutor]:
+    """The shared process pool, sized ``workers`` unless another caller is using it.
+
+    A pool of another size is only replaced while nobody is using it;
+    otherwise the caller runs on the existing pool, whose size then just
+    bounds how many segments run at once.
+    """
+    global _executor, _executor_workers, _executor_users
+    with _executor_lock:
+        if _executor is None or (_executor_workers != workers and _executor_users == 0):
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            # spawn: forking a process that already runs MediaPipe graphs is unsafe
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _executor_workers = workers
+        _executor_users += 1
+        executor = _executor
+    try:
+        yield executor
+    finally:
+        with _executor_lock:
+            _executor_users -= 1
+
+
+def estimate_track_parallel(video_path: str, frame_count: int, workers: int,
+                            overlap: int = DEFAULT_OVERLAP,
+                            resize: Tuple[int, int] = (540, 480),
+                            alpha: float = 0.5,
+                            estimator_kwargs: Optional[Dict] = None,
+                            on_frame: Optional[Callable[[int], None]] = None) -> KeypointTrack:
+    """Smoothed keypoint track of the whole video, estimated segment-parallel."""
+    estimator_kwargs = dict(estimator_kwargs or {}, alpha=alpha)
+    segments = split_segments(frame_count, workers, min_segment=max(1, overlap * 2))
+    parts = {}
+    processed = 0
+    with _use_executor(workers) as executor:
+        # The last segment reads to the end in case the container's frame count is low
+        futures = [
+            executor.submit(estimate_segment, video_path, start, end if i < len(segments) - 1 else None,
+                            overlap, resize, estimator_kwargs)
+            for i, (start, end) in enumerate(segments)
+        ]
+        for future in as_completed(futures):
+            start, raw = future.result()
+            parts[start] = raw
+            processed += len(raw)
+            if on_frame is not None:
+                on_frame(processed)
+
+    # A segment may end early if the container's frame count was optimistic;
+    # everything after the first short segment is dropped to keep indices exact
+    stitched = []
+    for i, (start, end) in enumerate(segments):
+        raw = parts[start]
+        stitched.append(raw)
+        if i < len(segments) - 1 and len(raw) < end - start:
+            break
+    raw_track = np.concatenate(stitched) if stitched else np.empty((0, NUM_LANDMARKS, NUM_COLUMNS), np.float32)
+    # Worker processes have their own metrics; account for their frames here
+    FRAMES_PROCESSED.inc(len(raw_track))
+    FRAMES_WITHOUT_LANDMARKS.inc(int(np.isnan(raw_track[:, :, 0]).all(axis=1).sum()))
+    return KeypointTrack.from_array(ema_smooth_track(raw_track, alpha))
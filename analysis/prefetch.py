@@ -0,0 +1,110 @@
+"""
+Video decoding on a producer thread, overlapped with pose inference.
+
+OpenCV releases the GIL while decoding and resizing, and MediaPipe while it
+runs the graph, so on a multi-core machine the next frames are decoded while
+the current one is analyzed. The frame queue is bounded: the decoder blocks
+once it is ``maxsize`` frames ahead, which keeps memory flat for any video
+length.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Iterator, Optional, Tuple
+import cv2
+import numpy as np
+from metrics.stages import DECODE_SECONDS
+
+# Sentinel closing the queue once the decoder is done
+_DONE = object()
+# How often a blocked decoder checks for cancellation (seconds)
+_POLL = 0.05
+
+
+class FramePrefetcher:
+    """Iterable over the resized frames of a video, decoded on a background thread.
+
+    ``keep(idx)`` returning False makes the decoder only ``grab`` that frame,
+    skipping retrieval and resizing; it is yielded as None so frame indices
+    stay aligned. ``close`` -- also called when iteration ends, stops early or
+    the ``with`` block exits -- cancels decoding and releases the capture.
+    Errors raised on the decoder thread are re-raised to the consumer.
+    """
+
+    def __init__(self, video_path: str, resize: Tuple[int, int] = (540, 480), maxsize: int = 8,
+                 keep: Optional[Callable[[int], bool]] = None):
+        self.video_path = video_path
+        self.resize = resize
+        self.keep = keep
+        self.frames_decoded = 0
+        self.frames_skipped = 0
+        self.decode_seconds = 0.0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="frame-decoder", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "FramePrefetcher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __iter__(self) -> Iterator[Optional[np.ndarray]]:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    break
+                yield item
+            if self._error is not None:
+                raise self._error
+        finally:
+            self.close()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def close(self):
+        """Stop the decoder and wait for it to release the capture."""
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _put(self, item) -> bool:
+        """Block while the queue is full; False once cancelled."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            idx = 0
+            while cap.isOpened() and not self._stop.is_set():
+                start = time.perf_counter()
+                if self.keep is None or self.keep(idx):
+                    success, frame = cap.read()
+                    if success:
+                        frame = cv2.resize(frame, self.resize)
+                        self.frames_decoded += 1
+                else:
+                    success, frame = cap.grab(), None
+                    self.frames_skipped += success
+                self.decode_seconds += time.perf_counter() - start
+                if not success or not self._put(frame):
+                    break
+                idx += 1
+        except BaseException as e:
+            self._error = e
+        finally:
+            cap.release()
+            DECODE_SECONDS.observe(self.decode_seconds)
+            self._put(_DONE)
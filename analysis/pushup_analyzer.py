@@ -1,43 +1,71 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
-from analysis.angles import calculate_angle, angle_between_vectors
+from analysis.batch import rep_completions
+from analysis.features import FEATURES, FeatureSet
+from pose.landmarks import as_array
 
 class PushupAnalyzer:
-    def __init__(self):
+    DOWN_ANGLE = 90  # elbow angle below which the pushup is "down"
+    UP_ANGLE = 160  # elbow angle above which the pushup is back "up"
+    ANGLE_NAME = "elbow"  # name of the FSM angle in frame_data
+    FSM_FEATURE = "left_elbow_angle"  # feature driving the FSM
+    REQUIRED_FEATURES = ("left_elbow_angle", "left_body_line")  # everything ``update`` reads
+    ANGLE_JOINTS = FEATURES[FSM_FEATURE].joints  # landmarks of the angle driving the FSM
+
+    def __init__(self, down_angle: Optional[float] = None, up_angle: Optional[float] = None):
         self.state = "up"
         self.rep_count = 0
+        # Per-instance overrides of the class thresholds, e.g. for re-analysis
+        if down_angle is not None:
+            self.DOWN_ANGLE = down_angle
+        if up_angle is not None:
+            self.UP_ANGLE = up_angle
 
     def analyze(self, lm: Dict) -> Tuple[bool, float, List[str], bool]:
-        try:
-            shoulder = [lm["LEFT_SHOULDER"]['x'], lm["LEFT_SHOULDER"]['y']]
-            elbow = [lm["LEFT_ELBOW"]['x'], lm["LEFT_ELBOW"]['y']]
-            wrist = [lm["LEFT_WRIST"]['x'], lm["LEFT_WRIST"]['y']]
-            hip = [lm["LEFT_HIP"]['x'], lm["LEFT_HIP"]['y']]
-            ankle = [lm["LEFT_ANKLE"]['x'], lm["LEFT_ANKLE"]['y']]
-
-            angle = calculate_angle(shoulder, elbow, wrist)
-            transition = False
-
-            if self.state == "up" and angle < 90:
-                self.state = "down"
-            elif self.state == "down" and angle > 160:
-                self.state = "up"
-                self.rep_count += 1
-                transition = True
-
-            if transition:
-                vec1 = np.array(hip) - np.array(shoulder)
-                vec2 = np.array(ankle) - np.array(hip)
-                body_line_angle = angle_between_vectors(vec1, vec2)
-
-                issues = []
-                if abs(body_line_angle - 180) > 15:
-                    issues.append("BODY_LINE_BREAK")
-                if angle < 60:
-                    issues.append("ELBOW_FLARE")
-
-                return True, angle, issues, True
-
-            return False, angle, [], False
-        except KeyError:
+        """``update`` from landmarks; ``ExerciseAnalyzer`` shares one extraction across exercises instead."""
+        return self.update(_FEATURES.extract(as_array(lm)))
+
+    def update(self, features: Dict) -> Tuple[bool, float, List[str], bool]:
+        angle, body_line = features["left_elbow_angle"], features["left_body_line"]
+        if np.isnan(angle) or np.isnan(body_line):
             return False, 0, [], False
+
+        transition = False
+
+        if self.state == "up" and angle < self.DOWN_ANGLE:
+            self.state = "down"
+        elif self.state == "down" and angle > self.UP_ANGLE:
+            self.state = "up"
+            self.rep_count += 1
+            transition = True
+
+        if transition:
+            return True, angle, self._check_form(angle, body_line), True
+
+        return False, angle, [], False
+
+    def update_series(self, series: Dict) -> List[Tuple[int, float, List[str]]]:
+        """Batch form of ``update`` over a whole track's features.
+
+        Returns ``(frame_index, angle, issues)`` for every completed rep and
+        leaves ``state``/``rep_count`` as if each frame had been streamed.
+        """
+        body_line = series["left_body_line"]
+        angles = series["left_elbow_angle"].copy()
+        angles[np.isnan(body_line)] = np.nan
+
+        frames, final_down = rep_completions(angles, self.DOWN_ANGLE, self.UP_ANGLE, self.state == "down")
+        self.state = "down" if final_down else "up"
+        self.rep_count += len(frames)
+        return [(idx, angles[idx], self._check_form(angles[idx], body_line[idx])) for idx in frames.tolist()]
+
+    def _check_form(self, angle: float, body_line_angle: float) -> List[str]:
+        issues = []
+        if abs(body_line_angle - 180) > 15:
+            issues.append("BODY_LINE_BREAK")
+        if angle < 60:
+            issues.append("ELBOW_FLARE")
+        return issues
+
+
+_FEATURES = FeatureSet(PushupAnalyzer.REQUIRED_FEATURES)
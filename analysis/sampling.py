@@ -0,0 +1,140 @@
+"""
+Adaptive frame sampling for pose inference.
+
+Frames are analyzed at a target rate instead of the source rate, and a cheap
+frame-difference gate skips inference on frames that barely changed since the
+last analyzed one. Near the rep FSM thresholds every frame is analyzed so rep
+boundaries and depth are not missed. Skipped frames are filled in afterwards
+by interpolating between neighbouring analyzed frames.
+"""
+
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from analysis.angles import calculate_angle
+
+# Size of the grayscale thumbnail compared by the motion gate
+_THUMB_SIZE = (64, 48)
+
+
+class FrameSampler:
+    """Decides per frame whether pose inference should run.
+
+    ``watched`` lists ``((a, b, c), thresholds)`` pairs: the joint triplet of
+    an FSM angle and the angles at which that FSM changes state. While the last
+    measured angle is within ``dense_margin`` degrees of one of them, neither
+    the stride nor the motion gate skip frames.
+
+    Pose trackers such as MediaPipe's video mode follow the person from the
+    previous frame they saw and only stabilise after a run of consecutive
+    frames. Every frame is therefore analyzed until the pose has been found on
+    ``settle_seconds`` worth of frames in a row, and again after any analyzed
+    frame that missed the pose.
+    """
+
+    def __init__(self, source_fps: float, target_fps: Optional[float] = 15.0,
+                 motion_threshold: float = 1.5, dense_margin: float = 15.0,
+                 watched: Sequence[Tuple[Tuple[int, int, int], Iterable[float]]] = (),
+                 max_gap_seconds: float = 1.0, settle_seconds: float = 1.0):
+        source_fps = source_fps if source_fps and source_fps > 0 else 30.0
+        self.source_fps = source_fps
+        self.stride = max(1, int(round(source_fps / target_fps))) if target_fps else 1
+        self.motion_threshold = motion_threshold
+        self.dense_margin = dense_margin
+        self.watched = [(list(joints), tuple(thresholds)) for joints, thresholds in watched]
+        self.max_gap = max(1, int(source_fps * max_gap_seconds))
+        self.settle = int(source_fps * settle_seconds)
+
+        self.dense = False
+        self._last_idx: Optional[int] = None
+        self._last_thumb: Optional[np.ndarray] = None
+        self._tracked = 0
+
+        self.frames_total = 0
+        self.frames_inferred = 0
+        self.skipped_stride = 0
+        self.skipped_static = 0
+
+    def should_infer(self, idx: int, frame: np.ndarray) -> bool:
+        self.frames_total += 1
+        if self._last_idx is None or self.dense or self._tracked < self.settle:
+            return True
+        gap = idx - self._last_idx
+        if gap < self.stride:
+            self.skipped_stride += 1
+            return False
+        if self.motion_threshold > 0 and gap < self.max_gap and self._last_thumb is not None:
+            if self._motion(frame) < self.motion_threshold:
+                self.skipped_static += 1
+                return False
+        return True
+
+    def record(self, idx: int, frame: np.ndarray, keypoints: Optional[np.ndarray]):
+        """Register an analyzed frame and its raw keypoints."""
+        self.frames_inferred += 1
+        self._last_idx = idx
+        if self.motion_threshold > 0:
+            self._last_thumb = self._thumbnail(frame)
+        self._tracked = self._tracked + 1 if keypoints is not None else 0
+        self.dense = keypoints is not None and self._near_threshold(keypoints)
+
+    def _near_threshold(self, keypoints: np.ndarray) -> bool:
+        for joints, thresholds in self.watched:
+            points = keypoints[joints, :2].astype(np.float64)
+            if np.isnan(points).any():
+                continue
+            angle = calculate_angle(*points)
+            if any(abs(angle - t) < self.dense_margin for t in thresholds):
+                return True
+        return False
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        small = cv2.resize(frame, _THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+
+    def _motion(self, frame: np.ndarray) -> float:
+        return float(np.abs(self._thumbnail(frame) - self._last_thumb).mean())
+
+    def stats(self) -> Dict:
+        skipped = self.frames_total - self.frames_inferred
+        return {
+            "frames_total": self.frames_total,
+            "frames_inferred": self.frames_inferred,
+            "skipped_stride": self.skipped_stride,
+            "skipped_static": self.skipped_static,
+            "savings_pct": round(100.0 * skipped / self.frames_total, 1) if self.frames_total else 0.0,
+            "source_fps": round(self.source_fps, 2),
+            "stride": self.stride,
+        }
+
+
+def interpolate_skipped(raw: np.ndarray, inferred: np.ndarray) -> np.ndarray:
+    """Fill frames that were not analyzed from their analyzed neighbours.
+
+    ``raw`` is a (T, ...) track with NaN on skipped frames and ``inferred``
+    marks the analyzed frames. Skipped frames are linearly interpolated
+    between the nearest analyzed frames with a pose, so an anchor that missed
+    a pose is bridged. They stay NaN only when the analyzed frames on both
+    sides missed it. Leading/trailing skipped frames hold the nearest value.
+    """
+    out = raw.copy()
+    has_pose = inferred & ~np.isnan(raw.reshape(len(raw), -1)).all(axis=1)
+    anchors = np.flatnonzero(has_pose)
+    analyzed = np.flatnonzero(inferred)
+    skipped = np.flatnonzero(~inferred)
+    if len(anchors) == 0 or len(skipped) == 0:
+        return out
+    # Keep gaps whose analyzed neighbours both saw no pose
+    pos = np.searchsorted(analyzed, skipped)
+    before = analyzed[np.clip(pos - 1, 0, len(analyzed) - 1)]
+    after = analyzed[np.clip(pos, 0, len(analyzed) - 1)]
+    skipped = skipped[has_pose[before] | has_pose[after]]
+
+    pos = np.searchsorted(anchors, skipped)
+    left = anchors[np.clip(pos - 1, 0, len(anchors) - 1)]
+    right = anchors[np.clip(pos, 0, len(anchors) - 1)]
+    span = np.maximum(right - left, 1)
+    weight = np.clip((skipped - left) / span, 0.0, 1.0).astype(raw.dtype)
+    weight = weight.reshape((-1,) + (1,) * (raw.ndim - 1))
+    out[skipped] = raw[left] * (1 - weight) + raw[right] * weight
+    return out
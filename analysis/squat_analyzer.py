@@ -1,35 +1,71 @@
-from typing import Dict, List, Tuple
-from analysis.angles import calculate_angle
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from analysis.batch import rep_completions
+from analysis.features import FEATURES, FeatureSet
+from pose.landmarks import as_array
 
 class SquatAnalyzer:
-    def __init__(self):
+    DOWN_ANGLE = 100  # knee angle below which the squat is "down"
+    UP_ANGLE = 160  # knee angle above which the squat is back "up"
+    ANGLE_NAME = "knee"  # name of the FSM angle in frame_data
+    FSM_FEATURE = "left_knee_angle"  # feature driving the FSM
+    REQUIRED_FEATURES = ("left_knee_angle", "left_shin")  # everything ``update`` reads
+    ANGLE_JOINTS = FEATURES[FSM_FEATURE].joints  # landmarks of the angle driving the FSM
+
+    def __init__(self, down_angle: Optional[float] = None, up_angle: Optional[float] = None):
         self.state = "up"
         self.rep_count = 0
+        # Per-instance overrides of the class thresholds, e.g. for re-analysis
+        if down_angle is not None:
+            self.DOWN_ANGLE = down_angle
+        if up_angle is not None:
+            self.UP_ANGLE = up_angle
 
     def analyze(self, lm: Dict) -> Tuple[bool, float, List[str], bool]:
-        try:
-            hip = [lm["LEFT_HIP"]['x'], lm["LEFT_HIP"]['y']]
-            knee = [lm["LEFT_KNEE"]['x'], lm["LEFT_KNEE"]['y']]
-            ankle = [lm["LEFT_ANKLE"]['x'], lm["LEFT_ANKLE"]['y']]
-
-            angle = calculate_angle(hip, knee, ankle)
-            transition = False
-
-            if self.state == "up" and angle < 100:
-                self.state = "down"
-            elif self.state == "down" and angle > 160:
-                self.state = "up"
-                self.rep_count += 1
-                transition = True
-
-            if transition:
-                issues = []
-                if angle > 100:
-                    issues.append("INSUFFICIENT_DEPTH")
-                if abs(knee[0] - ankle[0]) > 0.2:
-                    issues.append("KNEE_OVER_TOE")
-                return True, angle, issues, True
-
-            return False, angle, [], False
-        except KeyError:
+        """``update`` from landmarks; ``ExerciseAnalyzer`` shares one extraction across exercises instead."""
+        return self.update(_FEATURES.extract(as_array(lm)))
+
+    def update(self, features: Dict) -> Tuple[bool, float, List[str], bool]:
+        angle, shin = features["left_knee_angle"], features["left_shin"]
+        if np.isnan(angle) or np.isnan(shin).any():
             return False, 0, [], False
+
+        transition = False
+
+        if self.state == "up" and angle < self.DOWN_ANGLE:
+            self.state = "down"
+        elif self.state == "down" and angle > self.UP_ANGLE:
+            self.state = "up"
+            self.rep_count += 1
+            transition = True
+
+        if transition:
+            return True, angle, self._check_form(angle, shin), True
+
+        return False, angle, [], False
+
+    def update_series(self, series: Dict) -> List[Tuple[int, float, List[str]]]:
+        """Batch form of ``update`` over a whole track's features.
+
+        Returns ``(frame_index, angle, issues)`` for every completed rep and
+        leaves ``state``/``rep_count`` as if each frame had been streamed.
+        """
+        shin = series["left_shin"]
+        angles = series["left_knee_angle"].copy()
+        angles[np.isnan(shin).any(axis=1)] = np.nan
+
+        frames, final_down = rep_completions(angles, self.DOWN_ANGLE, self.UP_ANGLE, self.state == "down")
+        self.state = "down" if final_down else "up"
+        self.rep_count += len(frames)
+        return [(idx, angles[idx], self._check_form(angles[idx], shin[idx])) for idx in frames.tolist()]
+
+    def _check_form(self, angle: float, shin: np.ndarray) -> List[str]:
+        issues = []
+        if angle > self.DOWN_ANGLE:
+            issues.append("INSUFFICIENT_DEPTH")
+        if abs(shin[0]) > 0.2:  # knee and ankle far apart horizontally
+            issues.append("KNEE_OVER_TOE")
+        return issues
+
+
+_FEATURES = FeatureSet(SquatAnalyzer.REQUIRED_FEATURES)
@@ -0,0 +1,50 @@
+"""
+Binary columnar storage of analysis tracks.
+
+Every analysis writes ``<video_id>_keypoints.npy``, the smoothed (T, 33, 4)
+float32 landmark track, and ``<video_id>_angles.npy``, a structured array with
+one float32 field per FSM angle. Both are plain .npy files so they open
+memory-mapped: frame-range reads touch only the pages they need, and
+re-analysis with other thresholds runs from the stored track without decoding
+the video again.
+"""
+
+import os
+from typing import Dict, Optional
+import numpy as np
+from pose.keypoint_track import KeypointTrack
+
+
+def keypoints_path(folder: str, video_id: str) -> str:
+    return os.path.join(folder, f"{video_id}_keypoints.npy")
+
+
+def angles_path(folder: str, video_id: str) -> str:
+    return os.path.join(folder, f"{video_id}_angles.npy")
+
+
+def save_track(folder: str, video_id: str, track: KeypointTrack, angles: Dict[str, np.ndarray]):
+    """Write the keypoint track and per-frame angle series of ``video_id``."""
+    os.makedirs(folder, exist_ok=True)
+    np.save(keypoints_path(folder, video_id), np.ascontiguousarray(track.data, dtype=np.float32))
+    table = np.full(len(track), np.nan, dtype=[(name, np.float32) for name in angles])
+    for name, values in angles.items():
+        table[name] = values
+    np.save(angles_path(folder, video_id), table)
+
+
+def load_track(folder: str, video_id: str, mmap: bool = True) -> Optional[KeypointTrack]:
+    """Stored track of ``video_id`` (read-only memmap by default), None if missing."""
+    try:
+        data = np.load(keypoints_path(folder, video_id), mmap_mode='r' if mmap else None)
+    except (OSError, ValueError):
+        return None
+    return KeypointTrack.from_array(data, copy=not mmap)
+
+
+def load_angles(folder: str, video_id: str, mmap: bool = True) -> Optional[np.ndarray]:
+    """Structured (T,) array of stored angle series, None if missing."""
+    try:
+        return np.load(angles_path(folder, video_id), mmap_mode='r' if mmap else None)
+    except (OSError, ValueError):
+        return None
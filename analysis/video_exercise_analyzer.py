@@ -1,50 +1,122 @@
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
+import time
 import cv2
-import mediapipe as mp
 import numpy as np
-from typing import Dict, Tuple, List
-from pose.pose_estimator import PoseEstimator
-from analysis.analyzer import ExerciseAnalyzer
+from typing import Dict, Tuple, List, Iterator, Iterable
+from metrics.stages import DECODE_SECONDS
 
-def load_video_frames(video_path: str, resize: Tuple[int, int] = (540, 480)) -> List[np.ndarray]:
+
+def iter_video_frames(video_path: str, resize: Tuple[int, int] = (540, 480)) -> Iterator[np.ndarray]:
+    """Decode and resize frames lazily, one at a time, so memory stays flat for any video length.
+
+    To overlap decoding with pose inference, wrap it in ``FramePrefetcher``.
+    """
     cap = cv2.VideoCapture(video_path)
-    frames = []
-    while cap.isOpened():
-        success, frame = cap.read()
-        if not success:
-            break
-        frame_resized = cv2.resize(frame, resize)
-        frames.append(frame_resized)
-    cap.release()
-    return frames
+    decode_seconds = 0.0
+    try:
+        while cap.isOpened():
+            start = time.perf_counter()
+            success, frame = cap.read()
+            if success:
+                frame = cv2.resize(frame, resize)
+            decode_seconds += time.perf_counter() - start
+            if not success:
+                break
+            yield frame
+    finally:
+        cap.release()
+        DECODE_SECONDS.observe(decode_seconds)
 
-def load_video_frames(video_path: str, resize: Tuple[int, int] = (540, 480)) -> List[np.ndarray]:
-    print(f"Loading video from: {video_path}")  # Add this line
+
+def probe_frame_count(video_path: str) -> int:
+    """Frame count from the container metadata (0 when unknown)."""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        cap.release()
+
+
+def probe_fps(video_path: str) -> float:
+    """Frame rate from the container metadata (0.0 when unknown)."""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+    finally:
+        cap.release()
+
+
+def probe_size(video_path: str) -> Tuple[int, int]:
+    """(width, height) from the container metadata ((0, 0) when unknown)."""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        cap.release()
+
+
+def fit_size(size: Tuple[int, int], max_side: int) -> Tuple[int, int]:
+    """``size`` scaled down (never up) so its longer side is at most ``max_side``, keeping the aspect ratio."""
+    width, height = size
+    if width <= 0 or height <= 0:
+        width, height = 540, 480  # unknown source: assume the classic analysis size
+    scale = min(1.0, max_side / max(width, height))
+    # Even dimensions keep codecs and resizers happy
+    return max(2, int(round(width * scale / 2)) * 2), max(2, int(round(height * scale / 2)) * 2)
+
+
+def read_frames_at(video_path: str, indices: Iterable[int],
+                   resize: Tuple[int, int] = (540, 480), seek_gap: int = 30) -> Dict[int, np.ndarray]:
+    """Decode only the frames at ``indices``.
+
+    Gaps of more than ``seek_gap`` frames are skipped by seeking, which
+    decodes from the preceding keyframe; shorter gaps are grabbed without
+    retrieving the images. If the backend does not land on the requested
+    frame, the rest is read by grabbing from the start.
+    """
+    wanted = sorted(set(indices))
+    frames = {}
+    if not wanted:
+        return frames
     cap = cv2.VideoCapture(video_path)
-    frames = []
-    while cap.isOpened():
-        success, frame = cap.read()
-        if not success:
-            break
-        frame_resized = cv2.resize(frame, resize)
-        frames.append(frame_resized)
-    cap.release()
-    print(f"Total frames loaded: {len(frames)}")  # Add this line
+    try:
+        idx = 0
+        for target in wanted:
+            if seek_gap is not None and target - idx > seek_gap:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == target:
+                    idx = target
+                else:
+                    cap.release()
+                    cap = cv2.VideoCapture(video_path)
+                    idx, seek_gap = 0, None
+            while idx < target:
+                if not cap.grab():
+                    return frames
+                idx += 1
+            success, frame = cap.read()
+            if not success:
+                break
+            frames[target] = cv2.resize(frame, resize)
+            idx += 1
+    finally:
+        cap.release()
     return frames
 
-def main():
+
+def load_video_frames(video_path: str, resize: Tuple[int, int] = (540, 480)) -> List[np.ndarray]:
+    """Decode the whole video into memory. Prefer ``iter_video_frames`` for long videos."""
+    return list(iter_video_frames(video_path, resize))
+
+
+def main(video_path: str = 'pose/1.mp4'):
+    from pose.pose_estimator import PoseEstimator
+    from analysis.analyzer import ExerciseAnalyzer
+
     pose_estimator = PoseEstimator(alpha=0.5)
     analyzer = ExerciseAnalyzer()
-    
-    # Load video
-    video_path = 'pose/1.mp4'
-    frames = load_video_frames(video_path)
 
-    # Analyze
-    results = analyzer.analyze_video(frames, pose_estimator)
+    # Stream and analyze the video in a single pass
+    results = analyzer.analyze_video(iter_video_frames(video_path), pose_estimator)
 
     # Show summary
     import json
@@ -59,5 +131,6 @@ def main():
     #         break
     # cv2.destroyAllWindows()
 
-# if __name__ == "__main__":
-#     main()
+if __name__ == "__main__":
+    import sys
+    main(*sys.argv[1:2])
@@ -2,8 +2,10 @@
 Flask API for Exercise Analysis Service
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory
+import io
 import os
+import time
 import uuid
 import cv2
 import numpy as np
@@ -11,11 +13,27 @@ import logging
 import traceback
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
-from analysis.analyzer import ExerciseAnalyzer
-from pose.pose_estimator import PoseEstimator
-from analysis.video_exercise_analyzer import load_video_frames
+from analysis.video_exercise_analyzer import probe_frame_count
 import json
-from report.report_generator import save_json_and_csv, generate_pdf_report
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pose.estimator_pool import EstimatorPool
+from api.presets import PRESETS, UnknownPreset, get_preset, estimator_options
+from pose.pose_estimator import PoseEstimator
+from api.pipeline import run_analysis, VideoProcessingError
+from api.jobs import JobManager, JobQueueFull, Job
+from api.result_cache import ResultCache, save_upload, cache_key
+from api.batch import BatchError, save_clips, run_batch
+from api.report_tasks import ReportTasks
+from metrics import stages as metrics
+from metrics.registry import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from api.live import LiveSessionManager, SessionLimitReached, FrameStreamError, read_length_prefixed
+from api.responses import (analysis_response, requested_format, compress_response,
+                           load_frames, keypoints_csv)
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.track_store import load_track, load_angles
+from pose.landmarks import LANDMARK_NAMES, COLUMNS
+from analysis.exercises import EXERCISES
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +51,124 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(REPORT_FOLDER, exist_ok=True)
 os.makedirs('logs', exist_ok=True)
 
+# Background analysis jobs
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', 16))
+ANALYZE_MODE = os.getenv('ANALYZE_MODE', 'sync')  # default when the request doesn't choose
+job_manager = JobManager(max_workers=JOB_WORKERS, max_pending=JOB_QUEUE_LIMIT)
+
+# Speed/accuracy presets (see api/presets.py); requests may choose another one
+DEFAULT_PRESET = get_preset()['name']
+# ROI tracking crops each frame to the previous pose; frames are already at
+# the analysis resolution, so crops need no size cap
+ROI_OPTIONS = {
+    'roi_tracking': os.getenv('POSE_ROI_TRACKING', '0') == '1',
+}
+
+
+def estimator_kwargs(preset):
+    """``PoseEstimator`` keyword arguments for a preset."""
+    return dict(estimator_options(preset), **ROI_OPTIONS)
+
+
+# Pre-warmed pose estimators shared by request and job workers, one pool per
+# preset; estimators are created on first use except for the default preset
+ESTIMATOR_POOL_SIZE = int(os.getenv('ESTIMATOR_POOL_SIZE', JOB_WORKERS))
+estimator_pools = {name: EstimatorPool(size=ESTIMATOR_POOL_SIZE, **estimator_kwargs(get_preset(name)))
+                   for name in PRESETS}
+ESTIMATOR_WARMUP = os.getenv('ESTIMATOR_WARMUP', '1') == '1'
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+
+
+def start_estimator_warmup():
+    """Load the default preset's models on a background thread, once.
+
+    Called by the first request and by the development server, never at
+    import, so importing the app loads no models.
+    """
+    global _warmup_thread
+    if _warmup_thread is not None or not ESTIMATOR_WARMUP:
+        return
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=estimator_pools[DEFAULT_PRESET].warm_up,
+                                              name="estimator-warmup", daemon=True)
+            _warmup_thread.start()
+
+# /analyze/batch: clips analyzed concurrently; the estimator pool bounds inference
+BATCH_MAX_CLIPS = int(os.getenv('BATCH_MAX_CLIPS', 50))
+BATCH_MAX_BYTES = int(float(os.getenv('BATCH_MAX_MB', 500)) * 1024 * 1024)
+batch_executor = ThreadPoolExecutor(max_workers=int(os.getenv('BATCH_WORKERS', ESTIMATOR_POOL_SIZE)),
+                                    thread_name_prefix="batch-clip")
+
+# Decode frames on a background thread while pose inference runs, at most
+# DECODE_QUEUE_SIZE frames ahead (each 540x480 frame is about 0.75 MB)
+DECODE_THREAD = os.getenv('DECODE_THREAD', '1') == '1'
+DECODE_QUEUE_SIZE = int(os.getenv('DECODE_QUEUE_SIZE', 8))
+
+# Render an annotated MP4 from the keypoints after each analysis (opt-in: it
+# re-decodes the whole upload and stores a second video per analysis)
+ANNOTATED_VIDEO = os.getenv('ANNOTATED_VIDEO', '0') == '1'
+
+# Segment-parallel pose estimation for long videos
+POSE_WORKERS = int(os.getenv('POSE_WORKERS', 1))
+PARALLEL_MIN_FRAMES = int(os.getenv('PARALLEL_MIN_FRAMES', 600))
+
+# Results cache keyed by upload content and analysis configuration
+RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE', '1') == '1'
+result_cache = ResultCache(
+    REPORT_FOLDER,
+    max_bytes=int(float(os.getenv('RESULT_CACHE_MAX_MB', 1024)) * 1024 * 1024),
+    max_age_seconds=float(os.getenv('RESULT_CACHE_MAX_AGE_HOURS', 168)) * 3600
+)
+
+# PDF reports are rendered in the background after /analyze responds
+report_tasks = ReportTasks(max_workers=int(os.getenv('REPORT_WORKERS', 1)))
+REPORT_WAIT_SECONDS = float(os.getenv('REPORT_WAIT_SECONDS', 30))
+REPORT_MAX_AGE = int(os.getenv('REPORT_MAX_AGE', 3600))  # Cache-Control max-age for downloads
+
+# Live sessions: each holds its own PoseEstimator while open
+live_sessions = LiveSessionManager(
+    estimator_factory=lambda: PoseEstimator(**estimator_kwargs(get_preset(DEFAULT_PRESET))),
+    max_sessions=int(os.getenv('LIVE_MAX_SESSIONS', 2)),
+    idle_timeout=float(os.getenv('LIVE_IDLE_TIMEOUT', 30)),
+    default_latency_ms=float(os.getenv('LIVE_TARGET_LATENCY_MS', 200))
+)
+
+# Gauges read at scrape time
+metrics.JOB_QUEUE_DEPTH.set_function(lambda: job_manager.queue_depth)
+metrics.REPORT_QUEUE_DEPTH.set_function(lambda: report_tasks.queue_depth)
+metrics.LIVE_SESSIONS.set_function(lambda: live_sessions.active)
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+    metrics.IN_FLIGHT.inc()
+
+
+# The first request (usually the health check) starts the warm-up
+app.before_request(start_estimator_warmup)
+
+
+@app.teardown_request
+def finish_request_timer(error=None):
+    metrics.IN_FLIGHT.dec()
+
+
+@app.after_request
+def record_request_latency(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        metrics.REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint=request.endpoint or 'unmatched',
+                                        method=request.method, status=response.status_code)
+    return response
+
+
+# gzip (or brotli, if installed) JSON and NDJSON responses
+app.after_request(compress_response)
+
 # Allowed file extensions
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'mkv', 'webm'}
 
@@ -43,6 +179,87 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def pipeline_options(preset):
+    """Server-configured keyword arguments for ``run_analysis`` under ``preset``."""
+    return {
+        'estimator_pool': estimator_pools[preset['name']],
+        'estimator_kwargs': estimator_kwargs(preset),
+        'pose_workers': POSE_WORKERS,
+        'parallel_min_frames': PARALLEL_MIN_FRAMES,
+        'target_fps': preset['target_fps'],
+        'motion_threshold': preset['motion_threshold'],
+        'max_side': preset['max_side'],
+        'decode_thread': DECODE_THREAD,
+        'decode_queue_size': DECODE_QUEUE_SIZE,
+        'report_tasks': report_tasks,
+        'annotated_video': ANNOTATED_VIDEO,
+    }
+
+
+def analysis_config(preset):
+    """Everything besides the video content that affects analysis results."""
+    options = {k: v for k, v in pipeline_options(preset).items()
+               if k not in ('estimator_pool', 'decode_thread', 'decode_queue_size', 'report_tasks')}
+    options.update({f'{exercise}_thresholds': (analyzer.DOWN_ANGLE, analyzer.UP_ANGLE)
+                    for exercise, analyzer in EXERCISES.items()})
+    return options
+
+
+def requested_preset():
+    """Preset named by ``?preset=`` or the ``preset`` form field; UnknownPreset if invalid."""
+    return get_preset(request.args.get('preset') or request.form.get('preset') or DEFAULT_PRESET)
+
+
+def include_frames():
+    """``?frames=none`` drops frame_data; it stays available from /analysis/<id>/frames."""
+    return request.args.get('frames', '').lower() != 'none'
+
+
+def frame_range():
+    """``start``/``end`` query arguments; ValueError unless non-negative integers."""
+    bounds = []
+    for name in ('start', 'end'):
+        value = request.args.get(name)
+        if value in (None, ''):
+            bounds.append(None)
+            continue
+        if not value.isdigit():
+            raise ValueError("start and end must be non-negative integers")
+        bounds.append(int(value))
+    return tuple(bounds)
+
+
+def parse_thresholds(body):
+    """Validate ``{"squat": {"down_angle": .., "up_angle": ..}, "pushup": {..}}``."""
+    thresholds = {}
+    for exercise, analyzer in EXERCISES.items():
+        given = body.get(exercise) or {}
+        if not isinstance(given, dict) or set(given) - {'down_angle', 'up_angle'}:
+            raise ValueError(f"{exercise}: only down_angle and up_angle can be set")
+        down = given.get('down_angle', analyzer.DOWN_ANGLE)
+        up = given.get('up_angle', analyzer.UP_ANGLE)
+        if not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (down, up)) \
+                or not 0 <= down < up <= 180:
+            raise ValueError(f"{exercise}: expected 0 <= down_angle < up_angle <= 180")
+        thresholds[exercise] = {'down_angle': down, 'up_angle': up}
+    return thresholds
+
+
+def _nullable(values: np.ndarray):
+    """NaN -> None so arrays serialize as valid JSON."""
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+def wants_async():
+    """Job mode via ?mode=async, a 'mode' form field or 'Prefer: respond-async'."""
+    mode = request.args.get('mode') or request.form.get('mode')
+    if mode:
+        return mode.lower() == 'async'
+    if 'respond-async' in request.headers.get('Prefer', ''):
+        return True
+    return ANALYZE_MODE == 'async'
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
@@ -61,22 +278,61 @@ def index():
         'version': '1.0.0',
         'description': 'Computer vision API for exercise form analysis',
         'endpoints': {
-            'POST /analyze': 'Analyze exercise video',
+            'POST /analyze': 'Analyze exercise video (?mode=async for a background job, '
+                             '?format=rows|columns|ndjson, ?frames=none for the summary only)',
+            'GET /analysis/<video_id>/frames': 'Frame data for ?start=&end= frame range',
+            'GET /analysis/<video_id>/track': 'Stored keypoints and angles for ?start=&end=',
+            'POST /analyze/batch': 'Analyze many clips or a zip archive; NDJSON results',
+            'POST /analysis/<video_id>/reanalyze': 'Re-run rep detection with new thresholds',
+            'GET /jobs/<job_id>': 'Background job status, progress and result',
             'GET /report/<video_id>': 'Download PDF report',
+            'GET /video/<video_id>': 'Annotated MP4 (supports Range requests)',
+            'POST /live/sessions': 'Open a live analysis session',
+            'POST /live/sessions/<id>/frames': 'Send JPEG frames to a live session',
+            'GET /live/sessions/<id>/events': 'NDJSON stream of live rep events',
+            'DELETE /live/sessions/<id>': 'Close a live session',
+            'GET /cache/stats': 'Result cache statistics',
+            'GET /metrics': 'Prometheus metrics',
             'GET /health': 'Health check',
             'GET /': 'API information'
         },
         'supported_formats': list(ALLOWED_EXTENSIONS),
+        'presets': list(PRESETS),
+        'default_preset': DEFAULT_PRESET,
         'max_file_size': f"{app.config['MAX_CONTENT_LENGTH'] / (1024*1024):.0f}MB"
     }), 200
 
+def cached_analysis(key, video_path):
+    """Stored response for ``key`` (the upload is then removed), or None."""
+    if not RESULT_CACHE_ENABLED:
+        return None
+    cached = result_cache.get(key)
+    if cached is None:
+        return None
+    logger.info(f"Cache hit for upload {os.path.basename(video_path)}: video {cached['video_id']}")
+    os.remove(video_path)
+    return dict(cached, cached=True)
+
+
+def analyze_upload(video_path, video_id, key, preset, **kwargs):
+    """Run the pipeline on a saved upload and cache the response under ``key``."""
+    response = run_analysis(video_path, video_id, REPORT_FOLDER, **kwargs, **pipeline_options(preset))
+    response["throughput"]["preset"] = preset['name']
+    if RESULT_CACHE_ENABLED:
+        result_cache.put(key, video_id, response)
+    return response
+
+
 @app.route('/analyze', methods=['POST'])
 def analyze_video():
     """
     Analyze exercise video for form and repetition counting.
 
-    Expected: multipart/form-data with 'video' file
-    Returns: JSON with analysis results
+    Expected: multipart/form-data with 'video' file; ``?preset=`` (or a
+    ``preset`` form field) picks fast, balanced or accurate
+    Returns: JSON with analysis results; ``?format=columns`` lays frame_data
+    out as parallel arrays and ``?format=ndjson`` (or ``Accept:
+    application/x-ndjson``) streams it line by line.
     """
     try:
         # Check if video file is present
@@ -95,67 +351,352 @@ def analyze_video():
                 "error": f"File type not supported. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
             }), 400
 
+        try:
+            preset = requested_preset()
+        except UnknownPreset as e:
+            return jsonify({"error": str(e)}), 400
+
         filename = secure_filename(video.filename)
         video_id = str(uuid.uuid4())
         video_path = os.path.join(UPLOAD_FOLDER, f"{video_id}_{filename}")
-        video.save(video_path)
+        content_hash = save_upload(video, video_path)
+        metrics.UPLOAD_BYTES.observe(os.path.getsize(video_path))
+        key = cache_key(content_hash, analysis_config(preset))
+
+        cached = cached_analysis(key, video_path)
+        if cached is not None:
+            return analysis_response(cached, requested_format(), include_frames())
 
         logger.info(f"Processing video: {video_path}")
 
-        # Load and process video
-        frames = load_video_frames(video_path)
+        def analyze(**kwargs):
+            return analyze_upload(video_path, video_id, key, preset, **kwargs)
+
+        if wants_async():
+            job = Job(job_id=video_id, total_frames=probe_frame_count(video_path))
+
+            def process(job):
+                try:
+                    return analyze(on_frame=job.update_progress)
+                except VideoProcessingError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error processing video: {str(e)}")
+                    raise RuntimeError("Internal server error during video processing") from e
+
+            try:
+                job_manager.submit(process, job)
+            except JobQueueFull:
+                os.remove(video_path)
+                return jsonify({"error": "Too many queued jobs, retry later"}), 503
+
+            response = jsonify({
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": f"/jobs/{job.id}"
+            })
+            response.headers['Location'] = f"/jobs/{job.id}"
+            return response, 202
 
-        if not frames:
-            return jsonify({"error": "Failed to process video or no frames extracted"}), 400
+        try:
+            return analysis_response(analyze(), requested_format(), include_frames())
+        except VideoProcessingError as e:
+            return jsonify({"error": str(e)}), 400
 
-        pose_estimator = PoseEstimator(alpha=0.5)
-        analyzer = ExerciseAnalyzer()
-        results = analyzer.analyze_video(frames, pose_estimator)
+    except RequestEntityTooLarge:
+        return jsonify({"error": "File too large. Maximum size is 50MB"}), 413
 
-        # Save data and PDF
-        summary_path, csv_path = save_json_and_csv(results, video_id, REPORT_FOLDER)
-        generate_pdf_report(video_id, results, frames, REPORT_FOLDER)
+    except Exception as e:
+        logger.error(f"Error processing video: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({"error": "Internal server error during video processing"}), 500
 
-        logger.info(f"Analysis complete for video {video_id}")
+@app.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """
+    Analyze many clips in one call.
 
-        # Clean up uploaded file (optional)
+    Expected: multipart/form-data with any number of video files and/or zip
+    archives of videos; ``?preset=`` as for /analyze. Returns NDJSON: one
+    ``clip`` line per clip as it finishes (completion order), then a
+    ``summary`` line merging the per-clip summaries. ``?frames=none`` drops
+    frame_data from the clip results.
+    """
+    # A session of clips may exceed the single-upload limit (per-request limits need Flask 3.1)
+    request.max_content_length = BATCH_MAX_BYTES
+    try:
+        preset = requested_preset()
+    except UnknownPreset as e:
+        return jsonify({"error": str(e)}), 400
+    files = [f for name in request.files for f in request.files.getlist(name) if f.filename]
+    if not files:
+        return jsonify({"error": "No video files provided"}), 400
+    try:
+        clips = save_clips(files, UPLOAD_FOLDER, allowed_file, max_clips=BATCH_MAX_CLIPS, max_bytes=BATCH_MAX_BYTES)
+    except BatchError as e:
+        return jsonify({"error": str(e)}), 400
+    for clip in clips:
+        metrics.UPLOAD_BYTES.observe(os.path.getsize(clip.path))
+    logger.info(f"Batch of {len(clips)} clips")
+
+    def analyze(clip):
+        key = cache_key(clip.content_hash, analysis_config(preset))
+        cached = cached_analysis(key, clip.path)
+        if cached is not None:
+            return cached
         try:
-            os.remove(video_path)
+            return analyze_upload(clip.path, clip.video_id, key, preset)
+        except VideoProcessingError:
+            raise
         except Exception as e:
-            logger.warning(f"Failed to remove uploaded file: {e}")
+            logger.exception(f"Error processing batch clip {clip.name}")
+            raise RuntimeError("Internal server error during video processing") from e
+
+    events = run_batch(clips, analyze, batch_executor, include_frames=include_frames())
+    lines = (json.dumps(event) + "\n" for event in events)
+    return Response(lines, mimetype='application/x-ndjson')
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Status, progress and (when done) result of a background analysis job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@app.route('/analysis/<video_id>/frames', methods=['GET'])
+def analysis_frames(video_id):
+    """frame_data rows with ``start <= frame_index < end``, in the requested format."""
+    try:
+        try:
+            start, end = frame_range()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        rows = load_frames(REPORT_FOLDER, video_id, start, end)
+        if rows is None:
+            return jsonify({"error": "Analysis not found"}), 404
+        payload = {"video_id": video_id, "start": start, "end": end, "frame_data": rows}
+        return analysis_response(payload, requested_format())
+
+    except Exception as e:
+        logger.error(f"Error reading frames: {str(e)}")
+        return jsonify({"error": "Failed to read analysis frames"}), 500
+
+
+@app.route('/analysis/<video_id>/track', methods=['GET'])
+def analysis_track(video_id):
+    """Stored keypoints and angle series for frames [start, end).
+
+    JSON by default (NaN as null); ``?format=npz`` returns the slices as
+    ``keypoints``/``angles`` arrays of an .npz file and ``?format=csv`` streams
+    the keypoints with one row per landmark. Only the requested range is read
+    from the memory-mapped files.
+    """
+    try:
+        try:
+            start, end = frame_range()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        track = load_track(REPORT_FOLDER, video_id)
+        angles = load_angles(REPORT_FOLDER, video_id)
+        if track is None or angles is None:
+            return jsonify({"error": "Analysis not found"}), 404
+        window = slice(start, end)
+        first = min(start or 0, len(track))
+        if request.args.get('format') == 'csv':
+            return Response(keypoints_csv(track.data[window], first), mimetype='text/csv', headers={
+                'Content-Disposition': f'attachment; filename={video_id}_keypoints.csv'})
+
+        keypoints = np.asarray(track.data[window])
+        angle_slice = np.asarray(angles[window])
+
+        if request.args.get('format') == 'npz':
+            buffer = io.BytesIO()
+            np.savez(buffer, keypoints=keypoints, angles=angle_slice)
+            return Response(buffer.getvalue(), mimetype='application/octet-stream', headers={
+                'Content-Disposition': f'attachment; filename={video_id}_track.npz'})
 
         return jsonify({
             "video_id": video_id,
-            "summary": results["summary"],
-            "frame_data": results["frame_data"],
-            "pdf_url": f"/report/{video_id}"
+            "start": first,
+            "frames": len(keypoints),
+            "total_frames": len(track),
+            "landmarks": list(LANDMARK_NAMES),
+            "columns": list(COLUMNS),
+            "keypoints": _nullable(keypoints),
+            "angles": {name: _nullable(angle_slice[name]) for name in angle_slice.dtype.names},
         })
 
-    except RequestEntityTooLarge:
-        return jsonify({"error": "File too large. Maximum size is 50MB"}), 413
+    except Exception as e:
+        logger.error(f"Error reading track: {str(e)}")
+        return jsonify({"error": "Failed to read analysis track"}), 500
+
+
+@app.route('/analysis/<video_id>/reanalyze', methods=['POST'])
+def reanalyze(video_id):
+    """Re-run rep detection on the stored track with new FSM thresholds.
+
+    Expects a JSON body such as ``{"squat": {"down_angle": 95, "up_angle": 165}}``.
+    No video is decoded; stored results and reports are left unchanged.
+    """
+    try:
+        body = request.get_json(silent=True)
+        if not isinstance(body, dict):
+            return jsonify({"error": "Expected a JSON object with thresholds"}), 400
+        try:
+            thresholds = parse_thresholds(body)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        track = load_track(REPORT_FOLDER, video_id)
+        if track is None:
+            return jsonify({"error": "Analysis not found"}), 404
+        results = ExerciseAnalyzer(thresholds).analyze_track(track)
+        payload = {"video_id": video_id, "thresholds": thresholds,
+                   "summary": results["summary"], "frame_data": results["frame_data"]}
+        return analysis_response(payload, requested_format(), include_frames())
 
     except Exception as e:
-        logger.error(f"Error processing video: {str(e)}")
-        logger.error(traceback.format_exc())
-        return jsonify({"error": "Internal server error during video processing"}), 500
+        logger.error(f"Error re-analyzing {video_id}: {str(e)}")
+        return jsonify({"error": "Internal server error during re-analysis"}), 500
+
+
+@app.route('/live/sessions', methods=['POST'])
+def create_live_session():
+    """Open a live session. Optional JSON body: ``{"target_latency_ms": 150}``."""
+    body = request.get_json(silent=True) or {}
+    target = body.get('target_latency_ms')
+    if target is not None and (not isinstance(target, (int, float)) or isinstance(target, bool) or target <= 0):
+        return jsonify({"error": "target_latency_ms must be a positive number"}), 400
+    try:
+        session = live_sessions.create(target)
+    except SessionLimitReached as e:
+        return jsonify({"error": str(e)}), 503
+
+    base = f"/live/sessions/{session.id}"
+    response = jsonify(dict(session.to_dict(), frames_url=f"{base}/frames", events_url=f"{base}/events"))
+    response.headers['Location'] = base
+    return response, 201
+
+
+@app.route('/live/sessions/<session_id>/frames', methods=['POST'])
+def live_frames(session_id):
+    """Send frames: one ``image/jpeg`` body, or a (chunked) stream of frames
+    each prefixed with its 4-byte big-endian length."""
+    session = live_sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    try:
+        if request.mimetype == 'image/jpeg':
+            session.submit(request.get_data())
+        else:
+            for payload in read_length_prefixed(request.stream):
+                session.submit(payload)
+    except FrameStreamError as e:
+        return jsonify({"error": str(e)}), 400
+    except RuntimeError:
+        return jsonify({"error": "Session is closed"}), 409
+    return jsonify(session.to_dict()), 202
+
+
+@app.route('/live/sessions/<session_id>/events', methods=['GET'])
+def live_events(session_id):
+    """NDJSON stream of rep events (those after ``?after=<seq>``) until the session closes."""
+    session = live_sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    after = request.args.get('after', type=int)
+    lines = (json.dumps(event) + "\n" for event in session.events(after))
+    return Response(lines, mimetype='application/x-ndjson')
+
+
+@app.route('/live/sessions/<session_id>', methods=['GET'])
+def live_session_status(session_id):
+    session = live_sessions.get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify(session.to_dict()), 200
+
+
+@app.route('/live/sessions/<session_id>', methods=['DELETE'])
+def close_live_session(session_id):
+    """Close a session after its queued frames are analyzed; returns final counts."""
+    session = live_sessions.close(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify(session.to_dict()), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus text exposition of stage latencies, frame counters and gauges."""
+    return Response(metrics.REGISTRY.expose(), content_type=METRICS_CONTENT_TYPE)
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Result cache hit/miss counters and size limits."""
+    return jsonify(result_cache.stats()), 200
+
 
 @app.route('/report/<video_id>', methods=['GET'])
 def download_report(video_id):
-    """Download PDF report for a specific video analysis."""
+    """Download PDF report for a specific video analysis.
+
+    Waits for a render still running in the background and supports
+    conditional requests (ETag / Last-Modified), so repeat downloads get 304.
+    """
     try:
         filename = f"{video_id}.pdf"
         file_path = os.path.join(REPORT_FOLDER, filename)
 
+        if not report_tasks.wait(video_id, timeout=REPORT_WAIT_SECONDS):
+            response = jsonify({"status": "rendering", "pdf_url": f"/report/{video_id}"})
+            response.headers['Retry-After'] = '5'
+            return response, 202
+
         if not os.path.exists(file_path):
             return jsonify({"error": "Report not found"}), 404
 
-        return send_from_directory(REPORT_FOLDER, filename, as_attachment=True)
+        return send_from_directory(os.path.abspath(REPORT_FOLDER), filename, as_attachment=True,
+                                   conditional=True, etag=True, max_age=REPORT_MAX_AGE)
 
     except Exception as e:
         logger.error(f"Error downloading report: {str(e)}")
         return jsonify({"error": "Failed to download report"}), 500
 
 
+@app.route('/video/<video_id>', methods=['GET'])
+def annotated_video(video_id):
+    """Annotated MP4 of an analysis: skeleton, FSM angles and rep counters.
+
+    Waits for a render still running in the background like /report. Range
+    requests get 206 partial content, so players can seek without
+    downloading the whole file.
+    """
+    try:
+        filename = f"{video_id}_annotated.mp4"
+
+        if not report_tasks.wait(f"{video_id}.mp4", timeout=REPORT_WAIT_SECONDS):
+            response = jsonify({"status": "rendering", "video_url": f"/video/{video_id}"})
+            response.headers['Retry-After'] = '5'
+            return response, 202
+
+        if not os.path.exists(os.path.join(REPORT_FOLDER, filename)):
+            return jsonify({"error": "Annotated video not found"}), 404
+
+        return send_from_directory(os.path.abspath(REPORT_FOLDER), filename, mimetype='video/mp4',
+                                   conditional=True, etag=True, max_age=REPORT_MAX_AGE)
+
+    except Exception as e:
+        logger.error(f"Error serving annotated video: {str(e)}")
+        return jsonify({"error": "Failed to serve annotated video"}), 500
+
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
@@ -183,6 +724,7 @@ def internal_error(error):
 
 if __name__ == '__main__':
     # Development server
+    start_estimator_warmup()
     app.run(host='0.0.0.0', port=5000, debug=True)
 
 
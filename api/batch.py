@@ -0,0 +1,163 @@
+"""
+Analysis of many clips per request, e.g. a whole coaching session.
+
+Clips arrive as several uploaded files and/or zip archives. They are saved
+(and hashed for the result cache) up front, then analyzed concurrently; the
+estimator pool bounds how many run pose inference at once. Results are
+yielded as each clip finishes, followed by one summary merging the
+``squats``/``pushups`` blocks of every successful clip.
+"""
+
+import os
+import time
+import uuid
+import zipfile
+import logging
+from concurrent.futures import Executor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List
+from werkzeug.utils import secure_filename
+from api.result_cache import save_stream
+
+logger = logging.getLogger(__name__)
+
+
+class BatchError(ValueError):
+    """The batch upload cannot be accepted (no clips, too many, too large)."""
+
+
+class Clip:
+    __slots__ = ("index", "name", "video_id", "path", "content_hash")
+
+    def __init__(self, index: int, name: str, video_id: str, path: str, content_hash: str):
+        self.index = index
+        self.name = name
+        self.video_id = video_id
+        self.path = path
+        self.content_hash = content_hash
+
+
+def _is_zip(filename: str) -> bool:
+    return filename.lower().endswith('.zip')
+
+
+def save_clips(files: Iterable, upload_folder: str, allowed: Callable[[str], bool],
+               max_clips: int = 50, max_bytes: int = 500 * 1024 * 1024) -> List[Clip]:
+    """Save uploaded videos and the videos inside uploaded zip archives.
+
+    Archive members that are not videos (per ``allowed``) are ignored; any
+    other unsupported upload, more than ``max_clips`` clips or more than
+    ``max_bytes`` of extracted video raise ``BatchError``. Already saved
+    clips are removed when that happens.
+    """
+    clips: List[Clip] = []
+    budget = [max_bytes]
+
+    def add(name: str, stream) -> None:
+        if len(clips) >= max_clips:
+            raise BatchError(f"At most {max_clips} clips per batch")
+        video_id = str(uuid.uuid4())
+        path = os.path.join(upload_folder, f"{video_id}_{secure_filename(os.path.basename(name)) or 'clip'}")
+        content_hash = save_stream(stream, path, limit=budget[0])
+        if content_hash is None:
+            os.remove(path)
+            raise BatchError(f"Batch exceeds {max_bytes // (1024 * 1024)}MB of video")
+        budget[0] -= os.path.getsize(path)
+        clips.append(Clip(len(clips), name, video_id, path, content_hash))
+
+    try:
+        for upload in files:
+            if _is_zip(upload.filename):
+                _add_archive(upload, allowed, add)
+            elif allowed(upload.filename):
+                add(upload.filename, upload.stream)
+            else:
+                raise BatchError(f"File type not supported: {upload.filename}")
+    except Exception:
+        remove_clips(clips)
+        raise
+    if not clips:
+        raise BatchError("No video clips in the upload")
+    return clips
+
+
+def _add_archive(upload, allowed: Callable[[str], bool], add: Callable) -> None:
+    try:
+        archive = zipfile.ZipFile(upload.stream)
+    except zipfile.BadZipFile:
+        raise BatchError(f"Not a valid zip archive: {upload.filename}")
+    with archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith('__MACOSX/') or not allowed(name):
+                continue
+            with archive.open(info) as member:
+                add(name, member)
+
+
+def remove_clips(clips: Iterable[Clip]) -> None:
+    for clip in clips:
+        try:
+            os.remove(clip.path)
+        except FileNotFoundError:
+            pass
+
+
+def merge_summaries(summaries: Iterable[Dict]) -> Dict:
+    """Sum rep counts per exercise and concatenate the issues."""
+    merged: Dict[str, Dict] = {}
+    for summary in summaries:
+        for exercise, block in summary.items():
+            total = merged.setdefault(exercise, {"total_reps": 0, "good_form_reps": 0, "common_issues": []})
+            total["total_reps"] += block["total_reps"]
+            total["good_form_reps"] += block["good_form_reps"]
+            total["common_issues"].extend(block["common_issues"])
+    return merged
+
+
+def run_batch(clips: List[Clip], analyze: Callable[[Clip], Dict], executor: Executor,
+              include_frames: bool = True) -> Iterator[Dict]:
+    """Yield one ``clip`` event per clip in completion order, then the ``summary``.
+
+    ``analyze(clip)`` returns the /analyze payload and owns the clip's file.
+    If the consumer stops early (client disconnect), clips that have not
+    started are cancelled and their files removed.
+    """
+    started = time.perf_counter()
+    futures = {executor.submit(analyze, clip): clip for clip in clips}
+    summaries, failed, frames = [], 0, 0
+    try:
+        for future in as_completed(futures):
+            clip = futures[future]
+            event = {"type": "clip", "index": clip.index, "clip": clip.name}
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                event.update(status="failed", error=str(e))
+            else:
+                summaries.append(result["summary"])
+                frames += result.get("throughput", {}).get("frames", 0)
+                if not include_frames:
+                    result = {k: v for k, v in result.items() if k != "frame_data"}
+                event.update(status="done", result=result)
+            yield event
+    finally:
+        cancelled = [clip for future, clip in futures.items() if future.cancel()]
+        if cancelled:
+            logger.info(f"Batch stopped early; cancelled {len(cancelled)} clips")
+            remove_clips(cancelled)
+
+    seconds = time.perf_counter() - started
+    yield {
+        "type": "summary",
+        "clips": len(clips),
+        "succeeded": len(clips) - failed,
+        "failed": failed,
+        "summary": merge_summaries(summaries),
+        "throughput": {
+            "frames": frames,
+            "seconds": round(seconds, 3),
+            "frames_per_second": round(frames / seconds, 1) if seconds else None,
+            "clips_per_minute": round(60 * len(clips) / seconds, 1) if seconds else None,
+        },
+    }
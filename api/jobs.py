@@ -0,0 +1,115 @@
+"""
+Background job execution for long-running video analysis.
+"""
+
+import threading
+import time
+import uuid
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """Raised when too many jobs are already waiting for a worker."""
+
+
+class Job:
+    def __init__(self, job_id: Optional[str] = None, total_frames: int = 0):
+        self.id = job_id or str(uuid.uuid4())
+        self.status = QUEUED
+        self.frames_processed = 0
+        self.total_frames = total_frames
+        self.result: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def update_progress(self, frames_processed: int):
+        self.frames_processed = frames_processed
+
+    def to_dict(self) -> Dict:
+        progress = {"frames_processed": self.frames_processed}
+        if self.total_frames:
+            progress["total_frames"] = self.total_frames
+            progress["percent"] = round(min(100.0, 100.0 * self.frames_processed / self.total_frames), 1)
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "progress": progress,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == DONE:
+            data["result"] = self.result
+        elif self.status == FAILED:
+            data["error"] = self.error
+        return data
+
+
+class JobManager:
+    """Runs jobs on a bounded pool of worker threads and tracks their status.
+
+    At most ``max_workers`` jobs run at once and at most ``max_pending`` wait
+    for a worker; finished jobs are forgotten once more than ``max_finished``
+    have accumulated.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16, max_finished: int = 1000):
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis-job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status == QUEUED)
+
+    def submit(self, fn: Callable[[Job], Dict], job: Optional[Job] = None) -> Job:
+        """Schedule ``fn(job)``; its return value becomes the job result."""
+        job = job or Job()
+        with self._lock:
+            queued = sum(1 for j in self._jobs.values() if j.status == QUEUED)
+            if queued >= self.max_pending:
+                raise JobQueueFull(f"{queued} jobs already queued")
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, fn, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, fn: Callable[[Job], Dict], job: Job):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            job.result = fn(job)
+            job.status = DONE
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in (DONE, FAILED)]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
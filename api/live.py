@@ -0,0 +1,305 @@
+"""
+Live analysis sessions fed with JPEG frames over HTTP.
+
+Each session owns a PoseEstimator and its own FSM per registered exercise, and runs
+inference on a dedicated thread. Frames are queued as received (undecoded);
+when a frame could no longer be answered within the session's latency target
+it is dropped (oldest first; the newest frame is always analyzed), so a
+client sending faster than inference can keep up sees fewer analyzed frames
+rather than growing lag.
+Rep transitions are published as events as soon as an analyzer reports them.
+Sessions that receive no frames for ``idle_timeout`` seconds are closed.
+"""
+
+import struct
+import threading
+import time
+import uuid
+import logging
+from collections import deque
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional
+import cv2
+import numpy as np
+from analysis.exercises import create_analyzers
+from analysis.features import FeatureSet
+from pose.landmarks import as_array
+
+logger = logging.getLogger(__name__)
+
+# Frames are resized like uploaded videos (see ``iter_video_frames``)
+FRAME_SIZE = (540, 480)
+# Default cap on queued frames regardless of the latency target
+MAX_PENDING_FRAMES = 32
+# Stream framing: 4-byte big-endian length, then that many bytes of JPEG
+_LENGTH = struct.Struct(">I")
+MAX_FRAME_BYTES = 8 * 1024 * 1024
+
+OPEN = "open"
+CLOSED = "closed"
+
+
+class SessionLimitReached(Exception):
+    pass
+
+
+class FrameStreamError(ValueError):
+    pass
+
+
+def read_length_prefixed(stream: BinaryIO) -> Iterator[bytes]:
+    """JPEG payloads of a length-prefixed stream, read as they arrive."""
+    while True:
+        header = stream.read(_LENGTH.size)
+        if not header:
+            return
+        if len(header) < _LENGTH.size:
+            raise FrameStreamError("Truncated frame header")
+        (length,) = _LENGTH.unpack(header)
+        if length > MAX_FRAME_BYTES:
+            raise FrameStreamError(f"Frame of {length} bytes exceeds {MAX_FRAME_BYTES}")
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise FrameStreamError("Truncated frame")
+        yield payload
+
+
+def _percentile(values, q: float) -> Optional[float]:
+    return round(float(np.percentile(values, q)), 1) if len(values) else None
+
+
+class _Frame:
+    __slots__ = ("index", "data", "received_at")
+
+    def __init__(self, index: int, data: bytes, received_at: float):
+        self.index = index
+        self.data = data
+        self.received_at = received_at
+
+
+class LiveSession:
+    """One client's live stream: frame queue, inference thread and rep events."""
+
+    def __init__(self, session_id: str, estimator, target_latency_ms: float = 200.0,
+                 max_pending: int = MAX_PENDING_FRAMES):
+        self.id = session_id
+        self.estimator = estimator
+        self.target_latency = target_latency_ms / 1000.0
+        self.max_pending = max_pending
+        self.analyzers = create_analyzers()
+        self.features = FeatureSet(name for a in self.analyzers.values() for name in a.REQUIRED_FEATURES)
+        self.status = OPEN
+        self.created_at = time.time()
+        self.last_activity = time.monotonic()
+
+        self.frames_received = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self._latencies = deque(maxlen=500)  # ms, receive -> analyzed
+        self._infer_time = 0.0  # EMA of decode + inference seconds
+
+        self._pending = deque()
+        self._events: List[Dict] = []
+        self._finished = False  # worker exited, no more events
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name=f"live-{session_id[:8]}", daemon=True)
+        self._worker.start()
+
+    def submit(self, data: bytes) -> int:
+        """Queue one JPEG frame; returns its frame index."""
+        with self._cond:
+            if self.status != OPEN:
+                raise RuntimeError("Session is closed")
+            index = self.frames_received
+            self.frames_received += 1
+            self.last_activity = time.monotonic()
+            self._pending.append(_Frame(index, data, time.monotonic()))
+            if len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.frames_dropped += 1
+            self._cond.notify_all()
+            return index
+
+    def _next_frame(self) -> Optional[_Frame]:
+        with self._cond:
+            while not self._pending and self.status == OPEN:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            # Drop frames that would be answered after the latency target; the
+            # newest frame is always analyzed
+            now = time.monotonic()
+            while len(self._pending) > 1 and \
+                    now - self._pending[0].received_at + self._infer_time > self.target_latency:
+                self._pending.popleft()
+                self.frames_dropped += 1
+            return self._pending.popleft()
+
+    def _run(self):
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                break
+            start = time.monotonic()
+            try:
+                self._analyze(frame)
+            except Exception:
+                logger.exception(f"Live session {self.id}: failed to analyze frame {frame.index}")
+            done = time.monotonic()
+            self._infer_time = 0.8 * self._infer_time + 0.2 * (done - start) if self._infer_time else done - start
+            with self._cond:
+                self.frames_processed += 1
+                self._latencies.append((done - frame.received_at) * 1000)
+        self._close_estimator()
+
+    def _analyze(self, frame: _Frame):
+        image = cv2.imdecode(np.frombuffer(frame.data, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            self._publish({"type": "error", "frame_index": frame.index, "error": "Could not decode JPEG"})
+            return
+        landmarks = self.estimator.extract_keypoints(cv2.resize(image, FRAME_SIZE))
+        if not landmarks:
+            return
+        features = self.features.extract(as_array(landmarks))
+        for exercise, analyzer in self.analyzers.items():
+            did_rep, angle, issues, count_it = analyzer.update(features)
+            if count_it:
+                self._publish({
+                    "type": "rep",
+                    "exercise": exercise,
+                    "rep_id": analyzer.rep_count,
+                    "frame_index": frame.index,
+                    "angle": angle,
+                    "is_form_ok": not issues,
+                    "issues": issues,
+                    "latency_ms": round((time.monotonic() - frame.received_at) * 1000, 1),
+                })
+
+    def _publish(self, event: Dict):
+        with self._cond:
+            event["seq"] = len(self._events)
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def events(self, after: Optional[int] = None, poll: float = 1.0) -> Iterator[Dict]:
+        """Events with ``seq > after`` (all when None), blocking for new ones until the session closes.
+
+        ``after`` is the last seq a client has seen, so a reconnect resumes
+        with the next event.
+        """
+        cursor = 0 if after is None else max(after + 1, 0)
+        while True:
+            with self._cond:
+                if cursor >= len(self._events) and not self._finished:
+                    self._cond.wait(timeout=poll)
+                new = self._events[cursor:]
+                finished = self._finished
+            cursor += len(new)
+            yield from new
+            if finished and cursor >= len(self._events):
+                return
+
+    def close(self, wait: bool = True):
+        """Stop accepting frames; queued frames are still analyzed."""
+        with self._cond:
+            self.status = CLOSED
+            self._cond.notify_all()
+        if wait and self._worker is not threading.current_thread():
+            self._worker.join()
+
+    def _close_estimator(self):
+        try:
+            self.estimator.close()
+        except Exception:
+            logger.exception(f"Live session {self.id}: failed to release pose estimator")
+        with self._cond:
+            self._finished = True
+            self._cond.notify_all()
+
+    def summary(self) -> Dict:
+        return {f"{exercise}s": {"total_reps": a.rep_count} for exercise, a in self.analyzers.items()}
+
+    def to_dict(self) -> Dict:
+        with self._cond:
+            latencies = list(self._latencies)
+            return {
+                "session_id": self.id,
+                "status": self.status,
+                "target_latency_ms": self.target_latency * 1000,
+                "frames_received": self.frames_received,
+                "frames_processed": self.frames_processed,
+                "frames_dropped": self.frames_dropped,
+                "frames_pending": len(self._pending),
+                "events": len(self._events),
+                "latency_ms": {"p50": _percentile(latencies, 50), "p95": _percentile(latencies, 95)},
+                "summary": self.summary(),
+            }
+
+
+class LiveSessionManager:
+    """Creates live sessions, looks them up and evicts idle ones."""
+
+    def __init__(self, estimator_factory: Callable[[], object], max_sessions: int = 4,
+                 idle_timeout: float = 60.0, default_latency_ms: float = 200.0,
+                 max_pending: int = MAX_PENDING_FRAMES):
+        self._factory = estimator_factory
+        self.max_pending = max_pending
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.default_latency_ms = default_latency_ms
+        self._sessions: Dict[str, LiveSession] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None  # started with the first session
+
+    def create(self, target_latency_ms: Optional[float] = None) -> LiveSession:
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                raise SessionLimitReached(f"At most {self.max_sessions} live sessions")
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="live-reaper", daemon=True)
+                self._reaper.start()
+            session_id = str(uuid.uuid4())
+            # Reserve the slot while the model loads outside the lock
+            self._sessions[session_id] = None
+        try:
+            session = LiveSession(session_id, self._factory(), target_latency_ms or self.default_latency_ms,
+                                  self.max_pending)
+        except Exception:
+            with self._lock:
+                del self._sessions[session_id]
+            raise
+        with self._lock:
+            self._sessions[session_id] = session
+        return session
+
+    def get(self, session_id: str) -> Optional[LiveSession]:
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def close(self, session_id: str) -> Optional[LiveSession]:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+        return session
+
+    @property
+    def active(self) -> int:
+        with self._lock:
+            return sum(1 for s in self._sessions.values() if s is not None)
+
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            idle = [sid for sid, s in self._sessions.items()
+                    if s is not None and now - s.last_activity > self.idle_timeout]
+        for session_id in idle:
+            logger.info(f"Evicting idle live session {session_id}")
+            self.close(session_id)
+
+    def _reap(self):
+        while True:
+            time.sleep(max(0.05, min(self.idle_timeout / 4, 5.0)))
+            try:
+                self.evict_idle()
+            except Exception:
+                logger.exception("Live session eviction failed")
@@ -0,0 +1,196 @@
+"""
+End-to-end processing of one uploaded video, shared by the synchronous
+/analyze path and the background job workers.
+"""
+
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.memory import PeakRSSMonitor
+from analysis.video_exercise_analyzer import (iter_video_frames, probe_frame_count, probe_fps, probe_size,
+                                              fit_size, read_frames_at)
+from analysis.sampling import FrameSampler
+from analysis.keyframes import select_keyframes
+from analysis.parallel import estimate_track_parallel
+from analysis.prefetch import FramePrefetcher
+from pose.pose_estimator import PoseEstimator
+from pose.estimator_pool import EstimatorPool
+from api.report_tasks import ReportTasks
+from api.responses import save_frames
+from analysis.track_store import save_track
+from report.report_generator import save_json_and_csv, generate_pdf_report
+from report.video_renderer import render_annotated_video
+from metrics.stages import ANALYSIS_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class VideoProcessingError(Exception):
+    """The uploaded video could not be decoded into frames."""
+
+
+@contextmanager
+def _pose_estimator(pool: Optional[EstimatorPool], estimator_kwargs: Dict) -> Iterator[PoseEstimator]:
+    if pool is None:
+        yield PoseEstimator(**estimator_kwargs)
+    else:
+        with pool.checkout() as estimator:
+            yield estimator
+
+
+@contextmanager
+def _video_frames(video_path: str, resize, decode_thread: bool, decode_queue_size: int = 8) -> Iterator:
+    if decode_thread:
+        with FramePrefetcher(video_path, resize, maxsize=decode_queue_size) as frames:
+            yield frames
+    else:
+        yield iter_video_frames(video_path, resize)
+
+
+def run_analysis(video_path: str, video_id: str, report_folder: str,
+                 on_frame: Optional[Callable[[int], None]] = None,
+                 cleanup: bool = True,
+                 estimator_pool: Optional[EstimatorPool] = None,
+                 estimator_kwargs: Optional[Dict] = None,
+                 pose_workers: int = 1, parallel_min_frames: int = 600,
+                 target_fps: Optional[float] = None, motion_threshold: float = 0.0,
+                 max_side: Optional[int] = None, decode_thread: bool = True,
+                 decode_queue_size: int = 8,
+                 report_tasks: Optional[ReportTasks] = None, annotated_video: bool = False) -> Dict:
+    """Decode, analyze and write reports for ``video_path``.
+
+    Pose estimation borrows an instance from ``estimator_pool`` when given;
+    otherwise estimators are built from ``estimator_kwargs``.
+    Videos of at least ``parallel_min_frames`` frames are split into segments
+    processed by ``pose_workers`` processes when more than one is configured.
+    Otherwise ``target_fps``/``motion_threshold`` enable adaptive sampling
+    (see ``FrameSampler``) and the response reports the inference savings.
+    ``max_side`` analyzes frames scaled to that longer side with the aspect
+    ratio kept; without it frames are resized to 540x480. ``decode_thread``
+    decodes on a background thread (see ``FramePrefetcher``) while pose
+    inference runs, at most ``decode_queue_size`` frames ahead.
+    ``annotated_video`` also renders ``<video_id>_annotated.mp4`` from the
+    keypoint track (see ``report.video_renderer``).
+    With ``report_tasks`` the PDF and video are rendered in the background
+    after this returns, as tasks ``<video_id>`` and ``<video_id>.mp4``; the
+    upload is then removed once both are done.
+    Returns the /analyze response payload. Raises ``VideoProcessingError``
+    when no frames could be decoded.
+    """
+    estimator_kwargs = dict(estimator_kwargs or {'alpha': 0.5})
+    resize = fit_size(probe_size(video_path), max_side) if max_side else (540, 480)
+
+    def remove_upload():
+        if cleanup:
+            # Clean up uploaded file (optional)
+            try:
+                os.remove(video_path)
+            except Exception as e:
+                logger.warning(f"Failed to remove uploaded file: {e}")
+
+    try:
+        with PeakRSSMonitor() as memory:
+            # Decode, pose estimation and analysis consume the frames in one pass
+            analyzer = ExerciseAnalyzer()
+            sampler = None
+            started = time.perf_counter()
+            with ANALYSIS_SECONDS.time():
+                frame_count = probe_frame_count(video_path) if pose_workers > 1 else 0
+                if frame_count >= parallel_min_frames and pose_workers > 1:
+                    track = estimate_track_parallel(video_path, frame_count, pose_workers, on_frame=on_frame,
+                                                    resize=resize, alpha=estimator_kwargs.get('alpha', 0.5),
+                                                    estimator_kwargs=estimator_kwargs)
+                    results = analyzer.analyze_track(track)
+                else:
+                    if target_fps or motion_threshold > 0:
+                        sampler = FrameSampler(probe_fps(video_path), target_fps=target_fps,
+                                               motion_threshold=motion_threshold,
+                                               watched=analyzer.watched_angles())
+                    with _pose_estimator(estimator_pool, estimator_kwargs) as pose_estimator, \
+                            _video_frames(video_path, resize, decode_thread, decode_queue_size) as frames:
+                        results = analyzer.analyze_video(frames, pose_estimator, on_frame=on_frame, sampler=sampler)
+
+            analysis_seconds = time.perf_counter() - started
+
+            if analyzer.frame_count == 0:
+                raise VideoProcessingError("Failed to process video or no frames extracted")
+
+            # Save data
+            save_json_and_csv(results, video_id, report_folder)
+            save_frames(report_folder, video_id, results["frame_data"])
+            angle_series = analyzer.angle_series()
+            save_track(report_folder, video_id, analyzer.track, angle_series)
+    except Exception:
+        remove_upload()
+        raise
+
+    fsm_angles = {exercise: (a.ANGLE_NAME, angle_series[f"{exercise}_{a.ANGLE_NAME}"])
+                  for exercise, a in analyzer.analyzers.items()}
+
+    def render_pdf():
+        # Decode just the frames the report shows, by seeking the upload
+        keyframes = select_keyframes(results["frame_data"],
+                                     {exercise: values for exercise, (_, values) in fsm_angles.items()})
+        frames = read_frames_at(video_path, [k.frame_index for k in keyframes], resize)
+        generate_pdf_report(video_id, results, frames, report_folder, analyzer.track, keyframes=keyframes)
+
+    def render_video():
+        render_annotated_video(video_path, os.path.join(report_folder, f"{video_id}_annotated.mp4"),
+                               analyzer.track, fsm_angles, results["frame_data"], resize, fps=probe_fps(video_path))
+
+    renders = [(video_id, render_pdf)]
+    if annotated_video:
+        renders.append((f"{video_id}.mp4", render_video))
+    if report_tasks is None:
+        try:
+            for _, render in renders:
+                render()
+        finally:
+            remove_upload()
+    else:
+        # The renders read the upload; the last one to finish removes it
+        remaining = [len(renders)]
+        lock = threading.Lock()
+
+        def then_remove_upload(render):
+            def run():
+                try:
+                    render()
+                finally:
+                    with lock:
+                        remaining[0] -= 1
+                        last = remaining[0] == 0
+                    if last:
+                        remove_upload()
+            return run
+
+        for name, render in renders:
+            report_tasks.submit(name, then_remove_upload(render))
+
+    logger.info(f"Analysis complete for video {video_id} "
+                f"({analyzer.frame_count} frames, peak RSS {memory.peak_mb:.1f}MB)")
+
+    response = {
+        "video_id": video_id,
+        "summary": results["summary"],
+        "frame_data": results["frame_data"],
+        "pdf_url": f"/report/{video_id}",
+        "frames_url": f"/analysis/{video_id}/frames",
+        "track_url": f"/analysis/{video_id}/track",
+        "resources": memory.as_dict(),
+        "throughput": {
+            "frames": analyzer.frame_count,
+            "seconds": round(analysis_seconds, 3),
+            "frames_per_second": round(analyzer.frame_count / analysis_seconds, 1) if analysis_seconds else None,
+            "resolution": list(resize),
+        }
+    }
+    if annotated_video:
+        response["video_url"] = f"/video/{video_id}"
+    if sampler is not None:
+        response["inference"] = sampler.stats()
+    return response
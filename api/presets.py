@@ -0,0 +1,81 @@
+"""
+Named speed/accuracy presets for video analysis.
+
+A preset picks the pose model, the input resolution (longer side, aspect
+ratio kept), the adaptive sampling rate and the confidence thresholds.
+``ANALYSIS_PRESET`` selects the server default and requests may choose
+another one. The ``SMOOTHING_ALPHA``, ``CONFIDENCE_THRESHOLD``,
+``TARGET_ANALYSIS_FPS`` and ``MOTION_THRESHOLD`` environment variables, when
+set, override the corresponding value of every preset.
+"""
+
+import os
+from typing import Dict, Optional
+
+PRESETS: Dict[str, Dict] = {
+    # Lite model on small frames, sparse sampling
+    "fast": {
+        "model_complexity": 0,
+        "max_side": 320,
+        "target_fps": 10.0,
+        "motion_threshold": 2.0,
+        "confidence": 0.5,
+        "smoothing_alpha": 0.5,
+    },
+    # Full model at the classic analysis size, every frame analyzed
+    "balanced": {
+        "model_complexity": 1,
+        "max_side": 540,
+        "target_fps": 0.0,
+        "motion_threshold": 0.0,
+        "confidence": 0.5,
+        "smoothing_alpha": 0.5,
+    },
+    # Heavy model, larger frames, every frame analyzed
+    "accurate": {
+        "model_complexity": 2,
+        "max_side": 960,
+        "target_fps": 0.0,
+        "motion_threshold": 0.0,
+        "confidence": 0.6,
+        "smoothing_alpha": 0.5,
+    },
+}
+
+DEFAULT_PRESET = "balanced"
+
+# Environment variables overriding a preset field
+_OVERRIDES = {
+    "smoothing_alpha": "SMOOTHING_ALPHA",
+    "confidence": "CONFIDENCE_THRESHOLD",
+    "target_fps": "TARGET_ANALYSIS_FPS",
+    "motion_threshold": "MOTION_THRESHOLD",
+}
+
+
+class UnknownPreset(ValueError):
+    pass
+
+
+def get_preset(name: Optional[str] = None, environ=None) -> Dict:
+    """Settings of preset ``name`` (the server default when None) with env overrides applied."""
+    environ = os.environ if environ is None else environ
+    name = (name or environ.get("ANALYSIS_PRESET") or DEFAULT_PRESET).lower()
+    if name not in PRESETS:
+        raise UnknownPreset(f"Unknown preset '{name}'. Available: {', '.join(PRESETS)}")
+    preset = dict(PRESETS[name], name=name)
+    for field, variable in _OVERRIDES.items():
+        value = environ.get(variable)
+        if value not in (None, ""):
+            preset[field] = float(value)
+    return preset
+
+
+def estimator_options(preset: Dict) -> Dict:
+    """``PoseEstimator`` keyword arguments for ``preset``."""
+    return {
+        "alpha": preset["smoothing_alpha"],
+        "model_complexity": preset["model_complexity"],
+        "min_detection_confidence": preset["confidence"],
+        "min_tracking_confidence": preset["confidence"],
+    }
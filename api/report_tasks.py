@@ -0,0 +1,68 @@
+"""
+Background rendering of report files after the analysis response is sent.
+"""
+
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ReportTasks:
+    """Runs report renders off the request path and lets readers wait for them.
+
+    Tasks are keyed by name (e.g. the video id, or ``<video_id>.mp4``) so a
+    download request can block until that specific file exists.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-render")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, fn: Callable[[], object]) -> Future:
+        with self._lock:
+            future = self._executor.submit(self._run, name, fn)
+            self._pending[name] = future
+        future.add_done_callback(lambda f: self._forget(name, f))
+        return future
+
+    def is_pending(self, name: str) -> bool:
+        with self._lock:
+            return name in self._pending
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def wait(self, name: str, timeout: Optional[float] = None) -> bool:
+        """Block until the task ``name`` (if any) has finished. False on timeout."""
+        with self._lock:
+            future = self._pending.get(name)
+        if future is None:
+            return True
+        try:
+            future.result(timeout=timeout)
+        except FutureTimeout:
+            return False
+        except Exception:
+            pass  # already logged by _run
+        return True
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, name: str, fn: Callable[[], object]):
+        try:
+            return fn()
+        except Exception:
+            logger.exception(f"Background render of {name} failed")
+            raise
+
+    def _forget(self, name: str, future: Future):
+        with self._lock:
+            if self._pending.get(name) is future:
+                del self._pending[name]
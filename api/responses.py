@@ -0,0 +1,205 @@
+"""
+Encodings of analysis results for the HTTP API.
+
+``frame_data`` can be sent as the default list of row dicts, as a columnar
+document (parallel arrays, one per field) or streamed as NDJSON, one line per
+row after a header line with everything else. Large JSON bodies are
+compressed with gzip, or brotli when the package is installed. Stored
+keypoint tracks can be exported as CSV.
+"""
+
+import gzip
+import json
+import os
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from flask import Response, jsonify, request
+from pose.keypoint_track import KeypointTrack
+from pose.landmarks import COLUMNS as LANDMARK_COLUMNS
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+ROWS = "rows"
+COLUMNS = "columns"
+NDJSON = "ndjson"
+FORMATS = (ROWS, COLUMNS, NDJSON)
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+COMPRESSIBLE_MIMETYPES = {"application/json", NDJSON_MIMETYPE, "text/csv"}
+MIN_COMPRESS_SIZE = 1024
+NDJSON_CHUNK_ROWS = 256
+CSV_CHUNK_FRAMES = 256
+
+_ROW_FIELDS = ("frame_index", "exercise", "rep_id", "is_form_ok", "issues")
+# Frame index of the stored frames index's end entry
+_END = np.iinfo(np.int64).max
+
+
+def frame_columns(frame_data: List[Dict]) -> Dict:
+    """Rows -> parallel arrays. ``angles`` becomes one array per angle name, None where absent."""
+    columns = {field: [row[field] for row in frame_data] for field in _ROW_FIELDS}
+    names = sorted({name for row in frame_data for name in row["angles"]})
+    columns["angles"] = {name: [row["angles"].get(name) for row in frame_data] for name in names}
+    return columns
+
+
+def frame_rows(columns: Dict) -> List[Dict]:
+    """Inverse of ``frame_columns``."""
+    return [{
+        "frame_index": columns["frame_index"][i],
+        "exercise": columns["exercise"][i],
+        "rep_id": columns["rep_id"][i],
+        "is_form_ok": columns["is_form_ok"][i],
+        "angles": {name: values[i] for name, values in columns["angles"].items() if values[i] is not None},
+        "issues": columns["issues"][i],
+    } for i in range(len(columns["frame_index"]))]
+
+
+def requested_format() -> str:
+    """``?format=rows|columns|ndjson``, else the Accept header (NDJSON if preferred)."""
+    fmt = (request.args.get("format") or "").lower()
+    if fmt in FORMATS:
+        return fmt
+    best = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    return NDJSON if best == NDJSON_MIMETYPE else ROWS
+
+
+def ndjson_lines(payload: Dict, frame_data: Iterable[Dict]) -> Iterator[str]:
+    """Header line (``payload`` without frame_data), then one line per row, in chunks."""
+    yield json.dumps(dict(payload, type="header")) + "\n"
+    chunk = []
+    for row in frame_data:
+        chunk.append(json.dumps(row))
+        if len(chunk) == NDJSON_CHUNK_ROWS:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def analysis_response(payload: Dict, fmt: str = ROWS, include_frames: bool = True):
+    """Flask response for an analysis result in the requested layout."""
+    frame_data = payload.get("frame_data", [])
+    rest = {key: value for key, value in payload.items() if key != "frame_data"}
+    if not include_frames:
+        return jsonify(rest)
+    if fmt == NDJSON:
+        return Response(ndjson_lines(rest, frame_data), mimetype=NDJSON_MIMETYPE)
+    if fmt == COLUMNS:
+        return jsonify(dict(rest, layout=COLUMNS, frame_data=frame_columns(frame_data)))
+    return jsonify(payload)
+
+
+def keypoints_csv(keypoints: np.ndarray, first_frame: int = 0) -> Iterator[str]:
+    """(T, 33, 4) keypoints as CSV chunks, one row per landmark of every frame with a pose.
+
+    Columns are those of ``KeypointTrack.to_columns``; frames are numbered
+    from ``first_frame``. ``keypoints`` may be a memmap, which is read one
+    chunk of frames at a time.
+    """
+    yield ",".join(("frame_index", "landmark") + LANDMARK_COLUMNS) + "\n"
+    for offset in range(0, len(keypoints), CSV_CHUNK_FRAMES):
+        chunk = np.asarray(keypoints[offset:offset + CSV_CHUNK_FRAMES])
+        columns = KeypointTrack.from_array(chunk, copy=False).to_columns()
+        frames = columns["frame_index"] + first_frame + offset
+        values = np.column_stack([columns[name] for name in LANDMARK_COLUMNS]).astype(str).tolist()
+        landmarks = columns["landmark"].tolist()
+        yield "".join(f"{frame},{landmark},{','.join(row)}\n"
+                      for frame, landmark, row in zip(frames.tolist(), landmarks, values))
+
+
+def _encoding(accept_encodings) -> Optional[str]:
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return accept_encodings.best_match(offered)
+
+
+def _compress_stream(chunks: Iterable, encoding: str) -> Iterator[bytes]:
+    compressor = brotli.Compressor() if encoding == "br" else zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = chunk.encode() if isinstance(chunk, str) else chunk
+        if encoding == "br":
+            out = compressor.process(data) + compressor.flush()
+        else:
+            out = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if out:
+            yield out
+    yield compressor.finish() if encoding == "br" else compressor.flush()
+
+
+def compress_response(response: Response) -> Response:
+    """``after_request`` hook: gzip/brotli JSON and NDJSON bodies the client accepts."""
+    if (response.direct_passthrough or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+    encoding = _encoding(request.accept_encodings)
+    response.vary.add("Accept-Encoding")
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < MIN_COMPRESS_SIZE:
+            return response
+        body = brotli.compress(body) if encoding == "br" else gzip.compress(body, compresslevel=6, mtime=0)
+        response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def frames_path(report_folder: str, video_id: str) -> str:
+    return os.path.join(report_folder, f"{video_id}_frames.ndjson")
+
+
+def frames_index_path(report_folder: str, video_id: str) -> str:
+    return os.path.join(report_folder, f"{video_id}_frames_index.npy")
+
+
+def save_frames(report_folder: str, video_id: str, frame_data: List[Dict]) -> str:
+    """Store ``frame_data`` as NDJSON in frame order, plus an index of each row's frame and byte offset.
+
+    The index has a final entry past the last row (frame ``_END``, offset of
+    the end of the file), so range reads need no special case at the end.
+    """
+    rows = sorted(frame_data, key=lambda row: row["frame_index"])
+    index = np.empty(len(rows) + 1, dtype=[("frame_index", np.int64), ("offset", np.int64)])
+    path = frames_path(report_folder, video_id)
+    offset = 0
+    with open(path, 'wb') as f:
+        for i, row in enumerate(rows):
+            line = (json.dumps(row) + "\n").encode()
+            index[i] = (row["frame_index"], offset)
+            f.write(line)
+            offset += len(line)
+    index[-1] = (_END, offset)
+    np.save(frames_index_path(report_folder, video_id), index)
+    return path
+
+
+def load_frames(report_folder: str, video_id: str, start: Optional[int] = None,
+                end: Optional[int] = None) -> Optional[List[Dict]]:
+    """Rows with ``start <= frame_index < end``, None if the analysis is missing.
+
+    The index is memory-mapped and only the byte range of the matching rows
+    is read and parsed.
+    """
+    try:
+        index = np.load(frames_index_path(report_folder, video_id), mmap_mode='r')
+        frame_index, offsets = index["frame_index"], index["offset"]
+        first = 0 if start is None else int(np.searchsorted(frame_index, min(start, _END)))
+        last = len(index) - 1 if end is None else int(np.searchsorted(frame_index, min(end, _END)))
+        if last <= first:
+            return []
+        with open(frames_path(report_folder, video_id), 'rb') as f:
+            f.seek(int(offsets[first]))
+            data = f.read(int(offsets[last] - offsets[first]))
+    except (OSError, ValueError):
+        return None
+    return [json.loads(line) for line in data.splitlines()]
@@ -0,0 +1,190 @@
+"""
+Content-addressed cache of analysis results.
+
+Uploads are hashed while they are written to disk and results are keyed by
+(content hash, analysis configuration), so re-uploading the same clip returns
+the stored response and reports without redoing any work. Entries live next
+to the reports they refer to and are evicted by age and, once the total size
+exceeds the budget, least-recently-used first.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def save_upload(file_storage, path: str) -> str:
+    """Write an uploaded file to ``path`` and return its SHA-256 hex digest."""
+    return save_stream(file_storage.stream, path)
+
+
+def save_stream(stream, path: str, limit: Optional[int] = None) -> Optional[str]:
+    """Copy ``stream`` to ``path`` and return its SHA-256 hex digest.
+
+    Stops and returns None once more than ``limit`` bytes have been written.
+    """
+    digest = hashlib.sha256()
+    written = 0
+    with open(path, 'wb') as out:
+        while True:
+            chunk = stream.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if limit is not None and written > limit:
+                return None
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash: str, config: Dict) -> str:
+    """Key for a video's content analyzed with a given configuration."""
+    encoded = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(f"{content_hash}:{encoded}".encode()).hexdigest()
+
+
+class ResultCache:
+    """Result cache with an in-memory index of its entries.
+
+    The index maps each key to its video id, creation time, last use and
+    size on disk (entry plus reports). It is rebuilt from the entry files at
+    startup; afterwards eviction only consults the index. PDF reports and
+    videos may still be rendering when an entry is stored, so its size is
+    measured again when the next entry is stored and whenever it is used.
+    """
+
+    def __init__(self, report_folder: str, max_bytes: int = 1024 * 1024 * 1024,
+                 max_age_seconds: float = 7 * 24 * 3600):
+        self.report_folder = report_folder
+        self.index_folder = os.path.join(report_folder, 'cache')
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        self._unsized: Set[str] = set()
+        os.makedirs(self.index_folder, exist_ok=True)
+        self._load_index()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.index_folder, f"{key}.json")
+
+    def _report_files(self, video_id: str):
+        return glob.glob(os.path.join(self.report_folder, f"{glob.escape(video_id)}*"))
+
+    def _load_index(self):
+        for path in glob.glob(os.path.join(self.index_folder, '*.json')):
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+                last_used = os.path.getmtime(path)
+            except (OSError, ValueError):
+                continue
+            self._index[entry["key"]] = {
+                "video_id": entry["video_id"],
+                "created_at": entry["created_at"],
+                "last_used": last_used,
+                "size": self._size(entry["key"], entry["video_id"]),
+            }
+
+    def _size(self, key: str, video_id: str) -> int:
+        files = [self._entry_path(key)] + self._report_files(video_id)
+        return sum(os.path.getsize(p) for p in files if os.path.exists(p))
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Stored response for ``key``, or None on a miss."""
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                self.misses += 1
+                return None
+            if time.time() - meta["created_at"] > self.max_age_seconds:
+                self._remove(key)
+                self.misses += 1
+                return None
+            path = self._entry_path(key)
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+                os.utime(path)  # keeps the LRU order across restarts
+            except (OSError, ValueError):
+                self._index.pop(key, None)
+                self.misses += 1
+                return None
+            meta["last_used"] = time.time()
+            meta["size"] = self._size(key, meta["video_id"])
+            self.hits += 1
+            return entry["response"]
+
+    def put(self, key: str, video_id: str, response: Dict):
+        now = time.time()
+        entry = {"key": key, "video_id": video_id, "created_at": now, "response": response}
+        path = self._entry_path(key)
+        with self._lock:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+            # The previous entries' reports have usually finished by now
+            for stale in self._unsized & self._index.keys():
+                self._index[stale]["size"] = self._size(stale, self._index[stale]["video_id"])
+            self._index[key] = {"video_id": video_id, "created_at": now, "last_used": now,
+                                "size": self._size(key, video_id)}
+            self._unsized = {key}
+            self._evict()
+
+    def evict(self):
+        """Drop expired entries, then least-recently-used ones until under the size budget."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        now = time.time()
+        for key in list(self._index):
+            if now - self._index[key]["created_at"] > self.max_age_seconds:
+                self._remove(key)
+        total = sum(meta["size"] for meta in self._index.values())
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]["size"]
+            self._remove(key)
+
+    def _remove(self, key: str):
+        meta = self._index.pop(key)
+        self._unsized.discard(key)
+        for report_file in self._report_files(meta["video_id"]):
+            try:
+                os.remove(report_file)
+            except OSError as e:
+                logger.warning(f"Failed to evict {report_file}: {e}")
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+        self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._index),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+            }
@@ -0,0 +1,77 @@
+"""
+Micro-benchmarks of the angle kernels in analysis/angles.py.
+
+    python -m benchmarks.bench_angles --frames 1000 --triplets 8
+
+Scalar: one joint angle per call, through the NumPy reference, the
+``calculate_angle`` fast path (lists and float64 arrays) and the float kernel
+``joint_angle_2d``. Batched: angles of N frames x M joint triplets, one
+``calculate_angle`` call each vs a single ``joint_angles`` call. Every
+variant is checked to give the same bits as the reference.
+"""
+
+import argparse
+import time
+import numpy as np
+from analysis import angles
+
+
+def _best_us(fn, calls: int, repeat: int) -> float:
+    """Best per-call time in microseconds of ``fn`` running ``calls`` calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return 1e6 * best / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--calls', type=int, default=20000, help='scalar calls per timing')
+    parser.add_argument('--frames', type=int, default=1000)
+    parser.add_argument('--triplets', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"fast path: {'on (' + angles._dot2.__name__ + ')' if angles._dot2 else 'off'}")
+
+    a, b, c = rng.uniform(0, 1, (3, 2))
+    la, lb, lc = a.tolist(), b.tolist(), c.tolist()
+    reference = angles._numpy_calculate_angle(a, b, c)
+    scalar = {
+        'numpy reference': lambda: angles._numpy_calculate_angle(la, lb, lc),
+        'calculate_angle (lists)': lambda: angles.calculate_angle(la, lb, lc),
+        'calculate_angle (arrays)': lambda: angles.calculate_angle(a, b, c),
+        'joint_angle_2d': lambda: angles.joint_angle_2d(la[0], la[1], lb[0], lb[1], lc[0], lc[1]),
+    }
+    print(f"\nscalar, {args.calls} calls")
+    for name, call in scalar.items():
+        assert call() == reference, name
+
+        def run(call=call):
+            for _ in range(args.calls):
+                call()
+        print(f"  {name:<26} {_best_us(run, args.calls, args.repeat):8.2f} us/angle")
+
+    keypoints = rng.uniform(0, 1, (args.frames, 33, 4))
+    triplets = rng.choice(33, (args.triplets, 3), replace=True)
+    looped = np.array([[angles.calculate_angle(kp[i, :2], kp[j, :2], kp[k, :2]) for i, j, k in triplets]
+                       for kp in keypoints])
+    assert np.array_equal(angles.joint_angles(keypoints, triplets), looped, equal_nan=True)
+
+    def run_looped():
+        for kp in keypoints:
+            for i, j, k in triplets:
+                angles.calculate_angle(kp[i, :2], kp[j, :2], kp[k, :2])
+
+    count = args.frames * args.triplets
+    print(f"\nbatched, {args.frames} frames x {args.triplets} triplets")
+    print(f"  {'calculate_angle loop':<26} {_best_us(run_looped, count, args.repeat):8.2f} us/angle")
+    print(f"  {'joint_angles':<26} "
+          f"{_best_us(lambda: angles.joint_angles(keypoints, triplets), count, args.repeat):8.2f} us/angle")
+
+
+if __name__ == '__main__':
+    main()
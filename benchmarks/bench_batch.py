@@ -0,0 +1,64 @@
+"""
+Throughput of POST /analyze/batch vs one /analyze call per clip.
+
+    python -m benchmarks.bench_batch --clips 8 --seconds 3 --workers 4
+
+Runs the Flask app in-process (test client) with the result cache disabled,
+so both modes analyze every clip. ``--workers`` sets the estimator pool and
+batch worker count; concurrency only pays off with that many cores.
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clips', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=3.0, help='length of each synthetic clip')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Configure the app before importing it
+        os.environ.update(RESULT_CACHE='0', ESTIMATOR_WARMUP='0', ESTIMATOR_POOL_SIZE=str(args.workers),
+                          BATCH_WORKERS=str(args.workers), UPLOAD_FOLDER=os.path.join(tmp, 'uploads'),
+                          REPORTS_FOLDER=os.path.join(tmp, 'reports'))
+        from api.app import app, estimator_pools, DEFAULT_PRESET, report_tasks
+        from benchmarks.synthetic import make_squat_video
+
+        clips = []
+        for i in range(args.clips):
+            path = make_squat_video(os.path.join(tmp, f'clip{i}.mp4'), seconds=args.seconds, period=1.5 + 0.1 * i)
+            with open(path, 'rb') as f:
+                clips.append((f'clip{i}.mp4', f.read()))
+        estimator_pools[DEFAULT_PRESET].warm_up()
+        client = app.test_client()
+
+        start = time.perf_counter()
+        for name, data in clips:
+            response = client.post('/analyze?frames=none', content_type='multipart/form-data',
+                                   data={'video': (io.BytesIO(data), name)})
+            assert response.status_code == 200, response.get_data(as_text=True)
+        sequential = time.perf_counter() - start
+
+        start = time.perf_counter()
+        response = client.post('/analyze/batch?frames=none', content_type='multipart/form-data',
+                               data={'videos': [(io.BytesIO(data), name) for name, data in clips]})
+        body = response.get_data(as_text=True)
+        batch = time.perf_counter() - start
+        assert body.count('"status": "done"') == args.clips, body
+        report_tasks.shutdown()
+
+    print(f"{args.clips} clips x {args.seconds:g}s, {args.workers} workers, {os.cpu_count()} CPUs")
+    print(f"{'mode':>12} {'wall s':>8} {'clips/min':>9}")
+    print(f"{'sequential':>12} {sequential:8.2f} {60 * args.clips / sequential:9.1f}")
+    print(f"{'batch':>12} {batch:8.2f} {60 * args.clips / batch:9.1f}")
+    print(f"speedup {sequential / batch:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
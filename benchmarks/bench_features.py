@@ -0,0 +1,70 @@
+"""
+Per-frame cost of feature extraction as exercises are added.
+
+    python -m benchmarks.bench_features --frames 3000 --exercises 8
+
+Runs 1..``--exercises`` analyzers (alternating squat and pushup, so only four
+distinct features) and compares one shared ``FeatureSet`` extraction per frame
+(what ``ExerciseAnalyzer`` does) with every analyzer extracting its own
+features (as ``analyzer.analyze`` does). Shared extraction grows with the
+number of distinct features, per-analyzer extraction with the number of
+exercises; what remains per exercise is its FSM update.
+"""
+
+import argparse
+import time
+import numpy as np
+from analysis.features import FeatureSet
+from analysis.pushup_analyzer import PushupAnalyzer
+from analysis.squat_analyzer import SquatAnalyzer
+from pose.landmarks import empty_landmarks
+
+
+def _frames(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    frames = np.repeat(empty_landmarks()[None], n, axis=0)
+    frames[:, :, :2] = rng.uniform(0.1, 0.9, (n, frames.shape[1], 2))
+    frames[:, :, 2:] = 0.0
+    return frames
+
+
+def _per_frame_us(run, frames: np.ndarray, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(frames)
+        best = min(best, time.perf_counter() - start)
+    return 1e6 * best / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--exercises', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    frames = _frames(args.frames)
+    print(f"{'exercises':>9}  {'shared us/frame':>15}  {'per-analyzer us/frame':>21}")
+    for count in range(1, args.exercises + 1):
+        analyzers = [(SquatAnalyzer, PushupAnalyzer)[i % 2]() for i in range(count)]
+        shared = FeatureSet(name for a in analyzers for name in a.REQUIRED_FEATURES)
+        own = [(a, FeatureSet(a.REQUIRED_FEATURES)) for a in analyzers]
+
+        def run_shared(frames):
+            for keypoints in frames:
+                features = shared.extract(keypoints)
+                for analyzer in analyzers:
+                    analyzer.update(features)
+
+        def run_separate(frames):
+            for keypoints in frames:
+                for analyzer, features in own:
+                    analyzer.update(features.extract(keypoints))
+
+        print(f"{count:>9}  {_per_frame_us(run_shared, frames, args.repeat):>15.1f}  "
+              f"{_per_frame_us(run_separate, frames, args.repeat):>21.1f}")
+
+
+if __name__ == '__main__':
+    main()
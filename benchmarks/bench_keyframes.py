@@ -0,0 +1,105 @@
+"""
+Memory and latency of getting the report's frames.
+
+    python -m benchmarks.bench_keyframes --seconds 120 --rep-period 3
+
+Compares three ways of feeding ``generate_pdf_report`` for a synthetic video
+with one squat logged every ``--rep-period`` seconds:
+
+- held: every logged rep's frame kept in memory during analysis (the former
+  streaming path)
+- grab: every logged rep's frame decoded afterwards by grabbing through the
+  video (the former batch path)
+- seek: only the selected keyframes decoded by seeking (``select_keyframes``
+  + ``read_frames_at``)
+
+Memory is the peak traced allocation (frames plus report rendering).
+Latency is frame retrieval plus PDF rendering; for "held" the frames come
+out of the analysis pass, so only the rendering counts.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from analysis.keyframes import select_keyframes
+from analysis.video_exercise_analyzer import iter_video_frames, read_frames_at
+from benchmarks.synthetic import make_squat_video
+from pose.keypoint_track import KeypointTrack
+from report.report_generator import generate_pdf_report
+
+
+def synthetic_analysis(n_frames: int, rep_frames: int):
+    rng = np.random.default_rng(0)
+    t = np.arange(n_frames)
+    knee = 130 + 40 * np.cos(2 * np.pi * t / rep_frames)
+    frame_data = [{
+        "frame_index": int(idx),
+        "exercise": "squat",
+        "rep_id": rep,
+        "is_form_ok": rep % 5 != 0,
+        "angles": {"knee": float(knee[idx])},
+        "issues": [] if rep % 5 else ["INSUFFICIENT_DEPTH"],
+    } for rep, idx in enumerate(range(rep_frames - 1, n_frames, rep_frames), start=1)]
+    summary = {"squats": {"total_reps": len(frame_data), "good_form_reps": sum(r["is_form_ok"] for r in frame_data),
+                          "common_issues": ["INSUFFICIENT_DEPTH"]}}
+    track = KeypointTrack.from_array(rng.uniform(0.1, 0.9, (n_frames, 33, 4)).astype(np.float32))
+    return {"summary": summary, "frame_data": frame_data}, {"squat": knee}, track
+
+
+def _measure(fn):
+    """(seconds, peak traced MB); tracing slows Python down, so timing runs untraced."""
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=120.0)
+    parser.add_argument('--rep-period', type=float, default=3.0, help='seconds per logged rep')
+    parser.add_argument('--fps', type=int, default=30)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = make_squat_video(os.path.join(tmp, 'bench.mp4'), seconds=args.seconds, fps=args.fps)
+        n_frames = int(args.seconds * args.fps)
+        results, angles, track = synthetic_analysis(n_frames, int(args.rep_period * args.fps))
+        rep_indices = [row["frame_index"] for row in results["frame_data"]]
+        print(f"{n_frames} frames, {len(rep_indices)} logged reps")
+
+        def held():
+            # What the streaming analysis used to keep while decoding
+            wanted = set(rep_indices)
+            frames = {idx: frame for idx, frame in enumerate(iter_video_frames(video)) if idx in wanted}
+            start = time.perf_counter()
+            generate_pdf_report("held", results, frames, tmp, track)
+            held.report_seconds = time.perf_counter() - start
+
+        def grab():
+            frames = read_frames_at(video, rep_indices, seek_gap=None)
+            generate_pdf_report("grab", results, frames, tmp, track)
+
+        def seek():
+            keyframes = select_keyframes(results["frame_data"], angles)
+            frames = read_frames_at(video, [k.frame_index for k in keyframes])
+            generate_pdf_report("seek", results, frames, tmp, track, keyframes=keyframes)
+
+        print(f"{'mode':>6} {'seconds':>8} {'peak MB':>8}")
+        _, peak = _measure(held)
+        held()  # untraced, for report_seconds
+        print(f"{'held':>6} {held.report_seconds:8.3f} {peak:8.1f}")
+        for name, fn in (('grab', grab), ('seek', seek)):
+            seconds, peak = _measure(fn)
+            print(f"{name:>6} {seconds:8.3f} {peak:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Single-video wall time of segment-parallel pose estimation vs worker count.
+
+    python -m benchmarks.bench_parallel_pose --seconds 60 --workers 1 2 4 8 16
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.parallel import estimate_track_parallel, estimate_segment
+from analysis.video_exercise_analyzer import probe_frame_count
+from benchmarks.synthetic import make_squat_video
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--video', help='video to analyze (default: generated synthetic clip)')
+    parser.add_argument('--seconds', type=float, default=30.0, help='length of the synthetic clip')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--overlap', type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = args.video or make_squat_video(os.path.join(tmp, 'bench.mp4'), seconds=args.seconds)
+        frame_count = probe_frame_count(video)
+        print(f"{frame_count} frames, {os.cpu_count()} CPUs")
+
+        # Sequential baseline in this process (includes one model load)
+        start = time.perf_counter()
+        estimate_segment(video, 0, None, 0, (540, 480), {"alpha": 0.5})
+        baseline = time.perf_counter() - start
+        print(f"{'workers':>8} {'wall s':>8} {'fps':>8} {'speedup':>8} {'reps':>5}")
+        print(f"{'seq':>8} {baseline:8.2f} {frame_count / baseline:8.1f} {1.0:8.2f}")
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            track = estimate_track_parallel(video, frame_count, workers, overlap=args.overlap)
+            results = ExerciseAnalyzer().analyze_track(track)
+            wall = time.perf_counter() - start
+            reps = sum(block["total_reps"] for block in results["summary"].values())
+            print(f"{workers:8d} {wall:8.2f} {frame_count / wall:8.1f} {baseline / wall:8.2f} {reps:5d}")
+
+
+if __name__ == '__main__':
+    main()
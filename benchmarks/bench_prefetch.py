@@ -0,0 +1,59 @@
+"""
+End-to-end decode + pose inference with and without the decoder thread.
+
+    python -m benchmarks.bench_prefetch --sizes 540x480 1280x720 1920x1080 --seconds 6
+
+Both modes run the same estimator over the same frames, so the landmarks are
+identical; only wall time differs. The overlap needs at least two cores.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.prefetch import FramePrefetcher
+from analysis.video_exercise_analyzer import iter_video_frames
+from benchmarks.synthetic import make_squat_video
+from pose.pose_estimator import PoseEstimator
+
+
+def _analyze(frames, estimator: PoseEstimator) -> float:
+    estimator.reset()
+    start = time.perf_counter()
+    ExerciseAnalyzer().analyze_video(frames, estimator)
+    return time.perf_counter() - start
+
+
+def _size(value: str):
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=_size, nargs='+', default=[(540, 480), (1280, 720), (1920, 1080)],
+                        help='source video sizes, WxH (frames are resized to 540x480)')
+    parser.add_argument('--seconds', type=float, default=6.0)
+    parser.add_argument('--queue', type=int, default=8, help='decoder queue size')
+    parser.add_argument('--repeat', type=int, default=3, help='best of N runs')
+    args = parser.parse_args()
+
+    estimator = PoseEstimator(alpha=0.5)
+    estimator.warm_up()
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'source':>10} {'frames':>6} {'seq fps':>8} {'thread fps':>10} {'speedup':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            video = make_squat_video(os.path.join(tmp, 'bench.mp4'), seconds=args.seconds, size=size)
+            frames = sum(1 for _ in iter_video_frames(video, (16, 16)))
+            sequential = min(_analyze(iter_video_frames(video), estimator) for _ in range(args.repeat))
+            threaded = min(_analyze(FramePrefetcher(video, maxsize=args.queue), estimator)
+                           for _ in range(args.repeat))
+            print(f"{size[0]}x{size[1]:<5} {frames:6d} {frames / sequential:8.1f} {frames / threaded:10.1f} "
+                  f"{sequential / threaded:7.2f}", flush=True)
+    estimator.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+PDF report render time and file size: reportlab vs matplotlib.
+
+    python -m benchmarks.bench_report_render --reps 20 --repeat 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from benchmarks.synthetic import PERSON_IMAGE
+from pose.keypoint_track import KeypointTrack
+from report.report_generator import generate_pdf_report, RENDERERS
+
+
+def synthetic_results(reps: int, frame_gap: int = 30):
+    """Analysis results with ``reps`` squats and pushups, plus frames and a track."""
+    rng = np.random.default_rng(0)
+    frame_data = []
+    for exercise, joint in (("squat", "knee"), ("pushup", "elbow")):
+        for rep in range(1, reps + 1):
+            frame_data.append({
+                "frame_index": len(frame_data) * frame_gap,
+                "exercise": exercise,
+                "rep_id": rep,
+                "is_form_ok": bool(rep % 2),
+                "angles": {joint: float(rng.uniform(70, 160))},
+                "issues": [] if rep % 2 else ["INSUFFICIENT_DEPTH"],
+            })
+    summary = {
+        f"{exercise}s": {"total_reps": reps, "good_form_reps": (reps + 1) // 2,
+                         "common_issues": ["INSUFFICIENT_DEPTH"]}
+        for exercise in ("squat", "pushup")
+    }
+    track = KeypointTrack.from_array(rng.uniform(0, 1, (len(frame_data) * frame_gap, 33, 4)).astype(np.float32))
+    person = cv2.resize(cv2.imread(PERSON_IMAGE), (540, 480))
+    frames = {row["frame_index"]: person for row in frame_data}
+    return {"summary": summary, "frame_data": frame_data}, frames, track
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reps', type=int, default=10, help='logged reps per exercise')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results, frames, track = synthetic_results(args.reps)
+    print(f"{'renderer':>10} {'best s':>8} {'mean s':>8} {'size KB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for renderer in RENDERERS:
+            times = []
+            for i in range(args.repeat):
+                start = time.perf_counter()
+                path = generate_pdf_report(f"bench_{renderer}", results, frames, tmp, track, renderer=renderer)
+                times.append(time.perf_counter() - start)
+            size_kb = os.path.getsize(path) / 1024
+            print(f"{renderer:>10} {min(times):8.3f} {np.mean(times):8.3f} {size_kb:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
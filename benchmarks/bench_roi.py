@@ -0,0 +1,89 @@
+"""
+Full-frame vs ROI-cropped pose inference: throughput, detection rate and
+how far the landmarks move.
+
+    python -m benchmarks.bench_roi --size 1280x720 --person-scale 0.6 1.0
+
+For each clip the reference is full-frame inference on frames resized to the
+analysis resolution (540x480), as the pipeline does. ROI tracking runs on the
+same frames and, for "roi-native", on the source-resolution frames with
+crops scaled to at most ``--max-side`` pixels. Landmark deviation is the mean
+absolute x/y difference from the reference over frames where both found a
+pose, in analysis-resolution pixels.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from benchmarks.synthetic import make_squat_video
+from pose.pose_estimator import PoseEstimator
+
+ANALYSIS_SIZE = (540, 480)
+
+
+def _read(path: str):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        success, frame = cap.read()
+        if not success:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def _run(estimator: PoseEstimator, frames):
+    estimator.warm_up()
+    start = time.perf_counter()
+    keypoints = [estimator.extract_raw_keypoints(frame) for frame in frames]
+    elapsed = time.perf_counter() - start
+    estimator.close()
+    return elapsed, keypoints
+
+
+def _deviation_px(reference, keypoints) -> float:
+    scale = np.array(ANALYSIS_SIZE, dtype=np.float32)
+    diffs = [np.abs((a[:, :2] - b[:, :2]) * scale).mean()
+             for a, b in zip(reference, keypoints) if a is not None and b is not None]
+    return float(np.mean(diffs)) if diffs else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', default='1280x720', help='source resolution, WxH')
+    parser.add_argument('--person-scale', type=float, nargs='+', default=[0.6, 1.0],
+                        help='person height as a fraction of the frame')
+    parser.add_argument('--seconds', type=float, default=4.0)
+    parser.add_argument('--max-side', type=int, default=540, help='crop size cap for roi-native')
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+
+    print(f"{'person':>6} {'mode':>12} {'fps':>7} {'speedup':>7} {'missing':>7} {'dev px':>7} {'roi':>5} {'fallback':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for person_scale in args.person_scale:
+            video = make_squat_video(os.path.join(tmp, 'roi.mp4'), seconds=args.seconds, size=size,
+                                     person_scale=person_scale)
+            native = _read(video)
+            resized = [cv2.resize(frame, ANALYSIS_SIZE) for frame in native]
+            runs = [
+                ("full", PoseEstimator(), resized),
+                ("roi", PoseEstimator(roi_tracking=True), resized),
+                ("roi-native", PoseEstimator(roi_tracking=True, roi_max_side=args.max_side), native),
+            ]
+            reference = baseline = None
+            for mode, estimator, frames in runs:
+                elapsed, keypoints = _run(estimator, frames)
+                if reference is None:
+                    reference, baseline = keypoints, elapsed
+                missing = sum(k is None for k in keypoints)
+                print(f"{person_scale:6.2f} {mode:>12} {len(frames) / elapsed:7.1f} {baseline / elapsed:7.2f} "
+                      f"{missing:7d} {_deviation_px(reference, keypoints):7.2f} "
+                      f"{estimator.roi_frames:5d} {estimator.roi_fallbacks:8d}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+"""
+Per-stage timings of the analysis pipeline on synthetic videos.
+
+Times decode+resize, pose inference, EMA smoothing, the rep FSMs (streaming
+and batch), the JSON/CSV export and the PDF report separately, for every
+combination of resolution, frame rate and duration. Results can be saved as
+a JSON baseline and later runs compared against it:
+
+    python -m benchmarks.bench_stages --output benchmarks/baseline.json
+    python -m benchmarks.bench_stages --compare benchmarks/baseline.json
+
+Compare mode exits with status 1 when a stage is slower than the baseline by
+more than ``--tolerance``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+import cv2
+import numpy as np
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.video_exercise_analyzer import load_video_frames
+from benchmarks.synthetic import make_squat_video
+from pose.keypoint_track import KeypointTrack
+from pose.pose_estimator import PoseEstimator
+from report.report_generator import save_json_and_csv, generate_pdf_report
+
+STAGES = ("decode", "pose", "smooth", "fsm", "fsm_batch", "save", "pdf")
+# Stages faster than this (seconds) are not flagged; their timings are mostly noise
+NOISE_FLOOR = 0.005
+
+
+class _Replay:
+    """Stands in for PoseEstimator and returns precomputed landmarks in order."""
+
+    def __init__(self, track: KeypointTrack):
+        self._frames = iter(track)
+
+    def extract_keypoints(self, frame):
+        return next(self._frames)
+
+
+def _best_of(repeat: int, fn: Callable[[], object]) -> Tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_config(video: str, workdir: str, repeat: int) -> Dict:
+    """Best-of-``repeat`` seconds per stage for one video."""
+    timings = {}
+    timings["decode"], frames = _best_of(repeat, lambda: load_video_frames(video))
+
+    estimator = PoseEstimator(alpha=0.5)
+    estimator.extract_raw_keypoints(frames[0])  # model load is not part of the stage
+
+    def pose():
+        estimator.reset()
+        return [estimator.extract_raw_keypoints(frame) for frame in frames]
+    timings["pose"], raw = _best_of(repeat, pose)
+
+    def smooth():
+        estimator.prev_keypoints = None
+        track = KeypointTrack(capacity=len(raw))
+        for keypoints in raw:
+            track.append(estimator.smooth_keypoints(keypoints) if keypoints is not None else None)
+        return track
+    timings["smooth"], track = _best_of(repeat, smooth)
+    estimator.close()
+
+    timings["fsm"], results = _best_of(
+        repeat, lambda: ExerciseAnalyzer().analyze_video(frames, _Replay(track)))
+    timings["fsm_batch"], _ = _best_of(repeat, lambda: ExerciseAnalyzer().analyze_track(track))
+    timings["save"], _ = _best_of(repeat, lambda: save_json_and_csv(results, "bench", workdir))
+    timings["pdf"], _ = _best_of(repeat, lambda: generate_pdf_report("bench", results, frames, workdir, track))
+
+    n = len(frames)
+    return {
+        "frames": n,
+        "detected_frames": track.detected_frames,
+        "reps": sum(block["total_reps"] for block in results["summary"].values()),
+        "stages": {
+            stage: {"seconds": round(seconds, 6), "ms_per_frame": round(1000 * seconds / max(1, n), 4)}
+            for stage, seconds in timings.items()
+        },
+    }
+
+
+def environment() -> Dict:
+    import mediapipe
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "mediapipe": mediapipe.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def config_name(size: Tuple[int, int], fps: int, seconds: float) -> str:
+    return f"{size[0]}x{size[1]}@{fps}fps/{seconds:g}s"
+
+
+def run(resolutions: List[Tuple[int, int]], fps_values: List[int], durations: List[float], repeat: int) -> Dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in resolutions:
+            for fps in fps_values:
+                for seconds in durations:
+                    name = config_name(size, fps, seconds)
+                    video = make_squat_video(os.path.join(tmp, "bench.mp4"), seconds=seconds, fps=fps, size=size)
+                    results[name] = bench_config(video, tmp, repeat)
+                    print_row(name, results[name])
+    return {"environment": environment(), "results": results}
+
+
+def print_row(name: str, result: Dict):
+    cells = " ".join(f"{result['stages'][stage]['seconds']:9.4f}" for stage in STAGES)
+    print(f"{name:>24} {result['frames']:6d} {cells}", flush=True)
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Describe every stage slower than ``baseline`` by more than ``tolerance``."""
+    regressions = []
+    print(f"\n{'config':>24} {'stage':>10} {'base s':>9} {'now s':>9} {'ratio':>7}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:>24} (no baseline)")
+            continue
+        for stage in STAGES:
+            if stage not in base["stages"]:
+                continue
+            before = base["stages"][stage]["seconds"]
+            after = result["stages"][stage]["seconds"]
+            ratio = after / before if before > 0 else float("inf")
+            regressed = ratio > 1 + tolerance and after - before > NOISE_FLOOR
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name:>24} {stage:>10} {before:9.4f} {after:9.4f} {ratio:7.2f}{flag}")
+            if regressed:
+                regressions.append(f"{name} {stage}: {before:.4f}s -> {after:.4f}s ({ratio:.2f}x)")
+    return regressions
+
+
+def _resolution(value: str) -> Tuple[int, int]:
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolutions', type=_resolution, nargs='+', default=[(540, 480), (1280, 720)],
+                        help='source video sizes, WxH (frames are resized to 540x480 for analysis)')
+    parser.add_argument('--fps', type=int, nargs='+', default=[15, 30])
+    parser.add_argument('--seconds', type=float, nargs='+', default=[2.0, 6.0])
+    parser.add_argument('--repeat', type=int, default=3, help='best of N runs per stage')
+    parser.add_argument('--output', help='write results as a JSON baseline')
+    parser.add_argument('--compare', help='baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown, e.g. 0.2 = 20%%')
+    args = parser.parse_args()
+
+    print(f"{'config':>24} {'frames':>6} " + " ".join(f"{stage:>9}" for stage in STAGES))
+    current = run(args.resolutions, args.fps, args.seconds, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Saved baseline to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == '__main__':
+    main()
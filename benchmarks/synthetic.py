@@ -0,0 +1,45 @@
+"""
+Synthetic test videos generated locally, so benchmarks and tests don't depend
+on clips that aren't checked in.
+"""
+
+import os
+import math
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Person image shipped with the repository; pose detection succeeds on it
+PERSON_IMAGE = os.path.join(ROOT, 'squat.png')
+
+
+def make_squat_video(path: str, seconds: float = 4.0, fps: int = 30,
+                     size: Tuple[int, int] = (540, 480), period: float = 2.0,
+                     person_scale: Optional[float] = None) -> str:
+    """Write a clip of the repository's person image moving up and down.
+
+    The image is squashed vertically over time, which changes the joint
+    angles enough to exercise pose estimation, smoothing and the FSMs.
+    By default the image is stretched to fill the frame; with
+    ``person_scale`` it keeps its aspect ratio at that fraction of the frame
+    height, centered horizontally.
+    """
+    person = cv2.imread(PERSON_IMAGE)
+    w, h = size
+    if person_scale is None:
+        pw, ph = w, h
+    else:
+        ph = max(1, int(h * person_scale))
+        pw = min(w, max(1, int(person.shape[1] * ph / person.shape[0])))
+    person = cv2.resize(person, (pw, ph))
+    left = (w - pw) // 2
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (w, h))
+    for i in range(int(seconds * fps)):
+        scale = 1.0 - 0.3 * (0.5 - 0.5 * math.cos(2 * math.pi * i / (fps * period)))
+        squashed = cv2.resize(person, (pw, max(1, int(ph * scale))))
+        frame = np.full((h, w, 3), 255, dtype=np.uint8)
+        frame[h - squashed.shape[0]:, left:left + pw] = squashed
+        writer.write(frame)
+    writer.release()
+    return path
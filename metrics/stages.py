@@ -0,0 +1,42 @@
+"""
+Metrics of the analysis service, updated by hooks inside each pipeline stage.
+
+Values are per process. Frames estimated by segment-parallel worker
+processes (``analysis.parallel``) are added to the frame counters by the
+parent, but their per-frame inference times are not recorded.
+"""
+
+from metrics.registry import Registry
+from analysis.memory import current_rss_mb
+
+REGISTRY = Registry()
+
+_MB = 1024 * 1024
+# Per-frame work: 1 ms .. 1 s
+_FRAME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.03, 0.05, 0.075, 0.1, 0.25, 0.5, 1.0)
+
+UPLOAD_BYTES = REGISTRY.histogram(
+    "upload_size_bytes", "Size of uploaded videos in bytes",
+    buckets=(0.25 * _MB, 0.5 * _MB, 1 * _MB, 2 * _MB, 5 * _MB, 10 * _MB, 20 * _MB, 50 * _MB, 100 * _MB))
+DECODE_SECONDS = REGISTRY.histogram(
+    "video_decode_seconds", "Time spent decoding and resizing the frames of one video")
+POSE_SECONDS = REGISTRY.histogram(
+    "pose_inference_seconds", "Pose inference time per frame", buckets=_FRAME_BUCKETS)
+ANALYSIS_SECONDS = REGISTRY.histogram(
+    "analysis_seconds", "Decode, pose estimation and rep detection time per video")
+REPORT_SECONDS = REGISTRY.histogram(
+    "report_render_seconds", "PDF report render time", labelnames=("renderer",))
+VIDEO_RENDER_SECONDS = REGISTRY.histogram(
+    "video_render_seconds", "Annotated video render time per video")
+REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "End-to-end HTTP request latency", labelnames=("endpoint", "method", "status"))
+
+FRAMES_PROCESSED = REGISTRY.counter("frames_processed", "Frames run through pose inference")
+FRAMES_WITHOUT_LANDMARKS = REGISTRY.counter("frames_without_landmarks", "Frames in which no pose was detected")
+
+IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being handled")
+JOB_QUEUE_DEPTH = REGISTRY.gauge("job_queue_depth", "Queued background analysis jobs")
+REPORT_QUEUE_DEPTH = REGISTRY.gauge("report_queue_depth", "Pending background report renders")
+LIVE_SESSIONS = REGISTRY.gauge("live_sessions", "Open live analysis sessions")
+PROCESS_RSS = REGISTRY.gauge("process_resident_memory_bytes", "Resident set size of the process in bytes",
+                             function=lambda: current_rss_mb() * _MB)
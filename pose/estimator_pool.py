@@ -0,0 +1,87 @@
+import queue
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+from pose.pose_estimator import PoseEstimator
+
+logger = logging.getLogger(__name__)
+
+class EstimatorPool:
+    """Long-lived PoseEstimator instances checked out per video.
+
+    Estimators are created lazily up to ``size`` (or all at once by
+    ``warm_up``). On return each one is reset in the background -- MediaPipe
+    tracking state and the EMA ``prev_keypoints`` are cleared -- and warmed
+    with a blank frame before it can be checked out again, so smoothing never
+    carries over from one user's video to the next.
+    """
+
+    def __init__(self, size: int = 2, factory: Optional[Callable[[], PoseEstimator]] = None, **estimator_kwargs):
+        self.size = max(1, size)
+        self._factory = factory or (lambda: PoseEstimator(**estimator_kwargs))
+        self._available: "queue.Queue[PoseEstimator]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._recycler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="estimator-reset")
+
+    @property
+    def idle(self) -> int:
+        return self._available.qsize()
+
+    def warm_up(self):
+        """Create and initialize every estimator up front."""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    return
+                self._created += 1
+            self._available.put(self._new_estimator())
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[PoseEstimator]:
+        """Borrow a freshly reset estimator; blocks while all are in use."""
+        estimator = self._acquire(timeout)
+        try:
+            yield estimator
+        finally:
+            self._recycler.submit(self._recycle, estimator)
+
+    def _acquire(self, timeout: Optional[float]) -> PoseEstimator:
+        try:
+            estimator = self._available.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                return self._new_estimator()
+            try:
+                estimator = self._available.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError("No pose estimator became available") from None
+        estimator.prev_keypoints = None
+        return estimator
+
+    def _new_estimator(self) -> PoseEstimator:
+        try:
+            estimator = self._factory()
+            estimator.warm_up()
+            return estimator
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _recycle(self, estimator: PoseEstimator):
+        try:
+            estimator.reset()
+            estimator.warm_up()
+        except Exception:
+            logger.exception("Discarding pose estimator that failed to reset")
+            with self._lock:
+                self._created -= 1
+            return
+        self._available.put(estimator)
@@ -0,0 +1,91 @@
+from typing import Dict, Iterator, Optional
+import numpy as np
+from pose.landmarks import (
+    Landmarks, LANDMARK_NAMES, NUM_LANDMARKS, NUM_COLUMNS, as_array, X, Y, Z, VISIBILITY
+)
+
+
+class KeypointTrack:
+    """Smoothed pose landmarks for every analyzed frame of a video.
+
+    Produced once by ``ExerciseAnalyzer.analyze_video`` so the report, CSV
+    export and other consumers never need to rerun pose estimation.
+    Backed by a growable (T, 33, 4) float32 array; frames without a detected
+    pose are NaN rows and read back as ``None``.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self._buffer = np.full((max(1, capacity), NUM_LANDMARKS, NUM_COLUMNS), np.nan, dtype=np.float32)
+        self._length = 0
+
+    @classmethod
+    def from_array(cls, data: np.ndarray, copy: bool = True) -> "KeypointTrack":
+        """Track over ``data``. ``copy=False`` wraps it as is, e.g. a read-only memmap."""
+        if copy:
+            track = cls(capacity=len(data))
+            track._buffer[:len(data)] = data
+        else:
+            track = cls(capacity=1)
+            track._buffer = data
+        track._length = len(data)
+        return track
+
+    def append(self, landmarks):
+        if self._length == len(self._buffer):
+            grown = np.full((max(1, len(self._buffer) * 2), NUM_LANDMARKS, NUM_COLUMNS), np.nan, dtype=np.float32)
+            grown[:self._length] = self._buffer[:self._length]
+            self._buffer = grown
+        if landmarks is not None:
+            self._buffer[self._length] = as_array(landmarks)
+        self._length += 1
+
+    @property
+    def data(self) -> np.ndarray:
+        """(T, 33, 4) view of the track."""
+        return self._buffer[:self._length]
+
+    @property
+    def detected(self) -> np.ndarray:
+        """Boolean mask of frames with a detected pose."""
+        return ~np.isnan(self.data[:, :, X]).all(axis=1)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, idx: int) -> Optional[Landmarks]:
+        if idx < 0:
+            idx += self._length
+        if not 0 <= idx < self._length:
+            raise IndexError(idx)
+        row = self._buffer[idx]
+        if np.isnan(row[:, X]).all():
+            return None
+        return Landmarks(row)
+
+    def __iter__(self) -> Iterator[Optional[Landmarks]]:
+        for idx in range(self._length):
+            yield self[idx]
+
+    def get(self, idx: int) -> Optional[Landmarks]:
+        """Landmarks at ``idx`` or None when out of range or not detected."""
+        if 0 <= idx < self._length:
+            return self[idx]
+        return None
+
+    @property
+    def detected_frames(self) -> int:
+        return int(self.detected.sum())
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """Flatten to one row per (frame, landmark) as parallel columns for tabular export."""
+        data = self.data[self.detected]
+        frame_index = np.flatnonzero(self.detected)
+        rows = data.reshape(-1, NUM_COLUMNS)
+        return {
+            "frame_index": np.repeat(frame_index, NUM_LANDMARKS),
+            "landmark": np.tile(np.array(LANDMARK_NAMES), len(frame_index)),
+            "x": rows[:, X],
+            "y": rows[:, Y],
+            "z": rows[:, Z],
+            "visibility": rows[:, VISIBILITY],
+        }
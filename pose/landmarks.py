@@ -0,0 +1,144 @@
+from collections.abc import Mapping
+from typing import Dict, Iterator, Optional
+import numpy as np
+
+# BlazePose landmark order, identical to mediapipe's PoseLandmark enum. Kept
+# here so landmark lookups never go through the enum per frame.
+LANDMARK_NAMES = (
+    "NOSE", "LEFT_EYE_INNER", "LEFT_EYE", "LEFT_EYE_OUTER", "RIGHT_EYE_INNER",
+    "RIGHT_EYE", "RIGHT_EYE_OUTER", "LEFT_EAR", "RIGHT_EAR", "MOUTH_LEFT",
+    "MOUTH_RIGHT", "LEFT_SHOULDER", "RIGHT_SHOULDER", "LEFT_ELBOW", "RIGHT_ELBOW",
+    "LEFT_WRIST", "RIGHT_WRIST", "LEFT_PINKY", "RIGHT_PINKY", "LEFT_INDEX",
+    "RIGHT_INDEX", "LEFT_THUMB", "RIGHT_THUMB", "LEFT_HIP", "RIGHT_HIP",
+    "LEFT_KNEE", "RIGHT_KNEE", "LEFT_ANKLE", "RIGHT_ANKLE", "LEFT_HEEL",
+    "RIGHT_HEEL", "LEFT_FOOT_INDEX", "RIGHT_FOOT_INDEX",
+)
+LANDMARK_INDEX = {name: idx for idx, name in enumerate(LANDMARK_NAMES)}
+NUM_LANDMARKS = len(LANDMARK_NAMES)
+
+# Named row indices
+NOSE = LANDMARK_INDEX["NOSE"]
+LEFT_SHOULDER = LANDMARK_INDEX["LEFT_SHOULDER"]
+RIGHT_SHOULDER = LANDMARK_INDEX["RIGHT_SHOULDER"]
+LEFT_ELBOW = LANDMARK_INDEX["LEFT_ELBOW"]
+RIGHT_ELBOW = LANDMARK_INDEX["RIGHT_ELBOW"]
+LEFT_WRIST = LANDMARK_INDEX["LEFT_WRIST"]
+RIGHT_WRIST = LANDMARK_INDEX["RIGHT_WRIST"]
+LEFT_HIP = LANDMARK_INDEX["LEFT_HIP"]
+RIGHT_HIP = LANDMARK_INDEX["RIGHT_HIP"]
+LEFT_KNEE = LANDMARK_INDEX["LEFT_KNEE"]
+RIGHT_KNEE = LANDMARK_INDEX["RIGHT_KNEE"]
+LEFT_ANKLE = LANDMARK_INDEX["LEFT_ANKLE"]
+RIGHT_ANKLE = LANDMARK_INDEX["RIGHT_ANKLE"]
+
+# Skeleton edges, identical to mediapipe's POSE_CONNECTIONS
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20), (11, 23),
+    (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+    (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+
+# Column indices
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+COLUMNS = ("x", "y", "z", "visibility")
+NUM_COLUMNS = len(COLUMNS)
+
+
+def empty_landmarks() -> np.ndarray:
+    """A (33, 4) float32 array with every landmark missing (NaN)."""
+    return np.full((NUM_LANDMARKS, NUM_COLUMNS), np.nan, dtype=np.float32)
+
+
+class Landmarks(Mapping):
+    """Read-only dict view over a (33, 4) float32 landmark array.
+
+    Keeps the ``lm["LEFT_HIP"]["x"]`` API working while the data stays in one
+    array. Missing landmarks are NaN rows and behave like absent keys.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray):
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, landmarks: Mapping) -> "Landmarks":
+        data = empty_landmarks()
+        for name, point in landmarks.items():
+            idx = LANDMARK_INDEX.get(name)
+            if idx is None:
+                continue
+            for col, key in enumerate(COLUMNS):
+                value = point.get(key)
+                if value is not None:
+                    data[idx, col] = value
+        return cls(data)
+
+    @property
+    def xy(self) -> np.ndarray:
+        return self.data[:, :2]
+
+    def _present(self) -> np.ndarray:
+        return ~np.isnan(self.data[:, X])
+
+    def __getitem__(self, name: str) -> Dict[str, float]:
+        idx = LANDMARK_INDEX[name]
+        row = self.data[idx]
+        if np.isnan(row[X]):
+            raise KeyError(name)
+        x, y, z, visibility = row.tolist()
+        return {'x': x, 'y': y, 'z': z, 'visibility': visibility}
+
+    def __iter__(self) -> Iterator[str]:
+        for idx in np.flatnonzero(self._present()):
+            yield LANDMARK_NAMES[idx]
+
+    def __len__(self) -> int:
+        return int(self._present().sum())
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        return {name: self[name] for name in self}
+
+
+def as_array(landmarks) -> Optional[np.ndarray]:
+    """Return the (33, 4) array behind any supported landmark representation."""
+    if landmarks is None:
+        return None
+    if isinstance(landmarks, Landmarks):
+        return landmarks.data
+    if isinstance(landmarks, np.ndarray):
+        return landmarks
+    return Landmarks.from_dict(landmarks).data
+
+
+def ema_update(prev: Optional[np.ndarray], current: np.ndarray, alpha: float) -> np.ndarray:
+    """One vectorized EMA step over all landmarks.
+
+    x/y/z are smoothed, visibility is taken from the current frame. Landmarks
+    missing from ``prev`` start from the current value.
+    """
+    if prev is None:
+        return current.copy()
+    smoothed = alpha * current + (1 - alpha) * prev
+    smoothed[:, VISIBILITY] = current[:, VISIBILITY]
+    missing = np.isnan(prev[:, X])
+    if missing.any():
+        smoothed[missing] = current[missing]
+    return smoothed
+
+
+def ema_smooth_track(raw: np.ndarray, alpha: float) -> np.ndarray:
+    """Apply ``ema_update`` along a (T, 33, 4) track of raw keypoints.
+
+    Frames without a pose (all-NaN) stay NaN and do not reset the filter,
+    exactly like streaming frames through ``PoseEstimator.extract_keypoints``.
+    """
+    smoothed = np.full_like(raw, np.nan)
+    prev = None
+    detected = ~np.isnan(raw[:, :, X]).all(axis=1)
+    for idx in np.flatnonzero(detected):
+        prev = ema_update(prev, raw[idx], alpha)
+        smoothed[idx] = prev
+    return smoothed
@@ -1,110 +1,188 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 from typing import List, Dict, Optional, Tuple
 import math
+from pose.landmarks import Landmarks, as_array, ema_update, POSE_CONNECTIONS, X, Y
+from pose.roi import RoiTracker
+from metrics.stages import POSE_SECONDS, FRAMES_PROCESSED, FRAMES_WITHOUT_LANDMARKS
+
+# Blank frame used to initialize the MediaPipe graph ahead of real work
+_BLANK_FRAME = np.zeros((480, 540, 3), dtype=np.uint8)
 
 class PoseEstimator:
-    def __init__(self, alpha=0.5):
+    def __init__(self, alpha=0.5, roi_tracking=False, roi_padding=0.3, roi_max_side=None,
+                 model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        # Imported here: loading mediapipe takes most of a second and most
+        # importers (API process, report rendering) never build an estimator
+        import mediapipe as mp
         self.mp_pose = mp.solutions.pose
         self.mp_drawing = mp.solutions.drawing_utils
         self.pose = self.mp_pose.Pose(
             static_image_mode=False,  #  frames in a video stream not just static images
-            model_complexity=1,
+            model_complexity=model_complexity,  # 0 lite, 1 full, 2 heavy
             enable_segmentation=False,
-            min_detection_confidence=0.5,  # detection confidence threshold
-            min_tracking_confidence=0.5  # tracking confidence threshold
+            min_detection_confidence=min_detection_confidence,  # detection confidence threshold
+            min_tracking_confidence=min_tracking_confidence  # tracking confidence threshold
         )
         self.alpha = alpha  # Smoothing factor for EMA
-        self.prev_keypoints = None  # To store the previous frame's keypoints for EMA
+        self.prev_keypoints = None  # Previous frame's smoothed (33, 4) array for EMA
+        # Crop each frame around the previous landmarks (see pose.roi)
+        self.roi = RoiTracker(padding=roi_padding, max_side=roi_max_side) if roi_tracking else None
+        self.roi_frames = 0  # frames answered from the crop
+        self.roi_fallbacks = 0  # crops without a pose that were retried on the full frame
+        self._view = None  # crop box (or None for the full frame) the graph is tracking in
+
+    def reset(self):
+        """Forget tracking and EMA state so the next frame starts a new video."""
+        self.prev_keypoints = None
+        self.pose.reset()
+        if self.roi is not None:
+            self.roi.reset()
+        self._view = None
+
+    def warm_up(self):
+        """Run a blank frame through the graph so initialization happens now.
+
+        Not counted in the inference metrics; EMA state is left empty.
+        """
+        self.pose.process(_BLANK_FRAME)
+        self.prev_keypoints = None
+
+    def close(self):
+        """Release the MediaPipe graph."""
+        self.pose.close()
 
 #keypoints from a single frame"""
-    def extract_keypoints(self, frame: np.ndarray) -> Optional[Dict]:
+    def extract_keypoints(self, frame: np.ndarray) -> Optional[Landmarks]:
         """Extract pose keypoints from a single frame"""
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.pose.process(rgb_frame)
-        
-        if results.pose_landmarks:
-            landmarks = {}
-            for idx, landmark in enumerate(results.pose_landmarks.landmark):
-                landmark_name = self.mp_pose.PoseLandmark(idx).name
-                landmarks[landmark_name] = {
-                    'x': landmark.x,
-                    'y': landmark.y,
-                    'z': landmark.z,
-                    'visibility': landmark.visibility
-                }
+        keypoints = self.extract_raw_keypoints(frame)
+        if keypoints is not None:
             # Apply smoothing to the keypoints
-            smoothed_landmarks = self.smooth_keypoints(landmarks)
-            return smoothed_landmarks
+            return self.smooth_keypoints(keypoints)
+        return None
+
+    def extract_raw_keypoints(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Unsmoothed (33, 4) keypoints of a single frame, or None without a pose.
+
+        With ROI tracking the frame is cropped around the previous landmarks;
+        if the crop has no pose, the full frame is processed instead.
+        """
+        with POSE_SECONDS.time():
+            keypoints = None
+            crop = self.roi.crop(frame) if self.roi is not None else None
+            if crop is not None:
+                keypoints = self._process(crop, self.roi.box)
+                if keypoints is not None:
+                    keypoints = self.roi.to_frame(keypoints, frame.shape)
+                    self.roi_frames += 1
+                else:
+                    self.roi_fallbacks += 1
+            if keypoints is None:
+                keypoints = self._process(frame, None)
+            if self.roi is not None:
+                self.roi.update(keypoints, frame.shape)
+        FRAMES_PROCESSED.inc()
+        if keypoints is None:
+            FRAMES_WITHOUT_LANDMARKS.inc()
+        return keypoints
+
+    def _process(self, image: np.ndarray, view) -> Optional[np.ndarray]:
+        if self.roi is not None and view != self._view:
+            # MediaPipe's own tracking is in image coordinates; start over when the view moves
+            self.pose.reset()
+            self._view = view
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        results = self.pose.process(rgb_image)
+        if results.pose_landmarks:
+            return np.array(
+                [(lm.x, lm.y, lm.z, lm.visibility) for lm in results.pose_landmarks.landmark],
+                dtype=np.float32
+            )
         return None
     
     #Applying Exponential Moving Average (EMA) to smooth the keypoints"""
-    def smooth_keypoints(self, keypoints: Dict) -> Dict:
-        if self.prev_keypoints is None:
-            self.prev_keypoints = keypoints
-            return keypoints
-        
-        smoothed_keypoints = {}
-        for landmark_name, current_point in keypoints.items():
-            prev_point = self.prev_keypoints.get(landmark_name, current_point)
-            smoothed_point = {
-                'x': self.alpha * current_point['x'] + (1 - self.alpha) * prev_point['x'],
-                'y': self.alpha * current_point['y'] + (1 - self.alpha) * prev_point['y'],
-                'z': self.alpha * current_point['z'] + (1 - self.alpha) * prev_point['z']
-            }
-            smoothed_keypoints[landmark_name] = smoothed_point
-        
-        # Update the previous keypoints
-        self.prev_keypoints = smoothed_keypoints
-        return smoothed_keypoints
+    def smooth_keypoints(self, keypoints) -> Landmarks:
+        """EMA over a (33, 4) array; dicts of named landmarks are accepted too."""
+        current = as_array(keypoints)
+        self.prev_keypoints = ema_update(self.prev_keypoints, current, self.alpha)
+        return Landmarks(self.prev_keypoints)
 
    # Drawing pose skeleton on frame 
     def draw_pose(self, frame: np.ndarray, landmarks: Dict) -> np.ndarray:
-        if landmarks:
-            # Convert landmarks back to MediaPipe format for drawing
-            landmark_list = []
-            for i in range(33):  # MediaPipe has 33 pose landmarks
-                landmark_name = self.mp_pose.PoseLandmark(i).name
-                if landmark_name in landmarks:
-                    lm = landmarks[landmark_name]
-                    landmark_list.append([lm['x'], lm['y'], lm['z']])
-                else:
-                    landmark_list.append([0, 0, 0])
-            
-            # Draw landmarks and connections
-            h, w, _ = frame.shape
-            for i, lm in enumerate(landmark_list):
-                if lm[0] > 0 and lm[1] > 0:
-                    cv2.circle(frame, (int(lm[0] * w), int(lm[1] * h)), 5, (0, 255, 0), -1)
-        
+        return draw_pose(frame, landmarks)
+
+
+def draw_pose(frame: np.ndarray, landmarks: Optional[Dict]) -> np.ndarray:
+    """Draw landmarks on ``frame`` without needing a PoseEstimator instance."""
+    if landmarks:
+        h, w, _ = frame.shape
+        points = as_array(landmarks)
+        # NaN (missing) rows fail the comparison and are skipped
+        visible = (points[:, X] > 0) & (points[:, Y] > 0)
+        for x, y in (points[visible, :2] * (w, h)).astype(int).tolist():
+            cv2.circle(frame, (x, y), 5, (0, 255, 0), -1)
+
+    return frame
+
+_EDGES = np.array(POSE_CONNECTIONS)
+
+
+def draw_skeleton(frame: np.ndarray, keypoints: Optional[np.ndarray],
+                  color: Tuple[int, int, int] = (0, 255, 0), thickness: int = 2) -> np.ndarray:
+    """Draw the bones and joints of a (33, 4) keypoint array on ``frame``.
+
+    Two ``cv2.polylines`` calls draw everything: one polyline per bone, and
+    one zero-length polyline per joint, which its round caps turn into a dot.
+    """
+    if keypoints is None:
+        return frame
+    h, w = frame.shape[:2]
+    points = keypoints[:, :2] * (w, h)
+    visible = ~np.isnan(points).any(axis=1) & (keypoints[:, X] > 0) & (keypoints[:, Y] > 0)
+    if not visible.any():
         return frame
+    pixels = np.zeros((len(points), 2), dtype=np.int32)
+    pixels[visible] = np.round(points[visible])
+    edges = _EDGES[visible[_EDGES].all(axis=1)]
+    if len(edges):
+        cv2.polylines(frame, list(pixels[edges]), False, color, thickness, cv2.LINE_AA)
+    joints = pixels[visible]
+    cv2.polylines(frame, list(np.stack([joints, joints], axis=1)), False, color, thickness * 3, cv2.LINE_AA)
+    return frame
+
+
+def main(video_path: str = 'demo/squat.mp4'):
+    """Show the smoothed landmarks of ``video_path`` in a window; press 'q' to quit."""
+    pose_estimator = PoseEstimator(alpha=0.5)  # Set alpha for smoothing (0.5) after trials is chosen
+
+    cap = cv2.VideoCapture(video_path)
 
-# Example usage
-pose_estimator = PoseEstimator(alpha=0.5)  # Set alpha for smoothing (0.5) after trials is chosen
+    while cap.isOpened():
+        success, frame = cap.read()
+        if not success:
+            print("Failed to capture frame.")
+            break
 
-cap = cv2.VideoCapture('demo/squat.mp4')  
+        # Resize the frame (resize to 540x480 or any other size)
+        frame_resized = cv2.resize(frame, (540, 480))
 
-while cap.isOpened():
-    success, frame = cap.read()
-    if not success:
-        print("Failed to capture frame.")
-        break
+        # Extract keypoints from the frame (with smoothing applied)
+        landmarks = pose_estimator.extract_keypoints(frame_resized)
 
-    # Resize the frame (resize to 540x480 or any other size)
-    frame_resized = cv2.resize(frame, (540, 480))
+        # Draw pose on the frame
+        frame_with_pose = pose_estimator.draw_pose(frame_resized, landmarks)
 
-    # Extract keypoints from the frame (with smoothing applied)
-    landmarks = pose_estimator.extract_keypoints(frame_resized)
+        # Display the frame with pose landmarks
+        cv2.imshow("Pose Estimation", frame_with_pose)
 
-    # Draw pose on the frame
-    frame_with_pose = pose_estimator.draw_pose(frame_resized, landmarks)
+        if cv2.waitKey(1) & 0xFF == ord('q'):  # Press 'q' to quit
+            break
 
-    # Display the frame with pose landmarks
-    cv2.imshow("Pose Estimation", frame_with_pose)
+    cap.release()
+    cv2.destroyAllWindows()
+    pose_estimator.close()
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):  # Press 'q' to quit
-        break
 
-cap.release()
-cv2.destroyAllWindows()
+if __name__ == "__main__":
+    import sys
+    main(*sys.argv[1:2])
@@ -0,0 +1,106 @@
+"""
+Region-of-interest tracking for pose inference.
+
+The person usually fills a small, slowly moving part of the frame. After a
+successful detection the next frame is cropped to a padded box around the
+landmarks, inference runs on the crop and the landmarks are mapped back to
+full-frame normalized coordinates. The box only moves when the landmarks get
+close to its edge, so the crop stays stable while the person does.
+"""
+
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+from pose.landmarks import X, Y, Z, VISIBILITY
+
+Box = Tuple[int, int, int, int]  # x0, y0, x1, y1 in pixels
+
+# Fewer visible landmarks than this is treated as lost tracking
+MIN_VISIBLE_LANDMARKS = 8
+MIN_BOX_SIDE = 64
+
+
+class RoiTracker:
+    """Crop box for the next frame, derived from the previous frame's landmarks.
+
+    ``padding`` is the margin added on each side, relative to the longer side
+    of the landmark bounding box. ``max_side`` downscales crops whose longer
+    side exceeds it, so a crop from a high-resolution frame costs about the
+    same as a full frame at ``max_side`` while keeping more pixels on the
+    person.
+    """
+
+    def __init__(self, padding: float = 0.3, min_visibility: float = 0.5, max_side: Optional[int] = None):
+        self.padding = padding
+        self.min_visibility = min_visibility
+        self.max_side = max_side
+        self.box: Optional[Box] = None
+
+    def reset(self):
+        self.box = None
+
+    def crop(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Current crop of ``frame`` (scaled to ``max_side``), or None without a box."""
+        if self.box is None:
+            return None
+        x0, y0, x1, y1 = self.box
+        crop = frame[y0:y1, x0:x1]
+        longest = max(crop.shape[:2])
+        if self.max_side and longest > self.max_side:
+            scale = self.max_side / longest
+            crop = cv2.resize(crop, (max(1, round(crop.shape[1] * scale)), max(1, round(crop.shape[0] * scale))),
+                              interpolation=cv2.INTER_AREA)
+        return crop
+
+    def to_frame(self, keypoints: np.ndarray, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        """Map keypoints normalized to the crop back to full-frame normalized coordinates."""
+        height, width = frame_shape[:2]
+        x0, y0, x1, y1 = self.box
+        mapped = keypoints.copy()
+        mapped[:, X] = (x0 + keypoints[:, X] * (x1 - x0)) / width
+        mapped[:, Y] = (y0 + keypoints[:, Y] * (y1 - y0)) / height
+        # z uses the same scale as x
+        mapped[:, Z] = keypoints[:, Z] * (x1 - x0) / width
+        return mapped
+
+    def update(self, keypoints: Optional[np.ndarray], frame_shape: Tuple[int, ...]):
+        """Move the box to follow full-frame ``keypoints``; drop it when tracking is lost."""
+        bounds = self._landmark_bounds(keypoints, frame_shape)
+        if bounds is None:
+            self.box = None
+            return
+        if self.box is not None and _contains(self.box, _clip(_pad(bounds, self.padding / 2), frame_shape)):
+            return
+        self.box = _clip(_pad(bounds, self.padding), frame_shape)
+
+    def _landmark_bounds(self, keypoints: Optional[np.ndarray],
+                         frame_shape: Tuple[int, ...]) -> Optional[Tuple[float, float, float, float]]:
+        if keypoints is None:
+            return None
+        visible = keypoints[:, VISIBILITY] >= self.min_visibility
+        if visible.sum() < MIN_VISIBLE_LANDMARKS:
+            return None
+        height, width = frame_shape[:2]
+        xs = keypoints[visible, X] * width
+        ys = keypoints[visible, Y] * height
+        return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+
+
+def _pad(bounds: Tuple[float, float, float, float], padding: float) -> Tuple[float, float, float, float]:
+    x0, y0, x1, y1 = bounds
+    margin = padding * max(x1 - x0, y1 - y0, MIN_BOX_SIDE)
+    return x0 - margin, y0 - margin, x1 + margin, y1 + margin
+
+
+def _contains(box: Box, bounds: Tuple[float, float, float, float]) -> bool:
+    x0, y0, x1, y1 = box
+    bx0, by0, bx1, by1 = bounds
+    return bx0 >= x0 and by0 >= y0 and bx1 <= x1 and by1 <= y1
+
+
+def _clip(bounds: Tuple[float, float, float, float], frame_shape: Tuple[int, ...]) -> Box:
+    height, width = frame_shape[:2]
+    x0, y0, x1, y1 = bounds
+    x0, y0 = max(0, int(np.floor(x0))), max(0, int(np.floor(y0)))
+    x1, y1 = min(width, int(np.ceil(x1))), min(height, int(np.ceil(y1)))
+    return x0, y0, max(x1, x0 + 1), max(y1, y0 + 1)
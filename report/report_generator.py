@@ -1,15 +1,15 @@
+# pandas, matplotlib and reportlab are imported where they are used: together
+# they take over half a second to load and most processes never write a report
 import os
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use a headless backend
-from matplotlib.backends.backend_pdf import PdfPages
-
 import cv2
-from pose.pose_estimator import PoseEstimator
+from pose.pose_estimator import draw_pose
+from analysis.exercises import EXERCISES
+from analysis.keyframes import select_keyframes
+from metrics.stages import REPORT_SECONDS
 
 def save_json_and_csv(results, video_id, output_dir="reports"):
+    import pandas as pd
     os.makedirs(output_dir, exist_ok=True)
     
     # Save summary.json
@@ -24,17 +24,59 @@ def save_json_and_csv(results, video_id, output_dir="reports"):
 
     return summary_path, csv_path
 
-def generate_pdf_report(video_id, results, frames, output_dir="reports"):
-    pdf_path = os.path.join(output_dir, f"{video_id}.pdf")
-    os.makedirs(output_dir, exist_ok=True)
+def _angle_series(frame_data):
+    """Frame index and FSM angle of each logged rep, per exercise.
+
+    The angle is the one named by the exercise's ``ANGLE_NAME`` in the
+    registry, or the row's only angle for exercises that are not registered.
+    """
+    series = {}
+    for row in frame_data:
+        angles = row["angles"]
+        analyzer_cls = EXERCISES.get(row["exercise"])
+        if analyzer_cls is not None and analyzer_cls.ANGLE_NAME in angles:
+            angle = angles[analyzer_cls.ANGLE_NAME]
+        elif len(angles) == 1:
+            angle = next(iter(angles.values()))
+        else:
+            angle = None
+        frame_indices, values = series.setdefault(row["exercise"], ([], []))
+        frame_indices.append(row["frame_index"])
+        values.append(angle)
+    return series
+
+
+def _annotated_samples(keyframes, frames, track):
+    """(title, frame) for each keyframe whose frame is available.
 
+    Frames are annotated with their pose from ``track``; without a track, or
+    where the track has no pose, the frame is shown as decoded.
+    """
+    samples = []
+    for keyframe in keyframes:
+        idx = keyframe.frame_index
+        if isinstance(frames, dict):
+            frame = frames.get(idx)
+        else:
+            frame = frames[idx] if idx < len(frames) else None
+        if frame is None:
+            continue
+        landmarks = track.get(idx) if track is not None else None
+        samples.append((keyframe.title, draw_pose(frame.copy(), landmarks) if landmarks else frame))
+    return samples
+
+
+def _render_matplotlib(pdf_path, summary, angle_series, samples):
+    import matplotlib
+    matplotlib.use('Agg')  # Use a headless backend
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
 
     with PdfPages(pdf_path) as pdf:
         # Page 1: Summary
         fig, ax = plt.subplots(figsize=(8.5, 11))
         ax.axis('off')
         ax.set_title("Exercise Summary", fontsize=16, fontweight='bold')
-        summary = results["summary"]
 
         text = ""
         for exercise in summary:
@@ -63,11 +105,9 @@ def generate_pdf_report(video_id, results, frames, output_dir="reports"):
         plt.close()
 
         # Page 3+: Angle plots per exercise
-        df = pd.DataFrame(results["frame_data"])
-        for exercise in df["exercise"].unique():
-            sub = df[df["exercise"] == exercise]
+        for exercise, (frame_indices, angles) in angle_series.items():
             fig, ax = plt.subplots()
-            ax.plot(sub["frame_index"], [d.get("knee") or d.get("elbow") for d in sub["angles"]])
+            ax.plot(frame_indices, angles)
             ax.set_title(f"{exercise.title()} Angle vs Frame")
             ax.set_xlabel("Frame Index")
             ax.set_ylabel("Angle (degrees)")
@@ -75,21 +115,54 @@ def generate_pdf_report(video_id, results, frames, output_dir="reports"):
             plt.close()
 
         # Annotated Sample Frames
-        pose_estimator = PoseEstimator()
-        for row in df.sample(n=min(4, len(df))).itertuples():
-            idx = row.frame_index
-            frame = frames[idx]
-            landmarks = pose_estimator.extract_keypoints(frame)
-            if landmarks:
-                annotated = pose_estimator.draw_pose(frame.copy(), landmarks)
-                fig, ax = plt.subplots()
-                ax.imshow(cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB))
-                ax.set_title(f"{row.exercise.title()} Frame {idx} - Rep {row.rep_id}")
-                ax.axis('off')
-                pdf.savefig(fig)
-                plt.close()
+        for title, annotated in samples:
+            fig, ax = plt.subplots()
+            ax.imshow(cv2.cvtColor(annotated, cv2.COLOR_BGR2RGB))
+            ax.set_title(title)
+            ax.axis('off')
+            pdf.savefig(fig)
+            plt.close()
+
+
+def generate_pdf_report(video_id, results, frames, output_dir="reports", track=None, renderer=None,
+                        keyframes=None):
+    """Render the PDF report.
+
+    ``keyframes`` are the frames to show (see ``analysis.keyframes``; by
+    default up to four reps at the frame they were logged). ``frames`` is
+    indexed by frame index: a dict holding just those frames, e.g. from
+    ``read_frames_at``, or the full list of frames.
+    ``track`` is the ``KeypointTrack`` from the analysis pass; sample frames are
+    annotated from it instead of running pose estimation again. Without it the
+    sample frames are included unannotated.
+    ``renderer`` is "reportlab" (default, see ``REPORT_RENDERER``) or "matplotlib".
+    """
+    renderer = renderer or DEFAULT_RENDERER
+    if renderer not in RENDERERS:
+        raise ValueError(f"Unknown report renderer: {renderer}")
+    pdf_path = os.path.join(output_dir, f"{video_id}.pdf")
+    os.makedirs(output_dir, exist_ok=True)
+
+    summary = results["summary"]
+    if keyframes is None:
+        keyframes = select_keyframes(results["frame_data"])
+    with REPORT_SECONDS.time(renderer=renderer):
+        RENDERERS[renderer](pdf_path, summary, _angle_series(results["frame_data"]), _annotated_samples(keyframes, frames, track))
+
     # Save the PDF
     print(f"Report saved to {pdf_path}")
     
 
     return pdf_path
+
+
+def _render_reportlab(pdf_path, summary, angle_series, samples):
+    from report import reportlab_renderer
+    reportlab_renderer.render_pdf(pdf_path, summary, angle_series, samples)
+
+
+RENDERERS = {
+    "reportlab": _render_reportlab,
+    "matplotlib": _render_matplotlib,
+}
+DEFAULT_RENDERER = os.getenv("REPORT_RENDERER", "reportlab")
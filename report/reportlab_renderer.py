@@ -0,0 +1,130 @@
+"""
+PDF report renderer drawing directly with reportlab.
+
+Text and charts are emitted as vector PDF operators and sample frames are
+embedded as JPEGs, instead of rasterising a matplotlib figure per page.
+The pages mirror the matplotlib report: summary, good vs bad reps, one angle
+plot per exercise and the annotated sample frames.
+"""
+
+import io
+from typing import Dict, List, Sequence, Tuple
+import cv2
+import numpy as np
+from reportlab.graphics import renderPDF
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+MARGIN = 54
+JPEG_QUALITY = 85
+
+# (x values, y values) of one exercise's angle plot
+AngleSeries = Tuple[Sequence[float], Sequence[float]]
+
+
+def _title(pdf: canvas.Canvas, text: str, size: int = 16):
+    pdf.setFont("Helvetica-Bold", size)
+    pdf.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - MARGIN, text)
+
+
+def _summary_page(pdf: canvas.Canvas, summary: Dict):
+    _title(pdf, "Exercise Summary")
+    text = pdf.beginText(MARGIN, PAGE_HEIGHT - MARGIN - 40)
+    text.setFont("Helvetica", 12)
+    text.setLeading(16)
+    for exercise, block in summary.items():
+        text.textLine("")
+        text.textLine(f"{exercise.upper()}:")
+        text.textLine(f"  Total Reps: {block['total_reps']}")
+        text.textLine(f"  Good Form Reps: {block['good_form_reps']}")
+        issues = ', '.join(set(block['common_issues'])) or 'None'
+        text.textLine(f"  Common Issues: {issues}")
+    pdf.drawText(text)
+    pdf.showPage()
+
+
+def _chart_drawing(title: str, width: float = PAGE_WIDTH - 2 * MARGIN, height: float = 360) -> Drawing:
+    drawing = Drawing(width, height)
+    drawing.add(String(width / 2, height - 16, title, fontName="Helvetica-Bold",
+                       fontSize=13, textAnchor="middle"))
+    return drawing
+
+
+def _reps_page(pdf: canvas.Canvas, summary: Dict):
+    drawing = _chart_drawing("Good vs Bad Form Reps")
+    if summary:
+        good = [summary[e]["good_form_reps"] for e in summary]
+        bad = [summary[e]["total_reps"] - summary[e]["good_form_reps"] for e in summary]
+        chart = VerticalBarChart()
+        chart.x, chart.y = 50, 40
+        chart.width, chart.height = drawing.width - 80, drawing.height - 90
+        chart.data = [good, bad]
+        chart.categoryAxis.categoryNames = list(summary)
+        chart.categoryAxis.style = "stacked"
+        chart.valueAxis.valueMin = 0
+        chart.bars[0].fillColor = colors.green
+        chart.bars[1].fillColor = colors.red
+        drawing.add(chart)
+        drawing.add(String(12, 40 + chart.height / 2, "Repetitions", fontName="Helvetica",
+                           fontSize=10, textAnchor="middle"))
+    renderPDF.draw(drawing, pdf, MARGIN, PAGE_HEIGHT - MARGIN - drawing.height)
+    pdf.showPage()
+
+
+def _angle_page(pdf: canvas.Canvas, exercise: str, series: AngleSeries):
+    drawing = _chart_drawing(f"{exercise.title()} Angle vs Frame")
+    points = [(float(x), float(y)) for x, y in zip(*series) if y is not None and not np.isnan(y)]
+    if points:
+        plot = LinePlot()
+        plot.x, plot.y = 60, 50
+        plot.width, plot.height = drawing.width - 90, drawing.height - 100
+        plot.data = [points]
+        plot.lines[0].strokeColor = colors.HexColor("#1f77b4")
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        # Pad degenerate ranges so a single logged rep still gets axes
+        plot.xValueAxis.valueMin, plot.xValueAxis.valueMax = min(xs) - 1, max(xs) + 1
+        plot.yValueAxis.valueMin, plot.yValueAxis.valueMax = min(ys) - 5, max(ys) + 5
+        drawing.add(plot)
+        drawing.add(String(60 + plot.width / 2, 14, "Frame Index", fontName="Helvetica",
+                           fontSize=10, textAnchor="middle"))
+        drawing.add(String(14, 50 + plot.height / 2, "Angle (degrees)", fontName="Helvetica",
+                           fontSize=10, textAnchor="middle"))
+    renderPDF.draw(drawing, pdf, MARGIN, PAGE_HEIGHT - MARGIN - drawing.height)
+    pdf.showPage()
+
+
+def _frame_page(pdf: canvas.Canvas, title: str, image: np.ndarray):
+    _title(pdf, title, size=13)
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    if ok:
+        height, width = image.shape[:2]
+        scale = min((PAGE_WIDTH - 2 * MARGIN) / width, (PAGE_HEIGHT - 2 * MARGIN - 40) / height)
+        w, h = width * scale, height * scale
+        pdf.drawImage(ImageReader(io.BytesIO(encoded.tobytes())), (PAGE_WIDTH - w) / 2,
+                      PAGE_HEIGHT - MARGIN - 30 - h, width=w, height=h)
+    pdf.showPage()
+
+
+def render_pdf(pdf_path: str, summary: Dict, angle_series: Dict[str, AngleSeries],
+               samples: List[Tuple[str, np.ndarray]]):
+    """Write the report to ``pdf_path``.
+
+    ``angle_series`` maps exercise to its angle plot and ``samples`` holds
+    ``(title, annotated BGR frame)`` pairs.
+    """
+    pdf = canvas.Canvas(pdf_path, pagesize=letter)
+    pdf.setTitle("Exercise Report")
+    _summary_page(pdf, summary)
+    _reps_page(pdf, summary)
+    for exercise, series in angle_series.items():
+        _angle_page(pdf, exercise, series)
+    for title, image in samples:
+        _frame_page(pdf, title, image)
+    pdf.save()
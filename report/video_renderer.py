@@ -0,0 +1,114 @@
+"""
+Annotated MP4 of an analyzed video, drawn from the stored keypoint track.
+
+The source frames are decoded and resized as during analysis, overlaid with
+the skeleton, each exercise's FSM angle and its rep counter, and streamed
+straight into ``cv2.VideoWriter``. No pose inference runs again and only
+the current frame is held in memory.
+"""
+
+import os
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+from analysis.video_exercise_analyzer import iter_video_frames
+from pose.keypoint_track import KeypointTrack
+from pose.pose_estimator import draw_skeleton
+from metrics.stages import VIDEO_RENDER_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Codec of the written MP4; "avc1" plays in browsers but needs an OpenCV
+# build with an H.264 encoder, which the pip wheels lack
+DEFAULT_FOURCC = "mp4v"
+FALLBACK_FPS = 30.0
+
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_GOOD = (80, 200, 80)
+_BAD = (60, 60, 230)
+_TEXT = (255, 255, 255)
+
+
+def rep_counts(frame_data: List[Dict], n_frames: int) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Per exercise, the reps completed so far and whether the latest was good, for every frame."""
+    rows: Dict[str, List[Tuple[int, bool]]] = {}
+    for row in sorted(frame_data, key=lambda r: r["frame_index"]):
+        if row["frame_index"] < n_frames:
+            rows.setdefault(row["exercise"], []).append((row["frame_index"], row["is_form_ok"]))
+    series = {}
+    for exercise, reps in rows.items():
+        indices = np.array([idx for idx, _ in reps], dtype=np.int64)
+        form_ok = np.array([ok for _, ok in reps], dtype=bool)
+        counts = np.cumsum(np.bincount(indices, minlength=n_frames)).astype(np.int32)
+        # Position of the latest rep completed at or before each frame
+        latest = np.searchsorted(indices, np.arange(n_frames), side="right") - 1
+        series[exercise] = (counts, np.where(latest >= 0, form_ok[latest.clip(0)], True))
+    return series
+
+
+def _overlay(frame: np.ndarray, lines: List[Tuple[str, Tuple[int, int, int]]]):
+    scale = max(0.4, frame.shape[0] / 900)
+    line_height = int(30 * scale) + 6
+    width = max(cv2.getTextSize(text, _FONT, scale, 1)[0][0] for text, _ in lines) + 16
+    # Darken the panel behind the text so it stays legible on any background
+    panel = frame[:line_height * len(lines) + 8, :width]
+    panel[:] = panel // 3
+    for n, (text, color) in enumerate(lines):
+        cv2.putText(frame, text, (8, line_height * (n + 1)), _FONT, scale, color, 1, cv2.LINE_AA)
+
+
+def render_annotated_video(video_path: str, output_path: str, track: KeypointTrack,
+                           angles: Dict[str, Tuple[str, np.ndarray]], frame_data: List[Dict],
+                           resize: Tuple[int, int] = (540, 480), fps: Optional[float] = None,
+                           fourcc: str = DEFAULT_FOURCC) -> int:
+    """Write ``output_path`` and return the number of frames written.
+
+    ``angles`` maps each exercise to the name and per-frame values of its FSM
+    angle (NaN without a pose) and ``frame_data`` holds the logged reps. The
+    file appears atomically once complete.
+    """
+    started = time.perf_counter()
+    n_frames = len(track)
+    counts = rep_counts(frame_data, n_frames)
+
+    partial = f"{os.path.splitext(output_path)[0]}.part.mp4"
+    written = 0
+    try:
+        writer = cv2.VideoWriter(partial, cv2.VideoWriter_fourcc(*fourcc), fps or FALLBACK_FPS, resize)
+        if not writer.isOpened():
+            raise RuntimeError(f"Cannot open a {fourcc} video writer for {output_path}")
+        try:
+            for idx, frame in enumerate(iter_video_frames(video_path, resize)):
+                keypoints = track.data[idx] if idx < n_frames else None
+                draw_skeleton(frame, keypoints)
+                lines = []
+                for exercise, (angle_name, values) in angles.items():
+                    angle = values[idx] if idx < len(values) else np.nan
+                    count, color = 0, _TEXT
+                    if exercise in counts and idx < n_frames:
+                        reps, form_ok = counts[exercise]
+                        count = int(reps[idx])
+                        if count:
+                            color = _GOOD if form_ok[idx] else _BAD
+                    shown = "--" if np.isnan(angle) else f"{angle:.0f} deg"
+                    lines.append((f"{exercise}s: {count}   {angle_name}: {shown}", color))
+                if lines:
+                    _overlay(frame, lines)
+                writer.write(frame)
+                written += 1
+        finally:
+            writer.release()
+        if written == 0:
+            raise RuntimeError(f"No frames decoded from {video_path}")
+        os.replace(partial, output_path)
+    finally:
+        # Only a complete render may leave a file behind
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    seconds = time.perf_counter() - started
+    VIDEO_RENDER_SECONDS.observe(seconds)
+    logger.info(f"Rendered annotated video {os.path.basename(output_path)} ({written} frames, {seconds:.1f}s)")
+    return written
@@ -0,0 +1,19 @@
+"""
+Shared test setup.
+
+The API keeps uploads, reports and the result cache under UPLOAD_FOLDER and
+REPORTS_FOLDER. Both point at a temporary directory before ``api.app`` is
+imported, so test runs leave nothing in the working tree.
+"""
+
+import os
+import shutil
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="exercise-analysis-tests-")
+os.environ["UPLOAD_FOLDER"] = os.path.join(_DATA_DIR, "uploads")
+os.environ["REPORTS_FOLDER"] = os.path.join(_DATA_DIR, "reports")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
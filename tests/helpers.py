@@ -0,0 +1,60 @@
+"""
+Shared test data: a synthetic keypoint track with squat and pushup reps, an
+estimator replaying it, and small generated videos.
+"""
+
+import cv2
+import numpy as np
+from pose.keypoint_track import KeypointTrack
+from pose.landmarks import (
+    empty_landmarks, LEFT_SHOULDER, LEFT_ELBOW, LEFT_WRIST, LEFT_HIP, LEFT_KNEE, LEFT_ANKLE
+)
+
+
+def _joint(center, angle_deg, length=0.2):
+    # Second limb endpoint forming ``angle_deg`` with a limb pointing straight up
+    theta = np.radians(angle_deg)
+    return center + length * np.array([np.sin(theta), -np.cos(theta)])
+
+
+def synthetic_track(n_frames=600, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_frames)
+    knee_angles = 118 + 60 * np.sin(t / 9.0) + rng.normal(0, 6, n_frames)
+    elbow_angles = 110 + 70 * np.cos(t / 13.0) + rng.normal(0, 6, n_frames)
+    track = KeypointTrack()
+    for i in range(n_frames):
+        if i % 37 == 5:
+            track.append(None)
+            continue
+        lm = empty_landmarks()
+        knee = np.array([0.5, 0.6])
+        lm[LEFT_KNEE, :2] = knee
+        lm[LEFT_HIP, :2] = knee + (0.0, -0.2)
+        lm[LEFT_ANKLE, :2] = _joint(knee, knee_angles[i]) + (rng.normal(0, 0.15), 0)
+        elbow = np.array([0.3, 0.4])
+        lm[LEFT_ELBOW, :2] = elbow
+        lm[LEFT_SHOULDER, :2] = elbow + (0.0, -0.2)
+        lm[LEFT_WRIST, :2] = _joint(elbow, elbow_angles[i])
+        lm[:, 2:] = (0.0, 1.0)
+        track.append(lm)
+    return track
+
+
+class TrackEstimator:
+    """Replays a track: ``extract_keypoints(idx)`` returns frame ``idx``."""
+    def __init__(self, track):
+        self.track = track
+
+    def extract_keypoints(self, idx):
+        return self.track[idx]
+
+
+def write_video(path, n_frames=12, size=(160, 120)):
+    """mp4v clip whose frame ``i`` is a flat gray of ``i * 10 % 255``."""
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30, size)
+    for i in range(n_frames):
+        frame = np.full((size[1], size[0], 3), i * 10 % 255, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+    return path
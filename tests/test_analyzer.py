@@ -1,5 +1,9 @@
+import numpy as np
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.batch import rep_completions
 from analysis.pushup_analyzer import PushupAnalyzer
 from analysis.squat_analyzer import SquatAnalyzer
+from tests.helpers import synthetic_track, TrackEstimator
 
 def test_pushup_fsm_transition():
     analyzer = PushupAnalyzer()
@@ -27,3 +31,24 @@ def test_squat_fsm_transition():
     _, angle, issues, count_it = analyzer.analyze(landmarks)
     assert isinstance(angle, float)
     assert isinstance(issues, list)
+
+def test_rep_completions_hysteresis():
+    angles = np.array([170, 95, 120, 99, np.nan, 150, 165, 170, 80, 161])
+    frames, final_down = rep_completions(angles, 100, 160)
+    assert frames.tolist() == [6, 9]
+    assert not final_down
+
+def test_batch_analysis_matches_streaming_fsm():
+    track = synthetic_track()
+
+    streaming = ExerciseAnalyzer()
+    expected = streaming.analyze_video(range(len(track)), TrackEstimator(track))
+
+    batch = ExerciseAnalyzer()
+    actual = batch.analyze_track(track)
+
+    assert expected["summary"]["squats"]["total_reps"] > 5
+    assert expected["summary"]["pushups"]["total_reps"] > 5
+    assert actual == expected
+    assert batch.squat.rep_count == streaming.squat.rep_count
+    assert batch.pushup.state == streaming.pushup.state
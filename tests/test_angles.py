@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from analysis import angles
+
+
+def _points(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-1, 1, (n, 3, 2)) * rng.choice([1e-4, 1.0, 1e4], (n, 1, 1))
+    points[::7] = np.round(points[::7], 1)
+    points[::11, 1] = points[::11, 0]  # zero-length segment
+    points[::13, 2, 0] = np.nan
+    return points
+
+
+def _same(x, y):
+    return x == y or (np.isnan(x) and np.isnan(y))
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_scalar_fast_path_is_bit_compatible():
+    for a, b, c in _points():
+        expected = angles._numpy_calculate_angle(a, b, c)
+        assert _same(angles.calculate_angle(a, b, c), expected)
+        assert _same(angles.calculate_angle(a.tolist(), b.tolist(), c.tolist()), expected)
+        assert _same(angles.joint_angle_2d(*a, *b, *c), expected)
+        assert _same(angles.angle_between_vectors(a - b, c - b),
+                     angles._numpy_angle_between_vectors(a - b, c - b))
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+def test_batched_kernels_match_scalar():
+    points = _points(2000)
+    expected = np.array([angles._numpy_calculate_angle(a, b, c) for a, b, c in points])
+    assert np.array_equal(angles.calculate_angles(points[:, 0], points[:, 1], points[:, 2]),
+                          expected, equal_nan=True)
+
+    keypoints = points.reshape(200, 30, 2)
+    triplets = [(0, 1, 2), (3, 4, 5), (29, 10, 7)]
+    result = angles.joint_angles(keypoints, triplets)
+    assert result.shape == (200, 3)
+    for n, frame in enumerate(keypoints):
+        for m, (i, j, k) in enumerate(triplets):
+            assert _same(result[n, m], angles.calculate_angle(frame[i], frame[j], frame[k]))
+
+
+def test_other_inputs_keep_numpy_semantics():
+    a32, b32, c32 = (np.array(p, dtype=np.float32) for p in ([0.1, 0.7], [0.3, 0.2], [0.9, 0.4]))
+    assert angles.calculate_angle(a32, b32, c32) == angles._numpy_calculate_angle(a32, b32, c32)
+    assert angles.calculate_angle([0, 1], [0, 0], [1, 0]) == pytest.approx(90.0, abs=1e-4)
+    a3, b3, c3 = [0.0, 1.0, 0.0], [0.0, 0.0, 0.0], [0.0, 0.0, 1.0]
+    assert angles.calculate_angle(a3, b3, c3) == angles._numpy_calculate_angle(a3, b3, c3)
+
+
+def test_dot_kernels():
+    # fma(uy, vy, ux * vx) keeps the 2**-60 that a plain sum rounds away
+    probe = (-(1 + 2.0 ** -29), 1 + 2.0 ** -30, 1.0, 1 + 2.0 ** -30)
+    assert angles._fused_dot2(*probe) == 2.0 ** -60
+    assert angles._plain_dot2(*probe) == 0.0
+    if angles._dot2 is not None:
+        assert angles._dot2(*probe) == float(np.dot(probe[:2], probe[2:]))
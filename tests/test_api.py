@@ -1,17 +1,28 @@
 import os
+import json
+import numpy as np
 import io
 import pytest
+import api.app as app_module
 from api.app import app
+from api.result_cache import ResultCache
+from tests.helpers import write_video
 
 @pytest.fixture
-def client():
+def client(tmp_path, monkeypatch):
+    # Every test gets its own folders and an empty result cache
+    uploads, reports = tmp_path / "uploads", tmp_path / "reports"
+    uploads.mkdir()
+    monkeypatch.setattr(app_module, "UPLOAD_FOLDER", str(uploads))
+    monkeypatch.setattr(app_module, "REPORT_FOLDER", str(reports))
+    monkeypatch.setattr(app_module, "result_cache", ResultCache(str(reports)))
     app.config['TESTING'] = True
     with app.test_client() as client:
         yield client
 
-def test_analyze_endpoint_success(client):
-    test_video_path = "demo/1.mp4"
-    assert os.path.exists(test_video_path), "Missing test video."
+def test_analyze_endpoint_success(client, tmp_path):
+    from benchmarks.synthetic import make_squat_video
+    test_video_path = make_squat_video(str(tmp_path / "1.mp4"), seconds=2.0)
 
     with open(test_video_path, 'rb') as video_file:
         data = {
@@ -27,7 +38,264 @@ def test_analyze_endpoint_success(client):
     assert isinstance(json_data["summary"], dict)
     assert isinstance(json_data["frame_data"], list)
 
+def test_analyze_with_preset_reports_throughput(client, tmp_path):
+    video_path = write_video(tmp_path / "clip.mp4", n_frames=10)
+    with open(video_path, 'rb') as f:
+        data = f.read()
+
+    response = client.post('/analyze?preset=turbo', content_type='multipart/form-data',
+                           data={'video': (io.BytesIO(data), 'clip.mp4')})
+    assert response.status_code == 400
+
+    response = client.post('/analyze', content_type='multipart/form-data',
+                           data={'video': (io.BytesIO(data), 'clip.mp4'), 'preset': 'balanced'})
+    assert response.status_code == 200
+    throughput = response.get_json()["throughput"]
+    assert throughput["preset"] == "balanced"
+    assert throughput["frames"] == 10
+    assert throughput["resolution"] == [160, 120]
+    assert throughput["frames_per_second"] > 0
+
+def test_analyze_batch_streams_clips_and_session_summary(client, tmp_path):
+    import zipfile
+    from benchmarks.synthetic import make_squat_video
+    squat = open(make_squat_video(str(tmp_path / "squat.mp4"), seconds=2.0), 'rb').read()
+    noise = open(write_video(tmp_path / "noise.mp4", n_frames=10), 'rb').read()
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr("session/noise.mp4", noise)
+        zf.writestr("session/readme.txt", "ignored")
+
+    response = client.post('/analyze/batch?frames=none', content_type='multipart/form-data', data={
+        'videos': [(io.BytesIO(squat), 'squat.mp4'), (io.BytesIO(archive.getvalue()), 'session.zip')]
+    })
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    clips = {e["clip"]: e for e in events if e["type"] == "clip"}
+    assert set(clips) == {"squat.mp4", "session/noise.mp4"}
+    assert all(e["status"] == "done" and "frame_data" not in e["result"] for e in clips.values())
+    summary = events[-1]
+    assert summary["type"] == "summary" and summary["succeeded"] == 2
+    assert summary["summary"]["squats"]["total_reps"] == sum(
+        e["result"]["summary"]["squats"]["total_reps"] for e in clips.values())
+
+    response = client.post('/analyze/batch', content_type='multipart/form-data',
+                           data={'videos': (io.BytesIO(b"x"), 'notes.txt')})
+    assert response.status_code == 400
+
 def test_analyze_endpoint_no_file(client):
     response = client.post('/analyze')
     assert response.status_code == 400
     assert "error" in response.get_json()
+
+def test_analyze_async_job(client, tmp_path):
+    import time
+    video_path = write_video(tmp_path / "clip.mp4", n_frames=10)
+    with open(video_path, 'rb') as f:
+        response = client.post('/analyze?mode=async', content_type='multipart/form-data',
+                               data={'video': (io.BytesIO(f.read()), 'clip.mp4')})
+
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+    assert response.headers["Location"] == f"/jobs/{job_id}"
+
+    deadline = time.time() + 60
+    while True:
+        status = client.get(f'/jobs/{job_id}').get_json()
+        if status["status"] in ("done", "failed") or time.time() > deadline:
+            break
+        time.sleep(0.1)
+
+    assert status["status"] == "done"
+    assert status["progress"]["frames_processed"] == 10
+    assert status["result"]["video_id"] == job_id
+    assert "summary" in status["result"]
+
+def test_first_request_starts_estimator_warmup(client, monkeypatch):
+    import threading
+
+    class _Pool:
+        warmed = threading.Event()
+
+        def warm_up(self):
+            self.warmed.set()
+
+    monkeypatch.setattr(app_module, "estimator_pools", {app_module.DEFAULT_PRESET: _Pool()})
+    monkeypatch.setattr(app_module, "_warmup_thread", None)
+    monkeypatch.setattr(app_module, "ESTIMATOR_WARMUP", True)
+    assert client.get('/health').status_code == 200
+    assert _Pool.warmed.wait(5)
+    thread = app_module._warmup_thread
+    client.get('/health')
+    assert app_module._warmup_thread is thread
+
+def test_unknown_job(client):
+    assert client.get('/jobs/does-not-exist').status_code == 404
+
+def test_repeated_upload_is_served_from_cache(client, tmp_path):
+    video_path = write_video(tmp_path / "clip.mp4", n_frames=5)
+    with open(video_path, 'rb') as f:
+        content = f.read()
+
+    first = client.post('/analyze', content_type='multipart/form-data',
+                        data={'video': (io.BytesIO(content), 'clip.mp4')})
+    second = client.post('/analyze', content_type='multipart/form-data',
+                         data={'video': (io.BytesIO(content), 'retry.mp4')})
+
+    assert first.status_code == 200 and second.status_code == 200
+    assert second.get_json()["cached"] is True
+    assert second.get_json()["video_id"] == first.get_json()["video_id"]
+    assert client.get('/cache/stats').get_json()["hits"] >= 1
+
+def test_report_download_is_conditional(client, tmp_path):
+    video_path = write_video(tmp_path / "clip.mp4", n_frames=5)
+    with open(video_path, 'rb') as f:
+        response = client.post('/analyze', content_type='multipart/form-data',
+                               data={'video': (io.BytesIO(f.read()), 'clip.mp4')})
+    assert response.status_code == 200
+    pdf_url = response.get_json()["pdf_url"]
+
+    # The PDF renders in the background; the download waits for it
+    first = client.get(pdf_url)
+    assert first.status_code == 200
+    assert first.data.startswith(b"%PDF")
+    etag = first.headers["ETag"]
+
+    second = client.get(pdf_url, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+
+
+def test_annotated_video_supports_range_requests(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(app_module, "ANNOTATED_VIDEO", True)
+    video_path = write_video(tmp_path / "clip.mp4", n_frames=5)
+    with open(video_path, 'rb') as f:
+        response = client.post('/analyze', content_type='multipart/form-data',
+                               data={'video': (io.BytesIO(f.read()), 'clip.mp4')})
+    assert response.status_code == 200
+    video_url = response.get_json()["video_url"]
+
+    full = client.get(video_url)
+    assert full.status_code == 200
+    assert full.mimetype == "video/mp4"
+    assert full.headers["Accept-Ranges"] == "bytes"
+
+    partial = client.get(video_url, headers={"Range": "bytes=100-199"})
+    assert partial.status_code == 206
+    assert partial.headers["Content-Range"] == f"bytes 100-199/{len(full.data)}"
+    assert partial.data == full.data[100:200]
+
+    assert client.get("/video/no-such-video").status_code == 404
+
+def test_frames_range_endpoint(client):
+    import gzip
+    from api.app import REPORT_FOLDER
+    from api.responses import save_frames
+    rows = [{"frame_index": i * 10, "exercise": "squat", "rep_id": i + 1, "is_form_ok": True,
+             "angles": {"knee": 90.0 + i}, "issues": []} for i in range(300)]
+    video_id = "test-frames-range"
+    save_frames(REPORT_FOLDER, video_id, rows)
+
+    response = client.get(f'/analysis/{video_id}/frames?start=100&end=150')
+    assert response.status_code == 200
+    assert response.get_json()["frame_data"] == rows[10:15]
+
+    columns = client.get(f'/analysis/{video_id}/frames?format=columns&end=30').get_json()
+    assert columns["frame_data"]["angles"]["knee"] == [90.0, 91.0, 92.0]
+
+    compressed = client.get(f'/analysis/{video_id}/frames', headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(compressed.data))["frame_data"]) == 300
+
+    assert client.get(f'/analysis/{video_id}/frames?start=x').status_code == 400
+    assert client.get('/analysis/missing/frames').status_code == 404
+
+def test_analyze_summary_only(client, tmp_path):
+    video_path = write_video(tmp_path / "clip.mp4", n_frames=5)
+    with open(video_path, 'rb') as f:
+        response = client.post('/analyze?frames=none', content_type='multipart/form-data',
+                               data={'video': (io.BytesIO(f.read()), 'clip.mp4')})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert "frame_data" not in data
+    assert client.get(data["frames_url"]).get_json()["frame_data"] == []
+
+def test_track_slices_and_reanalysis(client):
+    from api.app import REPORT_FOLDER
+    from analysis.analyzer import ExerciseAnalyzer
+    from analysis.track_store import save_track, keypoints_path, angles_path
+    from tests.helpers import synthetic_track
+    track = synthetic_track(120)
+    video_id = "test-stored-track"
+    save_track(REPORT_FOLDER, video_id, track, ExerciseAnalyzer().angle_series(track))
+    try:
+        data = client.get(f'/analysis/{video_id}/track?start=4&end=8').get_json()
+        assert data["frames"] == 4 and data["total_frames"] == 120
+        assert data["keypoints"][1][0] == [None] * 4  # frame 5 has no pose
+        assert len(data["angles"]["squat_knee"]) == 4
+
+        csv = client.get(f'/analysis/{video_id}/track?format=csv&start=4&end=8')
+        assert csv.mimetype == "text/csv"
+        lines = csv.get_data(as_text=True).splitlines()
+        assert len(lines) == 1 + 3 * 33  # frame 5 has no pose
+        assert lines[1].startswith("4,NOSE,")
+
+        npz = client.get(f'/analysis/{video_id}/track?format=npz&end=10')
+        arrays = np.load(io.BytesIO(npz.data))
+        np.testing.assert_array_equal(arrays["keypoints"], track.data[:10])
+
+        response = client.post(f'/analysis/{video_id}/reanalyze',
+                               json={"squat": {"down_angle": 80, "up_angle": 150}})
+        assert response.status_code == 200
+        expected = ExerciseAnalyzer({"squat": {"down_angle": 80, "up_angle": 150}}).analyze_track(track)
+        assert response.get_json()["summary"] == expected["summary"]
+
+        assert client.post(f'/analysis/{video_id}/reanalyze',
+                           json={"squat": {"down_angle": 170, "up_angle": 150}}).status_code == 400
+        assert client.post('/analysis/missing/reanalyze', json={}).status_code == 404
+    finally:
+        os.remove(keypoints_path(REPORT_FOLDER, video_id))
+        os.remove(angles_path(REPORT_FOLDER, video_id))
+
+def test_live_session_flow(client):
+    import struct
+    import cv2
+    person = cv2.imread("squat.png")
+    _, jpeg = cv2.imencode(".jpg", cv2.resize(person, (270, 240)))
+    jpeg = jpeg.tobytes()
+
+    created = client.post('/live/sessions', json={"target_latency_ms": 60000})
+    assert created.status_code == 201
+    session = created.get_json()
+
+    single = client.post(session["frames_url"], data=jpeg, content_type='image/jpeg')
+    assert single.status_code == 202
+    stream = b"".join(struct.pack(">I", len(jpeg)) + jpeg for _ in range(3))
+    assert client.post(session["frames_url"], data=stream,
+                       content_type='application/octet-stream').get_json()["frames_received"] == 4
+
+    closed = client.delete(f'/live/sessions/{session["session_id"]}').get_json()
+    assert closed["status"] == "closed"
+    assert closed["frames_processed"] == 4
+    assert client.get(f'/live/sessions/{session["session_id"]}').status_code == 404
+    assert client.post('/live/sessions', json={"target_latency_ms": -1}).status_code == 400
+
+def test_metrics_endpoint(client, tmp_path):
+    from metrics import stages
+    frames_before = stages.FRAMES_PROCESSED.value()
+    video_path = write_video(tmp_path / "clip.mp4", n_frames=6)
+    with open(video_path, 'rb') as f:
+        assert client.post('/analyze?frames=none', content_type='multipart/form-data',
+                           data={'video': (io.BytesIO(f.read()), 'clip.mp4')}).status_code == 200
+    assert stages.FRAMES_PROCESSED.value() > frames_before
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    for name in ("upload_size_bytes_count", "video_decode_seconds_count", "pose_inference_seconds_bucket",
+                 "analysis_seconds_sum", "frames_processed_total", "frames_without_landmarks_total",
+                 "http_requests_in_flight", "job_queue_depth", "process_resident_memory_bytes"):
+        assert name in text
+    assert 'http_request_duration_seconds_count{endpoint="analyze_video",method="POST",status="200"}' in text
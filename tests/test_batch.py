@@ -0,0 +1,94 @@
+import io
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from api.batch import BatchError, merge_summaries, run_batch, save_clips
+
+class Upload:
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.stream = io.BytesIO(data)
+
+def allowed(name):
+    return name.lower().endswith(('.mp4', '.mov'))
+
+def zipped(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+def test_save_clips_from_files_and_archives(tmp_path):
+    archive = zipped({"day1/a.mp4": b"aaa", "day1/notes.txt": b"x", "__MACOSX/day1/._a.mp4": b"", "b.MOV": b"bb"})
+    clips = save_clips([Upload("c.mp4", b"c"), Upload("session.zip", archive)], str(tmp_path), allowed)
+
+    assert [clip.name for clip in clips] == ["c.mp4", "day1/a.mp4", "b.MOV"]
+    assert [clip.index for clip in clips] == [0, 1, 2]
+    assert open(clips[1].path, 'rb').read() == b"aaa"
+    assert os.path.dirname(clips[1].path) == str(tmp_path)
+    assert len({clip.content_hash for clip in clips}) == 3
+
+@pytest.mark.parametrize("uploads, limits", [
+    ([Upload("a.avi2", b"x")], {}),
+    ([Upload("a.zip", b"not a zip")], {}),
+    ([Upload("a.zip", zipped({"notes.txt": b"x"}))], {}),
+    ([Upload("a.mp4", b"x"), Upload("b.mp4", b"y")], {"max_clips": 1}),
+    ([Upload("a.mp4", b"x" * 10), Upload("b.mp4", b"y" * 10)], {"max_bytes": 15}),
+])
+def test_rejected_batches_leave_no_files(tmp_path, uploads, limits):
+    with pytest.raises(BatchError):
+        save_clips(uploads, str(tmp_path), allowed, **limits)
+    assert os.listdir(tmp_path) == []
+
+def test_merge_summaries():
+    block = {"total_reps": 2, "good_form_reps": 1, "common_issues": ["INSUFFICIENT_DEPTH"]}
+    empty = {"total_reps": 0, "good_form_reps": 0, "common_issues": []}
+    merged = merge_summaries([{"squats": block, "pushups": empty}, {"squats": block, "pushups": block}])
+    assert merged["squats"] == {"total_reps": 4, "good_form_reps": 2,
+                                "common_issues": ["INSUFFICIENT_DEPTH", "INSUFFICIENT_DEPTH"]}
+    assert merged["pushups"]["total_reps"] == 2
+
+def _clips(tmp_path, n):
+    return save_clips([Upload(f"{i}.mp4", bytes([i])) for i in range(n)], str(tmp_path), allowed)
+
+def test_run_batch_streams_results_then_summary(tmp_path):
+    clips = _clips(tmp_path, 4)
+
+    def analyze(clip):
+        if clip.index == 2:
+            raise RuntimeError("corrupt clip")
+        os.remove(clip.path)
+        reps = {"total_reps": clip.index, "good_form_reps": 0, "common_issues": []}
+        return {"summary": {"squats": reps}, "frame_data": [1], "throughput": {"frames": 10}}
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        events = list(run_batch(clips, analyze, executor, include_frames=False))
+
+    assert [e["type"] for e in events] == ["clip"] * 4 + ["summary"]
+    by_index = {e["index"]: e for e in events[:4]}
+    assert by_index[2] == {"type": "clip", "index": 2, "clip": "2.mp4", "status": "failed", "error": "corrupt clip"}
+    assert "frame_data" not in by_index[3]["result"]
+    summary = events[-1]
+    assert (summary["clips"], summary["succeeded"], summary["failed"]) == (4, 3, 1)
+    assert summary["summary"]["squats"]["total_reps"] == 0 + 1 + 3
+    assert summary["throughput"]["frames"] == 30
+
+def test_stopping_early_cancels_pending_clips(tmp_path):
+    clips = _clips(tmp_path, 5)
+    release = threading.Event()
+
+    def analyze(clip):
+        release.wait(5)
+        os.remove(clip.path)
+        return {"summary": {}}
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        events = run_batch(clips, analyze, executor)
+        release.set()
+        next(events)
+        events.close()
+    # Clips that never started were cancelled and their uploads removed
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,15 @@
+from benchmarks.bench_stages import compare
+
+def _result(**seconds):
+    return {"results": {"540x480@30fps/2s": {"stages": {k: {"seconds": v} for k, v in seconds.items()}}}}
+
+def test_compare_flags_slower_stages_only():
+    baseline = _result(decode=0.10, pose=1.00, fsm=0.001)
+    current = _result(decode=0.15, pose=1.05, fsm=0.003)
+    regressions = compare(current, baseline, tolerance=0.2)
+    # decode is 50% slower; pose is within tolerance; fsm is below the noise floor
+    assert len(regressions) == 1
+    assert regressions[0].startswith("540x480@30fps/2s decode")
+
+def test_compare_skips_configs_without_baseline():
+    assert compare(_result(decode=1.0), {"results": {}}, tolerance=0.2) == []
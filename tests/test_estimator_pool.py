@@ -0,0 +1,49 @@
+import time
+import pytest
+from pose.estimator_pool import EstimatorPool
+
+class FakeEstimator:
+    created = 0
+
+    def __init__(self):
+        FakeEstimator.created += 1
+        self.prev_keypoints = None
+        self.resets = 0
+
+    def reset(self):
+        self.prev_keypoints = None
+        self.resets += 1
+
+    def warm_up(self):
+        self.prev_keypoints = None
+
+    def extract_keypoints(self, frame):
+        return None
+
+def _wait_idle(pool, n):
+    deadline = time.time() + 2
+    while pool.idle < n and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_pool_reuses_and_resets_estimators():
+    FakeEstimator.created = 0
+    pool = EstimatorPool(size=1, factory=FakeEstimator)
+    pool.warm_up()
+    assert FakeEstimator.created == 1
+
+    with pool.checkout() as estimator:
+        estimator.prev_keypoints = "user A smoothing state"
+    _wait_idle(pool, 1)
+
+    with pool.checkout() as again:
+        assert again is estimator
+        assert again.prev_keypoints is None
+        assert again.resets == 1
+    assert FakeEstimator.created == 1
+
+def test_pool_blocks_when_exhausted():
+    pool = EstimatorPool(size=1, factory=FakeEstimator)
+    with pool.checkout():
+        with pytest.raises(TimeoutError):
+            with pool.checkout(timeout=0.05):
+                pass
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.angles import calculate_angle, angle_between_vectors
+from analysis.exercises import EXERCISES, register_exercise
+from analysis.features import FEATURES, FeatureSet, define_feature, JOINT_ANGLE, VECTOR
+from analysis.squat_analyzer import SquatAnalyzer
+from pose.landmarks import LEFT_HIP, LEFT_KNEE, LEFT_ANKLE, LEFT_SHOULDER
+from tests.helpers import synthetic_track, TrackEstimator
+
+
+def test_extract_matches_series_and_scalar_angles():
+    track = synthetic_track(200)
+    features = FeatureSet(["left_knee_angle", "left_elbow_angle", "left_body_line", "left_shin"])
+    series = features.extract_series(track.data)
+    for idx in range(len(track)):
+        frame = features.extract(track.data[idx])
+        for name in features.names:
+            np.testing.assert_array_equal(frame[name], series[name][idx])
+
+        points = track.data[idx, [LEFT_HIP, LEFT_KNEE, LEFT_ANKLE, LEFT_SHOULDER], :2].astype(np.float64)
+        if np.isnan(points).any():
+            assert np.isnan(frame["left_knee_angle"])
+            continue
+        hip, knee, ankle, shoulder = points
+        assert frame["left_knee_angle"] == calculate_angle(hip, knee, ankle)
+        assert frame["left_body_line"] == angle_between_vectors(hip - shoulder, ankle - hip)
+        np.testing.assert_array_equal(frame["left_shin"], ankle - knee)
+
+
+def test_feature_definitions_are_checked():
+    define_feature("left_knee_angle", JOINT_ANGLE, FEATURES["left_knee_angle"].joints)  # identical: no-op
+    with pytest.raises(ValueError):
+        define_feature("left_knee_angle", JOINT_ANGLE, (LEFT_SHOULDER, LEFT_KNEE, LEFT_ANKLE))
+    with pytest.raises(ValueError):
+        define_feature("bad_vector", VECTOR, (LEFT_HIP, LEFT_KNEE, LEFT_ANKLE))
+    with pytest.raises(KeyError):
+        FeatureSet(["no_such_feature"])
+
+
+def test_registered_exercise_is_analyzed():
+    class DeepSquatAnalyzer(SquatAnalyzer):
+        DOWN_ANGLE = 80
+        ANGLE_NAME = "deep_knee"
+
+    register_exercise("deep_squat", DeepSquatAnalyzer)
+    try:
+        with pytest.raises(ValueError):
+            register_exercise("deep_squat", SquatAnalyzer)
+        track = synthetic_track(600)
+        streaming = ExerciseAnalyzer()
+        streaming.analyze_video(range(len(track)), TrackEstimator(track))
+        batch = ExerciseAnalyzer().analyze_track(track)
+
+        # Features shared with the squat are not extracted twice
+        assert len(streaming.features.names) == 4
+        assert streaming.results == batch
+        assert batch["summary"]["deep_squats"]["total_reps"] == streaming.deep_squat.rep_count
+        assert "squat_knee" in streaming.angle_series() and "deep_squat_deep_knee" in streaming.angle_series()
+    finally:
+        del EXERCISES["deep_squat"]
+
@@ -0,0 +1,51 @@
+import threading
+import time
+import pytest
+from api.jobs import JobManager, JobQueueFull, Job, DONE, FAILED
+
+def _wait(job, timeout=5):
+    deadline = time.time() + timeout
+    while job.status not in (DONE, FAILED) and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+def test_job_reports_progress_and_result():
+    manager = JobManager(max_workers=1)
+
+    def work(job):
+        for i in range(1, 4):
+            job.update_progress(i)
+        return {"ok": True}
+
+    job = _wait(manager.submit(work, Job(total_frames=3)))
+    data = job.to_dict()
+    assert data["status"] == DONE
+    assert data["result"] == {"ok": True}
+    assert data["progress"] == {"frames_processed": 3, "total_frames": 3, "percent": 100.0}
+    manager.shutdown()
+
+def test_failed_job_keeps_error():
+    manager = JobManager(max_workers=1)
+
+    def work(job):
+        raise ValueError("bad video")
+
+    job = _wait(manager.submit(work))
+    assert job.to_dict()["error"] == "bad video"
+    manager.shutdown()
+
+def test_queue_limit():
+    manager = JobManager(max_workers=1, max_pending=1)
+    running, release = threading.Event(), threading.Event()
+
+    def block(job):
+        running.set()
+        release.wait()
+
+    manager.submit(block)
+    assert running.wait(5)  # first job is running, not queued
+    manager.submit(lambda job: None)
+    with pytest.raises(JobQueueFull):
+        manager.submit(lambda job: None)
+    release.set()
+    manager.shutdown()
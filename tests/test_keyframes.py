@@ -0,0 +1,43 @@
+import numpy as np
+from analysis.keyframes import rep_bottoms, select_keyframes
+
+
+def _rep(idx, rep_id, exercise="squat", issues=()):
+    return {"frame_index": idx, "exercise": exercise, "rep_id": rep_id,
+            "is_form_ok": not issues, "issues": list(issues)}
+
+
+def test_rep_bottoms_use_lowest_angle_since_previous_rep():
+    knee = np.array([170, 120, 90, 100, 165, 150, np.nan, 80, 85, 170], dtype=float)
+    frame_data = [_rep(4, 1), _rep(9, 2), _rep(9, 1, exercise="pushup")]
+    bottoms = rep_bottoms(frame_data, {"squat": knee})
+    assert [(k.exercise, k.frame_index) for k in bottoms] == [("squat", 2), ("squat", 7), ("pushup", 9)]
+
+
+def test_select_keyframes_spreads_reps_and_keeps_shallowest_rep():
+    bottoms = [90.0] * 10
+    bottoms[4] = 120.0  # rep 5 barely goes down
+    angles = {"squat": np.array([a for bottom in bottoms for a in (170.0, bottom, 170.0)])}
+    # Every squat rep is logged with INSUFFICIENT_DEPTH; rep 9 also with KNEE_OVER_TOE
+    frame_data = [_rep(3 * n + 2, n + 1, issues=["INSUFFICIENT_DEPTH"] + ["KNEE_OVER_TOE"] * (n == 8))
+                  for n in range(10)]
+    chosen = select_keyframes(frame_data, angles, max_frames=4)
+    assert [k.rep_id for k in chosen] == [1, 5, 7, 10]  # rep 5 replaces its nearest even pick, rep 4
+    assert [k.frame_index for k in chosen] == [1, 13, 19, 28]
+    assert [k.worst_form for k in chosen] == [False, True, False, False]
+    assert chosen[0].title == "Squat Rep 1 - bottom, frame 1, 90 deg"
+    assert chosen[1].title == "Squat Rep 5 - bottom, frame 13, 120 deg - worst form: INSUFFICIENT_DEPTH"
+    # Deterministic
+    assert [k.frame_index for k in select_keyframes(frame_data, angles)] == [1, 13, 19, 28]
+
+
+def test_select_keyframes_without_angles_ranks_by_issues():
+    frame_data = [_rep(3 * n + 2, n + 1, issues=["INSUFFICIENT_DEPTH"] + ["KNEE_OVER_TOE"] * (n == 8))
+                  for n in range(10)]
+    chosen = select_keyframes(frame_data, max_frames=4)
+    assert [k.rep_id for k in chosen] == [1, 4, 7, 9]  # rep 9 replaces rep 10
+    assert [k.frame_index for k in chosen] == [2, 11, 20, 26]  # logged frames
+    assert [k.worst_form for k in chosen] == [False, False, False, True]
+    assert [k.frame_index for k in select_keyframes(frame_data[:2])] == [2, 5]
+    assert not any(k.worst_form for k in select_keyframes([_rep(2, 1), _rep(5, 2)]))
+    assert select_keyframes([]) == []
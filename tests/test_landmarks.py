@@ -0,0 +1,39 @@
+import numpy as np
+from pose.landmarks import (
+    Landmarks, LANDMARK_NAMES, LEFT_HIP, as_array, ema_update, empty_landmarks
+)
+from pose.keypoint_track import KeypointTrack
+
+def test_landmark_names_match_mediapipe():
+    from mediapipe.python.solutions.pose import PoseLandmark
+    assert LANDMARK_NAMES == tuple(p.name for p in PoseLandmark)
+
+def test_landmarks_dict_view():
+    lm = Landmarks.from_dict({"LEFT_HIP": {"x": 0.25, "y": 0.5, "z": 0.0, "visibility": 0.9}})
+    assert len(lm) == 1
+    assert list(lm) == ["LEFT_HIP"]
+    assert lm["LEFT_HIP"]["x"] == 0.25
+    assert "LEFT_KNEE" not in lm
+    assert as_array(lm)[LEFT_HIP, 1] == 0.5
+
+def test_ema_update_is_vectorized_over_all_landmarks():
+    prev = np.zeros((33, 4), dtype=np.float32)
+    current = np.ones((33, 4), dtype=np.float32)
+    smoothed = ema_update(prev, current, 0.25)
+    assert np.allclose(smoothed[:, :3], 0.25)
+    assert np.allclose(smoothed[:, 3], 1.0)
+
+def test_keypoint_track_grows_and_marks_missing_frames():
+    track = KeypointTrack(capacity=1)
+    frame = empty_landmarks()
+    frame[LEFT_HIP] = (0.5, 0.5, 0.0, 1.0)
+    track.append(frame)
+    track.append(None)
+    track.append(Landmarks(frame))
+
+    assert len(track) == 3
+    assert track.data.shape == (3, 33, 4)
+    assert track[1] is None
+    assert track[2]["LEFT_HIP"]["y"] == 0.5
+    assert track.detected.tolist() == [True, False, True]
+    assert len(track.to_columns()["frame_index"]) == 2 * 33
@@ -0,0 +1,86 @@
+import io
+import struct
+import time
+import cv2
+import numpy as np
+import pytest
+from analysis.analyzer import ExerciseAnalyzer
+from api.live import LiveSessionManager, SessionLimitReached, FrameStreamError, read_length_prefixed
+from tests.helpers import synthetic_track
+
+_, JPEG = cv2.imencode(".jpg", np.zeros((48, 64, 3), dtype=np.uint8))
+JPEG = JPEG.tobytes()
+
+class _TrackEstimator:
+    """Returns the landmarks of a synthetic track, one frame per call."""
+    def __init__(self, track, delay=0.0):
+        self.frames = iter(track)
+        self.delay = delay
+        self.closed = False
+
+    def extract_keypoints(self, frame):
+        time.sleep(self.delay)
+        return next(self.frames, None)
+
+    def close(self):
+        self.closed = True
+
+def test_live_events_match_batch_analysis():
+    track = synthetic_track(300)
+    estimators = []
+    manager = LiveSessionManager(lambda: estimators.append(_TrackEstimator(track)) or estimators[-1],
+                                 default_latency_ms=60_000, max_pending=1000)
+    session = manager.create()
+    for _ in range(len(track)):
+        session.submit(JPEG)
+    manager.close(session.id)
+
+    events = list(session.events())
+    expected = ExerciseAnalyzer().analyze_track(track)["frame_data"]
+    assert [(e["exercise"], e["frame_index"], e["rep_id"], e["issues"]) for e in events] == \
+        [(r["exercise"], r["frame_index"], r["rep_id"], r["issues"]) for r in expected]
+    stats = session.to_dict()
+    assert stats["frames_processed"] == 300 and stats["frames_dropped"] == 0
+    assert estimators[0].closed
+
+def test_events_resume_after_last_seen_seq():
+    manager = LiveSessionManager(lambda: _TrackEstimator(synthetic_track(300)),
+                                 default_latency_ms=60_000, max_pending=1000)
+    session = manager.create()
+    for _ in range(300):
+        session.submit(JPEG)
+    manager.close(session.id)
+
+    events = list(session.events())
+    assert [e["seq"] for e in events] == list(range(len(events))) and len(events) > 2
+    assert list(session.events(after=events[1]["seq"])) == events[2:]
+    assert list(session.events(after=events[-1]["seq"])) == []
+    assert list(session.events(after=-5)) == events
+
+def test_frames_are_dropped_to_meet_latency_target():
+    manager = LiveSessionManager(lambda: _TrackEstimator(synthetic_track(100), delay=0.02))
+    session = manager.create(target_latency_ms=30)
+    for _ in range(100):
+        session.submit(JPEG)
+    manager.close(session.id)
+    stats = session.to_dict()
+    assert stats["frames_dropped"] > 0
+    assert stats["frames_processed"] + stats["frames_dropped"] == 100
+
+def test_session_limit_and_idle_eviction():
+    manager = LiveSessionManager(lambda: _TrackEstimator(synthetic_track(10)), max_sessions=1, idle_timeout=0.2)
+    session = manager.create()
+    with pytest.raises(SessionLimitReached):
+        manager.create()
+    deadline = time.time() + 5
+    while manager.get(session.id) is not None and time.time() < deadline:
+        time.sleep(0.05)
+    assert manager.get(session.id) is None
+    assert session.status == "closed"
+    manager.create()
+
+def test_read_length_prefixed():
+    stream = io.BytesIO(struct.pack(">I", 3) + b"abc" + struct.pack(">I", 1) + b"d")
+    assert list(read_length_prefixed(stream)) == [b"abc", b"d"]
+    with pytest.raises(FrameStreamError):
+        list(read_length_prefixed(io.BytesIO(struct.pack(">I", 5) + b"abc")))
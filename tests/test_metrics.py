@@ -0,0 +1,39 @@
+import pytest
+from metrics.registry import Registry
+
+def test_exposition_format():
+    registry = Registry()
+    frames = registry.counter("frames_processed", "Frames run through pose inference")
+    depth = registry.gauge("queue_depth", "Pending jobs", function=lambda: 3)
+    latency = registry.histogram("render_seconds", "Render time", labelnames=("renderer",), buckets=(0.1, 1.0))
+
+    frames.inc()
+    frames.inc(2)
+    latency.observe(0.05, renderer="reportlab")
+    latency.observe(0.5, renderer="reportlab")
+    latency.observe(5.0, renderer="reportlab")
+
+    text = registry.expose()
+    assert "# TYPE frames_processed_total counter\nframes_processed_total 3\n" in text
+    assert "queue_depth 3\n" in text
+    assert 'render_seconds_bucket{renderer="reportlab",le="0.1"} 1\n' in text
+    assert 'render_seconds_bucket{renderer="reportlab",le="1"} 2\n' in text
+    assert 'render_seconds_bucket{renderer="reportlab",le="+Inf"} 3\n' in text
+    assert 'render_seconds_sum{renderer="reportlab"} 5.55\n' in text
+    assert 'render_seconds_count{renderer="reportlab"} 3\n' in text
+
+def test_labels_are_checked():
+    registry = Registry()
+    latency = registry.histogram("render_seconds", "Render time", labelnames=("renderer",))
+    with pytest.raises(ValueError):
+        latency.observe(1.0)
+    with pytest.raises(ValueError):
+        registry.counter("render_seconds", "duplicate")
+    with pytest.raises(ValueError):
+        registry.counter("errors", "Errors").inc(-1)
+
+def test_gauge_tracks_in_progress():
+    gauge = Registry().gauge("in_flight", "Requests in flight")
+    with gauge.track_inprogress():
+        assert gauge.value() == 1
+    assert gauge.value() == 0
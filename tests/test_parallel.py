@@ -0,0 +1,67 @@
+import threading
+import numpy as np
+from analysis import parallel
+from analysis.parallel import split_segments
+from pose.landmarks import ema_smooth_track
+from pose.pose_estimator import PoseEstimator
+
+def test_split_segments_covers_all_frames():
+    segments = split_segments(1000, 4, min_segment=30)
+    assert segments[0][0] == 0 and segments[-1][1] == 1000
+    assert all(a[1] == b[0] for a, b in zip(segments, segments[1:]))
+    assert len(segments) == 4
+    assert split_segments(40, 8, min_segment=30) == [(0, 40)]
+
+def test_ema_smooth_track_matches_streaming_smoothing():
+    rng = np.random.default_rng(0)
+    raw = rng.random((50, 33, 4)).astype(np.float32)
+    raw[[3, 4, 20]] = np.nan  # frames without a pose
+
+    estimator = PoseEstimator.__new__(PoseEstimator)  # smoothing only, no model
+    estimator.alpha, estimator.prev_keypoints = 0.5, None
+    expected = np.full_like(raw, np.nan)
+    for idx in range(len(raw)):
+        if not np.isnan(raw[idx]).all():
+            expected[idx] = estimator.smooth_keypoints(raw[idx]).data
+
+    np.testing.assert_array_equal(ema_smooth_track(raw, 0.5), expected)
+
+class _FakePool:
+    created = []
+
+    def __init__(self, max_workers, mp_context=None):
+        self.max_workers = max_workers
+        self.shut_down = False
+        _FakePool.created.append(self)
+
+    def shutdown(self, wait=True):
+        self.shut_down = True
+
+def test_shared_executor_is_created_once_and_not_replaced_while_in_use(monkeypatch):
+    monkeypatch.setattr(parallel, "ProcessPoolExecutor", _FakePool)
+    monkeypatch.setattr(parallel, "_executor", None)
+    monkeypatch.setattr(parallel, "_executor_users", 0)
+    _FakePool.created = []
+
+    barrier = threading.Barrier(8)
+    used = []
+
+    def caller():
+        barrier.wait()
+        with parallel._use_executor(2) as executor:
+            used.append(executor)
+
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(_FakePool.created) == 1 and all(executor is _FakePool.created[0] for executor in used)
+
+    with parallel._use_executor(2) as busy:
+        # Another size while the pool is in use: run on it rather than shut it down
+        with parallel._use_executor(3) as other:
+            assert other is busy and not busy.shut_down
+    with parallel._use_executor(3) as resized:
+        assert resized.max_workers == 3 and busy.shut_down
+    assert parallel._executor_users == 0
@@ -18,3 +18,22 @@ def test_smoothing_keypoints():
     smoothed = pose.smooth_keypoints(new_landmarks)
     # Expected: x = 0.5*0.7 + 0.5*0.5 = 0.6
     assert round(smoothed["LEFT_SHOULDER"]["x"], 2) == 0.6
+
+def test_roi_tracking_matches_full_frame_landmarks(tmp_path):
+    from benchmarks.synthetic import make_squat_video
+    from analysis.video_exercise_analyzer import load_video_frames
+    frames = load_video_frames(make_squat_video(str(tmp_path / "roi.mp4"), seconds=1.0))
+
+    full, roi = PoseEstimator(), PoseEstimator(roi_tracking=True)
+    try:
+        reference = [full.extract_raw_keypoints(frame) for frame in frames]
+        cropped = [roi.extract_raw_keypoints(frame) for frame in frames]
+    finally:
+        full.close()
+        roi.close()
+
+    assert roi.roi_frames > len(frames) // 2
+    assert sum(k is None for k in cropped) <= sum(k is None for k in reference)
+    deviation = np.mean([np.abs(a[:, :2] - b[:, :2]).mean() for a, b in zip(reference, cropped)
+                         if a is not None and b is not None])
+    assert deviation < 0.01
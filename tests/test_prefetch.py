@@ -0,0 +1,72 @@
+import time
+import numpy as np
+import pytest
+from analysis.prefetch import FramePrefetcher
+from analysis.video_exercise_analyzer import load_video_frames
+from api.pipeline import _video_frames
+from tests.helpers import write_video
+
+def test_prefetched_frames_match_sequential_decode(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, n_frames=20)
+
+    with FramePrefetcher(path, resize=(64, 48), maxsize=3) as prefetcher:
+        frames = list(prefetcher)
+    expected = load_video_frames(path, resize=(64, 48))
+    assert len(frames) == 20
+    assert all(np.array_equal(a, b) for a, b in zip(frames, expected))
+
+def test_unwanted_frames_are_grabbed_not_decoded(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, n_frames=12)
+
+    prefetcher = FramePrefetcher(path, resize=(64, 48), keep=lambda idx: idx % 3 == 0)
+    frames = list(prefetcher)
+    assert len(frames) == 12
+    assert [idx for idx, frame in enumerate(frames) if frame is not None] == [0, 3, 6, 9]
+    assert (prefetcher.frames_decoded, prefetcher.frames_skipped) == (4, 8)
+
+def test_decoder_blocks_when_queue_is_full(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, n_frames=30)
+
+    with FramePrefetcher(path, resize=(64, 48), maxsize=2) as prefetcher:
+        time.sleep(0.3)
+        assert prefetcher.queued == 2
+        # One more frame is decoded and waiting for a free slot
+        assert prefetcher.frames_decoded <= 3
+
+def test_pipeline_passes_the_decode_queue_size(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, n_frames=30)
+
+    with _video_frames(path, (64, 48), decode_thread=True, decode_queue_size=3) as prefetcher:
+        time.sleep(0.3)
+        assert prefetcher.queued == 3
+
+def test_stopping_early_cancels_the_decoder(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, n_frames=30)
+
+    prefetcher = FramePrefetcher(path, resize=(64, 48), maxsize=2)
+    for idx, _ in enumerate(prefetcher):
+        if idx == 4:
+            break
+    prefetcher.close()
+    assert not prefetcher._thread.is_alive()
+    assert prefetcher.frames_decoded < 30
+
+def test_decoder_errors_reach_the_consumer(tmp_path):
+    path = str(tmp_path / "clip.mp4")
+    write_video(path, n_frames=5)
+
+    def keep(idx):
+        if idx == 2:
+            raise RuntimeError("boom")
+        return True
+
+    with pytest.raises(RuntimeError, match="boom"):
+        list(FramePrefetcher(path, resize=(64, 48), keep=keep))
+
+def test_missing_file_yields_nothing():
+    assert list(FramePrefetcher("does/not/exist.mp4")) == []
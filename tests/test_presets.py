@@ -0,0 +1,31 @@
+import pytest
+from api.presets import PRESETS, UnknownPreset, get_preset, estimator_options
+
+def test_default_preset_and_server_selection():
+    assert get_preset(environ={})["name"] == "balanced"
+    assert get_preset(environ={"ANALYSIS_PRESET": "fast"})["name"] == "fast"
+    # An explicit (per-request) choice wins over the server default
+    assert get_preset("Accurate", environ={"ANALYSIS_PRESET": "fast"})["name"] == "accurate"
+
+def test_presets_trade_speed_for_accuracy():
+    fast, balanced, accurate = (get_preset(name, environ={}) for name in ("fast", "balanced", "accurate"))
+    assert fast["model_complexity"] < balanced["model_complexity"] < accurate["model_complexity"]
+    assert fast["max_side"] < balanced["max_side"] < accurate["max_side"]
+    # adaptive sampling is opt-in through the fast preset
+    assert fast["target_fps"] > 0 and fast["motion_threshold"] > 0
+    assert balanced["target_fps"] == accurate["target_fps"] == 0  # every frame
+    assert balanced["motion_threshold"] == accurate["motion_threshold"] == 0
+
+def test_environment_overrides_apply_to_every_preset():
+    environ = {"SMOOTHING_ALPHA": "0.7", "CONFIDENCE_THRESHOLD": "0.4", "TARGET_ANALYSIS_FPS": ""}
+    for name in PRESETS:
+        preset = get_preset(name, environ=environ)
+        assert preset["target_fps"] == PRESETS[name]["target_fps"]
+        options = estimator_options(preset)
+        assert options["alpha"] == 0.7
+        assert options["min_detection_confidence"] == options["min_tracking_confidence"] == 0.4
+        assert options["model_complexity"] == PRESETS[name]["model_complexity"]
+
+def test_unknown_preset():
+    with pytest.raises(UnknownPreset):
+        get_preset("turbo", environ={})
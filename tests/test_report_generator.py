@@ -1,6 +1,7 @@
 import os
 import shutil
 import json
+import re
 import pytest
 import numpy as np
 import cv2
@@ -75,3 +76,62 @@ def test_generate_pdf_report(clean_test_dir):
     assert os.path.exists(pdf_path)
     assert pdf_path.endswith(".pdf")
     assert os.path.getsize(pdf_path) > 1000  # Not empty
+
+def test_report_uses_keypoint_track(clean_test_dir):
+    from pose.keypoint_track import KeypointTrack
+    video_id = "test_track"
+    track = KeypointTrack()
+    track.append({"LEFT_HIP": {"x": 0.5, "y": 0.5, "z": 0.0, "visibility": 1.0}})
+    track.append(None)
+
+    frames = {0: np.zeros((480, 640, 3), dtype=np.uint8)}
+    pdf_path = generate_pdf_report(video_id, mock_results, frames, TEST_OUTPUT_DIR, track)
+    assert os.path.exists(pdf_path)
+
+@pytest.mark.parametrize("renderer", ["reportlab", "matplotlib"])
+def test_renderers_produce_the_same_pages(clean_test_dir, renderer):
+    from pose.keypoint_track import KeypointTrack
+    track = KeypointTrack()
+    for _ in range(2):
+        track.append({"LEFT_HIP": {"x": 0.5, "y": 0.5, "z": 0.0, "visibility": 1.0}})
+    frames = [np.zeros((480, 640, 3), dtype=np.uint8)] * 2
+
+    pdf_path = generate_pdf_report(f"test_{renderer}", mock_results, frames, TEST_OUTPUT_DIR,
+                                   track, renderer=renderer)
+    with open(pdf_path, 'rb') as f:
+        content = f.read()
+    assert content.startswith(b"%PDF")
+    # Summary, bar chart, one angle plot per exercise, two annotated frames
+    assert len(re.findall(rb"/Type\s*/Page(?!s)", content)) == 6
+
+def test_keyframes_without_a_track_are_shown_unannotated(clean_test_dir):
+    frames = [np.zeros((480, 640, 3), dtype=np.uint8)] * 2
+    pdf_path = generate_pdf_report("test_no_track", mock_results, frames, TEST_OUTPUT_DIR)
+    with open(pdf_path, 'rb') as f:
+        content = f.read()
+    assert len(re.findall(rb"/Type\s*/Page(?!s)", content)) == 6
+
+def test_unknown_renderer(clean_test_dir):
+    with pytest.raises(ValueError):
+        generate_pdf_report("x", mock_results, [], TEST_OUTPUT_DIR, renderer="latex")
+
+def test_angle_series_uses_each_exercises_angle():
+    from analysis.exercises import EXERCISES, register_exercise
+    from analysis.squat_analyzer import SquatAnalyzer
+    from report.report_generator import _angle_series
+
+    class DeepSquatAnalyzer(SquatAnalyzer):
+        ANGLE_NAME = "deep_knee"
+
+    register_exercise("deep_squat", DeepSquatAnalyzer)
+    try:
+        frame_data = mock_results["frame_data"] + [
+            {"frame_index": 2, "exercise": "deep_squat", "rep_id": 1, "is_form_ok": True,
+             "angles": {"deep_knee": 0.0}, "issues": []},
+            {"frame_index": 3, "exercise": "lunge", "rep_id": 1, "is_form_ok": True,
+             "angles": {"hip": 120.0}, "issues": []},
+        ]
+        assert _angle_series(frame_data) == {
+            "squat": ([0], [95]), "pushup": ([1], [170]), "deep_squat": ([2], [0.0]), "lunge": ([3], [120.0])}
+    finally:
+        del EXERCISES["deep_squat"]
@@ -0,0 +1,28 @@
+import threading
+from api.report_tasks import ReportTasks
+
+def test_wait_blocks_until_render_finishes():
+    tasks = ReportTasks()
+    release = threading.Event()
+    done = []
+    tasks.submit("vid", lambda: (release.wait(), done.append(True)))
+
+    assert tasks.is_pending("vid")
+    assert tasks.wait("vid", timeout=0.05) is False
+    release.set()
+    assert tasks.wait("vid", timeout=5) is True
+    assert done == [True]
+    tasks.shutdown()
+    assert not tasks.is_pending("vid")
+
+def test_unknown_or_failed_task_does_not_block():
+    tasks = ReportTasks()
+    assert tasks.wait("missing", timeout=0) is True
+
+    def fail():
+        raise RuntimeError("render failed")
+
+    tasks.submit("bad", fail)
+    assert tasks.wait("bad", timeout=5) is True
+    tasks.shutdown()
+    assert tasks.queue_depth == 0
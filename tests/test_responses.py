@@ -0,0 +1,64 @@
+import gzip
+import json
+from flask import Flask
+from api.responses import (frame_columns, frame_rows, analysis_response, compress_response,
+                           save_frames, load_frames, keypoints_csv, NDJSON, COLUMNS)
+
+rows = [
+    {"frame_index": 10, "exercise": "squat", "rep_id": 1, "is_form_ok": False,
+     "angles": {"knee": 95.0}, "issues": ["INSUFFICIENT_DEPTH"]},
+    {"frame_index": 40, "exercise": "pushup", "rep_id": 1, "is_form_ok": True,
+     "angles": {"elbow": 85.0}, "issues": []},
+    {"frame_index": 70, "exercise": "squat", "rep_id": 2, "is_form_ok": True,
+     "angles": {"knee": 88.0}, "issues": []},
+]
+
+def test_columns_round_trip():
+    columns = frame_columns(rows)
+    assert columns["frame_index"] == [10, 40, 70]
+    assert columns["angles"] == {"elbow": [None, 85.0, None], "knee": [95.0, None, 88.0]}
+    assert frame_rows(columns) == rows
+    assert frame_rows(frame_columns([])) == []
+
+def test_stored_frames_range_reads(tmp_path):
+    save_frames(str(tmp_path), "v", rows[::-1])
+    assert load_frames(str(tmp_path), "v") == rows
+    assert load_frames(str(tmp_path), "v", start=20, end=70) == [rows[1]]
+    assert load_frames(str(tmp_path), "v", start=40) == rows[1:]
+    assert load_frames(str(tmp_path), "v", end=10) == []
+    assert load_frames(str(tmp_path), "v", start=70, end=40) == []
+    save_frames(str(tmp_path), "empty", [])
+    assert load_frames(str(tmp_path), "empty", start=0) == []
+    assert load_frames(str(tmp_path), "missing") is None
+
+def test_ndjson_and_gzip():
+    app = Flask(__name__)
+    payload = {"video_id": "v", "summary": {}, "frame_data": rows * 200}
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = compress_response(analysis_response(payload, NDJSON))
+        assert response.headers["Content-Encoding"] == "gzip"
+        lines = gzip.decompress(b"".join(response.response)).decode().splitlines()
+    assert json.loads(lines[0]) == {"video_id": "v", "summary": {}, "type": "header"}
+    assert [json.loads(line) for line in lines[1:]] == rows * 200
+
+    with app.test_request_context():
+        response = compress_response(analysis_response(payload, COLUMNS))
+        assert "Content-Encoding" not in response.headers
+        assert frame_rows(response.get_json()["frame_data"]) == rows * 200
+
+def test_keypoints_csv_matches_track_columns(monkeypatch):
+    import numpy as np
+    from api import responses
+    from pose.keypoint_track import KeypointTrack
+    data = np.random.default_rng(0).uniform(0, 1, (7, 33, 4)).astype(np.float32)
+    data[2] = np.nan
+    monkeypatch.setattr(responses, "CSV_CHUNK_FRAMES", 3)
+    lines = "".join(keypoints_csv(data, first_frame=10)).splitlines()
+    assert lines[0] == "frame_index,landmark,x,y,z,visibility"
+    columns = KeypointTrack.from_array(data).to_columns()
+    assert len(lines) == 1 + 6 * 33
+    rows = [line.split(",") for line in lines[1:]]
+    assert [int(r[0]) for r in rows] == (columns["frame_index"] + 10).tolist()
+    assert [r[1] for r in rows] == columns["landmark"].tolist()
+    np.testing.assert_array_equal(np.array([r[2:] for r in rows], dtype=np.float32),
+                                  np.column_stack([columns[c] for c in ("x", "y", "z", "visibility")]))
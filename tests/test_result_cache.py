@@ -0,0 +1,63 @@
+import os
+import time
+from api.result_cache import ResultCache, cache_key
+
+def _write(path, size):
+    with open(path, 'wb') as f:
+        f.write(b'x' * size)
+
+def test_cache_key_depends_on_config():
+    assert cache_key("abc", {"fps": 15}) == cache_key("abc", {"fps": 15})
+    assert cache_key("abc", {"fps": 15}) != cache_key("abc", {"fps": 30})
+    assert cache_key("abc", {"fps": 15}) != cache_key("abd", {"fps": 15})
+
+def test_hit_and_miss_counters(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    assert cache.get("k1") is None
+    cache.put("k1", "video-1", {"video_id": "video-1", "summary": {}})
+    assert cache.get("k1")["video_id"] == "video-1"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=3500)
+    for i in range(3):
+        _write(tmp_path / f"video-{i}.pdf", 1000)
+        cache.put(f"k{i}", f"video-{i}", {"video_id": f"video-{i}"})
+        time.sleep(0.02)
+    # k0 would be evicted next, but using it makes k1 the least recently used
+    cache.get("k0")
+    _write(tmp_path / "video-3.pdf", 1000)
+    cache.put("k3", "video-3", {"video_id": "video-3"})
+
+    assert cache.get("k1") is None
+    assert not os.path.exists(tmp_path / "video-1.pdf")
+    assert cache.get("k0") is not None
+    assert cache.stats()["evictions"] >= 1
+
+def test_expired_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_age_seconds=0)
+    _write(tmp_path / "video-1.pdf", 10)
+    cache.put("k1", "video-1", {"video_id": "video-1"})
+    assert cache.get("k1") is None
+    assert not os.path.exists(tmp_path / "video-1.pdf")
+
+def test_index_is_rebuilt_at_startup(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("k1", "video-1", {"video_id": "video-1"})
+    reopened = ResultCache(str(tmp_path))
+    assert reopened.stats()["entries"] == 1
+    assert reopened.get("k1")["video_id"] == "video-1"
+
+def test_reports_rendered_after_put_count_towards_the_budget(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1500)
+    cache.put("k1", "video-1", {"video_id": "video-1"})
+    # the PDF is rendered in the background after the response is cached
+    _write(tmp_path / "video-1.pdf", 1000)
+    time.sleep(0.02)
+    cache.put("k2", "video-2", {"video_id": "video-2"})
+    _write(tmp_path / "video-2.pdf", 1000)
+    cache.put("k3", "video-3", {"video_id": "video-3"})
+
+    assert cache.get("k1") is None
+    assert not os.path.exists(tmp_path / "video-1.pdf")
@@ -0,0 +1,56 @@
+import numpy as np
+from pose.landmarks import NUM_LANDMARKS, NUM_COLUMNS, X, Y, Z, VISIBILITY
+from pose.roi import RoiTracker
+
+FRAME_SHAPE = (480, 640, 3)
+
+def pose_in_box(x0, y0, x1, y1, visibility=1.0):
+    """Normalized landmarks spread over a pixel box of a 640x480 frame."""
+    keypoints = np.zeros((NUM_LANDMARKS, NUM_COLUMNS), dtype=np.float32)
+    keypoints[:, X] = np.linspace(x0, x1, NUM_LANDMARKS) / 640
+    keypoints[:, Y] = np.linspace(y0, y1, NUM_LANDMARKS) / 480
+    keypoints[:, VISIBILITY] = visibility
+    return keypoints
+
+def test_box_pads_landmarks_and_maps_back():
+    roi = RoiTracker(padding=0.25)
+    roi.update(pose_in_box(200, 100, 300, 300), FRAME_SHAPE)
+    assert roi.box == (150, 50, 350, 350)
+
+    crop_keypoints = np.zeros((NUM_LANDMARKS, NUM_COLUMNS), dtype=np.float32)
+    crop_keypoints[:, X] = 0.5
+    crop_keypoints[:, Y] = 0.25
+    crop_keypoints[:, Z] = 0.1
+    mapped = roi.to_frame(crop_keypoints, FRAME_SHAPE)
+    assert np.allclose(mapped[:, X], 250 / 640)
+    assert np.allclose(mapped[:, Y], 125 / 480)
+    assert np.allclose(mapped[:, Z], 0.1 * 200 / 640)
+
+def test_box_holds_until_landmarks_near_edge():
+    roi = RoiTracker(padding=0.3)
+    roi.update(pose_in_box(200, 100, 300, 300), FRAME_SHAPE)
+    box = roi.box
+    roi.update(pose_in_box(205, 105, 305, 305), FRAME_SHAPE)
+    assert roi.box == box
+    roi.update(pose_in_box(260, 100, 360, 300), FRAME_SHAPE)
+    assert roi.box != box
+
+def test_box_clipped_to_frame():
+    roi = RoiTracker(padding=0.5)
+    roi.update(pose_in_box(0, 300, 100, 480), FRAME_SHAPE)
+    x0, y0, x1, y1 = roi.box
+    assert x0 == 0 and y1 == 480 and x1 <= 640 and y0 >= 0
+    assert roi.crop(np.zeros(FRAME_SHAPE, np.uint8)).shape[:2] == (y1 - y0, x1 - x0)
+
+def test_tracking_lost_without_enough_visible_landmarks():
+    roi = RoiTracker()
+    roi.update(pose_in_box(200, 100, 300, 300), FRAME_SHAPE)
+    roi.update(pose_in_box(200, 100, 300, 300, visibility=0.1), FRAME_SHAPE)
+    assert roi.box is None
+    assert roi.crop(np.zeros(FRAME_SHAPE, np.uint8)) is None
+
+def test_crop_downscaled_to_max_side():
+    roi = RoiTracker(padding=0.0, max_side=100)
+    roi.update(pose_in_box(100, 40, 300, 440), FRAME_SHAPE)
+    crop = roi.crop(np.zeros(FRAME_SHAPE, np.uint8))
+    assert max(crop.shape[:2]) == 100
@@ -0,0 +1,35 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cold-import budget in seconds; currently ~0.35s for api.app on one core
+STARTUP_BUDGET = float(os.getenv('STARTUP_BUDGET_SECONDS', 1.5))
+HEAVY_MODULES = ("mediapipe", "pandas", "matplotlib", "reportlab")
+
+_PROBE = """
+import json, sys, threading, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules],
+                  "threads": [t.name for t in threading.enumerate() if t is not threading.main_thread()]}}))
+"""
+
+def cold_import(module, tmp_path):
+    # Default configuration; only the data folders are moved out of the tree
+    env = {key: value for key, value in os.environ.items() if key != "ESTIMATOR_WARMUP"}
+    env.update(PYTHONPATH=ROOT, UPLOAD_FOLDER=str(tmp_path / "uploads"), REPORTS_FOLDER=str(tmp_path / "reports"))
+    out = subprocess.run([sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                         cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+@pytest.mark.parametrize("module", ["api.app", "analysis.parallel", "pose.pose_estimator",
+                                    "report.report_generator"])
+def test_cold_import_is_fast_and_lazy(module, tmp_path):
+    result = cold_import(module, tmp_path)
+    assert result["loaded"] == []
+    assert result["threads"] == []
+    assert result["seconds"] < STARTUP_BUDGET
@@ -0,0 +1,36 @@
+import numpy as np
+from analysis.analyzer import ExerciseAnalyzer
+from analysis.track_store import save_track, load_track, load_angles
+from tests.helpers import synthetic_track
+
+def test_track_round_trip_memory_mapped(tmp_path):
+    track = synthetic_track(200)
+    analyzer = ExerciseAnalyzer()
+    analyzer.analyze_track(track)
+    save_track(str(tmp_path), "vid", track, analyzer.angle_series())
+
+    stored = load_track(str(tmp_path), "vid")
+    assert isinstance(stored.data, np.memmap)
+    np.testing.assert_array_equal(stored.data, track.data)
+    assert stored[5] is None and stored[6] is not None
+
+    angles = load_angles(str(tmp_path), "vid")
+    assert angles.dtype.names == ("squat_knee", "pushup_elbow")
+    assert np.isnan(angles["squat_knee"][5])
+    logged = [row for row in analyzer.results["frame_data"] if row["exercise"] == "squat"]
+    for row in logged:
+        assert np.isclose(angles["squat_knee"][row["frame_index"]], row["angles"]["knee"], atol=1e-3)
+
+def test_reanalysis_from_stored_track_matches_fresh_analysis(tmp_path):
+    track = synthetic_track(400)
+    save_track(str(tmp_path), "vid", track, ExerciseAnalyzer().angle_series(track))
+    thresholds = {"squat": {"down_angle": 100, "up_angle": 178}}
+
+    fresh = ExerciseAnalyzer(thresholds).analyze_track(track)
+    stored = ExerciseAnalyzer(thresholds).analyze_track(load_track(str(tmp_path), "vid"))
+    assert stored == fresh
+    assert fresh["summary"] != ExerciseAnalyzer().analyze_track(track)["summary"]
+
+def test_missing_track(tmp_path):
+    assert load_track(str(tmp_path), "nope") is None
+    assert load_angles(str(tmp_path), "nope") is None
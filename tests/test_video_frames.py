@@ -0,0 +1,46 @@
+import numpy as np
+from analysis.video_exercise_analyzer import (iter_video_frames, load_video_frames, probe_size, fit_size,
+                                              read_frames_at)
+from analysis.memory import PeakRSSMonitor, current_rss_mb
+from tests.helpers import write_video
+
+def test_iter_video_frames_streams_resized_frames(tmp_path):
+    path = tmp_path / "clip.mp4"
+    write_video(path)
+
+    frames = iter_video_frames(str(path), resize=(64, 48))
+    first = next(frames)
+    assert first.shape == (48, 64, 3)
+    assert 1 + sum(1 for _ in frames) == 12
+    assert len(load_video_frames(str(path), resize=(64, 48))) == 12
+
+def test_fit_size_keeps_aspect_ratio(tmp_path):
+    path = tmp_path / "wide.mp4"
+    write_video(path, n_frames=2, size=(320, 180))
+    assert probe_size(str(path)) == (320, 180)
+    assert fit_size((1280, 720), 540) == (540, 304)
+    assert fit_size((720, 1280), 540) == (304, 540)
+    assert fit_size((320, 180), 540) == (320, 180)  # never upscaled
+    assert fit_size((0, 0), 540) == (540, 480)
+
+def test_iter_video_frames_missing_file():
+    assert list(iter_video_frames("does/not/exist.mp4")) == []
+
+def test_peak_rss_monitor():
+    with PeakRSSMonitor(interval=0.01) as mon:
+        blob = np.ones(5 * 1024 * 1024, dtype=np.uint8)
+        del blob
+    assert current_rss_mb() > 0
+    assert mon.peak_mb >= mon.start_mb
+    assert set(mon.as_dict()) == {"peak_rss_mb", "rss_growth_mb"}
+
+def test_read_frames_at_seeks_to_exact_frames(tmp_path):
+    path = tmp_path / "long.mp4"
+    write_video(path, n_frames=120)
+    sequential = list(iter_video_frames(str(path), resize=(64, 48)))
+    wanted = [110, 5, 50, 51, 200]
+    for seek_gap in (0, 30, None):
+        frames = read_frames_at(str(path), wanted, resize=(64, 48), seek_gap=seek_gap)
+        assert sorted(frames) == [5, 50, 51, 110]
+        for idx, frame in frames.items():
+            assert np.array_equal(frame, sequential[idx])
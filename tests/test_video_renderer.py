@@ -0,0 +1,83 @@
+import cv2
+import numpy as np
+import pytest
+from report import video_renderer
+from analysis.analyzer import ExerciseAnalyzer
+from benchmarks.synthetic import make_squat_video
+from pose.keypoint_track import KeypointTrack
+from pose.landmarks import empty_landmarks, LEFT_HIP, LEFT_KNEE, LEFT_ANKLE
+from pose.pose_estimator import draw_skeleton
+from report.video_renderer import rep_counts, render_annotated_video
+
+
+def _track(n_frames):
+    track = KeypointTrack()
+    for i in range(n_frames):
+        if i == 3:
+            track.append(None)
+            continue
+        keypoints = empty_landmarks()
+        keypoints[[LEFT_HIP, LEFT_KNEE, LEFT_ANKLE]] = [[0.5, 0.3, 0, 1], [0.55, 0.6, 0, 1], [0.5, 0.9, 0, 1]]
+        track.append(keypoints)
+    return track
+
+
+def test_rep_counts_accumulate_per_exercise():
+    frame_data = [
+        {"frame_index": 5, "exercise": "squat", "is_form_ok": False},
+        {"frame_index": 2, "exercise": "squat", "is_form_ok": True},
+        {"frame_index": 4, "exercise": "pushup", "is_form_ok": True},
+        {"frame_index": 9, "exercise": "squat", "is_form_ok": False},  # past the last frame
+    ]
+    counts = rep_counts(frame_data, 8)
+    assert counts["squat"][0].tolist() == [0, 0, 1, 1, 1, 2, 2, 2]
+    assert counts["squat"][1].tolist() == [True] * 5 + [False] * 3
+    assert counts["pushup"][0].tolist() == [0, 0, 0, 0, 1, 1, 1, 1]
+
+
+def test_draw_skeleton_connects_visible_joints():
+    frame = np.zeros((100, 100, 3), dtype=np.uint8)
+    draw_skeleton(frame, _track(1).data[0])
+    assert frame[45, 52].any()  # on the hip-knee bone
+    assert not frame[5, 5].any()
+    untouched = np.zeros_like(frame)
+    draw_skeleton(untouched, empty_landmarks())
+    assert not untouched.any()
+
+
+def test_render_annotated_video(tmp_path):
+    source = make_squat_video(str(tmp_path / "in.mp4"), seconds=0.5, size=(160, 120))
+    track = _track(15)
+    angles = {"squat": ("knee", ExerciseAnalyzer().angle_series(track)["squat_knee"])}
+    output = str(tmp_path / "out.mp4")
+    frame_data = [{"frame_index": 7, "exercise": "squat", "is_form_ok": True}]
+
+    written = render_annotated_video(source, output, track, angles, frame_data, resize=(160, 120), fps=30)
+    assert written == 15
+    assert not (tmp_path / "out.part.mp4").exists()
+
+    cap = cv2.VideoCapture(output)
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    assert len(frames) == 15
+    assert frames[0].shape == (120, 160, 3)
+
+
+def test_failed_render_removes_the_partial_file(tmp_path, monkeypatch):
+    source = make_squat_video(str(tmp_path / "in.mp4"), seconds=0.5, size=(160, 120))
+    track = _track(15)
+
+    def broken(frame, keypoints):
+        if np.isnan(keypoints).all():  # frame 3 has no pose
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(video_renderer, "draw_skeleton", broken)
+    with pytest.raises(RuntimeError, match="boom"):
+        render_annotated_video(source, str(tmp_path / "out.mp4"), track, {}, [], resize=(160, 120), fps=30)
+    assert not (tmp_path / "out.part.mp4").exists()
+    assert not (tmp_path / "out.mp4").exists()